@@ -0,0 +1,95 @@
+"""
+Activity log panel for the Barcode Printer Application
+Keeps the most recent messages in a bounded ring buffer and writes them
+to the Text widget in batches, trimming old lines, so inserts stay cheap
+however long the application runs. The full history is in the log file.
+"""
+import time
+import tkinter as tk
+from collections import deque
+
+import ttkbootstrap as ttk
+from ttkbootstrap.widgets.scrolled import ScrolledText
+
+import config
+
+LEVELS = {'All': ('info', 'error'), 'Errors': ('error',)}
+
+
+class ActivityLog(ttk.Frame):
+    """Bounded, filterable view of recent status messages"""
+
+    def __init__(self, master, max_lines: int = None, flush_ms: int = 100, **kwargs):
+        super().__init__(master, **kwargs)
+        self.max_lines = max_lines or config.APP_SETTINGS.get('activity_log_lines', 1000)
+        self.flush_ms = flush_ms
+        self.entries = deque(maxlen=self.max_lines)  # (timestamp, level, message)
+        self._pending = []
+        self._flush_scheduled = False
+        self._lines = 0  # lines currently in the widget
+        self.levels = LEVELS['All']
+
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(filter_frame, text="Show", font=('Segoe UI', 8)).pack(side=tk.LEFT)
+        self.filter_combo = ttk.Combobox(filter_frame, state="readonly", width=10, values=list(LEVELS))
+        self.filter_combo.set('All')
+        self.filter_combo.pack(side=tk.LEFT, padx=5)
+        self.filter_combo.bind('<<ComboboxSelected>>', lambda e: self.set_filter(self.filter_combo.get()))
+        ttk.Button(filter_frame, text="Clear", command=self.clear,
+                   bootstyle="secondary-outline").pack(side=tk.RIGHT)
+
+        self.view = ScrolledText(self, width=40, wrap=tk.WORD, state='disabled')
+        self.view.pack(fill=tk.BOTH, expand=True)
+        self.text = self.view.text
+        self.text.tag_config('error', foreground='red')
+        self.text.tag_config('info', foreground='black')
+
+    def add(self, message: str, level: str = 'info'):
+        """Queue a message (UI thread); it is drawn on the next flush"""
+        # One line per entry keeps trimming a simple line count
+        entry = (time.strftime("%H:%M:%S"), level, message.replace('\n', ' '))
+        self.entries.append(entry)
+        if level in self.levels:
+            self._pending.append(entry)
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                self.after(self.flush_ms, self.flush)
+
+    def flush(self):
+        """Write queued messages in one insert and trim the oldest lines"""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending[-self.max_lines:], []
+        if not pending or not self.text.winfo_exists():
+            return
+        self._write(pending)
+
+    def _write(self, entries):
+        chunks = []
+        for timestamp, level, message in entries:
+            chunks += [f"[{timestamp}] {message}\n", level]
+        self.text.config(state='normal')
+        self.text.insert(tk.END, *chunks)
+        self._lines += len(entries)
+        excess = self._lines - self.max_lines
+        if excess > 0:
+            self.text.delete('1.0', f'{excess + 1}.0')
+            self._lines -= excess
+        self.text.see(tk.END)
+        self.text.config(state='disabled')
+
+    def set_filter(self, name: str):
+        """Show only the levels of LEVELS[name], redrawn from the buffer"""
+        self.levels = LEVELS.get(name, LEVELS['All'])
+        self._pending = []
+        self.text.config(state='normal')
+        self.text.delete('1.0', tk.END)
+        self.text.config(state='disabled')
+        self._lines = 0
+        shown = [e for e in self.entries if e[1] in self.levels]
+        if shown:
+            self._write(shown)
+
+    def clear(self):
+        self.entries.clear()
+        self.set_filter(self.filter_combo.get())
@@ -0,0 +1,203 @@
+"""
+Exam attendance for the Barcode Printer Application
+Counts, per venue and module, how many of the expected candidates have
+been scanned in. Counters are updated per scan from the scan stream and
+the students already loaded for the date, so the dashboard never queries
+the database.
+"""
+import csv
+import time
+import tkinter as tk
+from tkinter import filedialog, messagebox
+from typing import Dict, List, Optional
+
+import ttkbootstrap as ttk
+
+import config
+from utils import log_event
+
+COUNTS = ('expected', 'arrived', 'duplicate', 'unknown')
+NOT_FOUND = ('(not found)', '')  # row for codes that match no student at all
+
+
+class AttendanceCounter:
+    """
+    Per (venue, module) counters of expected, arrived, duplicate and
+    unknown scans, with venue totals kept alongside. Used on the UI thread.
+    """
+
+    def __init__(self):
+        self.date = None
+        self.version = 0  # bumped on every change, so views redraw only when needed
+        self.generation = 0  # bumped when the expected set is replaced
+        # (code, student, lookup failed) for the current date, or from before
+        # any expected set was loaded; replayed when the expected set is reloaded
+        self._scans = []
+        self._reset({})
+
+    def _reset(self, expected: Dict[str, List[Dict]]):
+        self.rows: Dict[tuple, Dict[str, int]] = {}
+        self.venues: Dict[str, Dict[str, int]] = {}
+        self.total = dict.fromkeys(COUNTS, 0)
+        self._by_code = {}  # Barcode -> (venue, module) of an expected candidate
+        self._by_student = {}  # StudentID -> Barcodes of their exams
+        self._arrived = set()  # Barcodes scanned in
+        self.generation += 1
+
+        for module_code, students in expected.items():
+            for student in students:
+                key = (str(student.get('VenueName') or ''), module_code)
+                self._bump(key, 'expected')
+                barcode = str(student.get('Barcode') or student.get('StudentID'))
+                self._by_code[barcode] = key
+                if student.get('StudentID') is not None:
+                    self._by_student.setdefault(str(student['StudentID']), []).append(barcode)
+
+    def _bump(self, key: tuple, count: str):
+        for counters, k in ((self.rows, key), (self.venues, key[0])):
+            if k not in counters:
+                counters[k] = dict.fromkeys(COUNTS, 0)
+            counters[k][count] += 1
+        self.total[count] += 1
+        self.version += 1
+
+    def set_expected(self, date: str, expected: Dict[str, List[Dict]]):
+        """
+        Expected candidates {module_code: students}. Scans of the same date,
+        or made before any date was loaded, are recounted; a new date
+        starts from no scans.
+        """
+        if self.date is not None and date != self.date:
+            self._scans = []
+        self.date = date
+        self._reset(expected)
+        for scan in self._scans:
+            self._count(*scan)
+
+    def record(self, code: str, student: Optional[Dict] = None, lookup_failed: bool = False):
+        """Count one scan; student is the lookup result (None if not found)"""
+        scan = (str(code).strip(), student, lookup_failed)
+        self._scans.append(scan)
+        self._count(*scan)
+
+    def _match(self, code: str, student: Optional[Dict]) -> Optional[str]:
+        if code in self._by_code:
+            return code
+        # A StudentID scan: the first of their exams today not yet scanned in
+        barcodes = self._by_student.get(code)
+        if barcodes:
+            return next((b for b in barcodes if b not in self._arrived), barcodes[0])
+        if student and str(student.get('Barcode')) in self._by_code:
+            return str(student['Barcode'])
+        return None
+
+    def _count(self, code: str, student: Optional[Dict], lookup_failed: bool):
+        barcode = self._match(code, student)
+        if barcode is not None:
+            key = self._by_code[barcode]
+            if barcode in self._arrived:
+                self._bump(key, 'duplicate')
+            else:
+                self._arrived.add(barcode)
+                self._bump(key, 'arrived')
+        elif student:
+            # A real student, but not expected for this date's loaded modules
+            self._bump((str(student.get('VenueName') or ''), str(student.get('ModuleCode') or '')), 'unknown')
+        elif not lookup_failed:
+            self._bump(NOT_FOUND, 'unknown')
+
+    def snapshot(self) -> List[Dict]:
+        """One row per venue and module, sorted by venue then module"""
+        return [
+            {'Venue': venue, 'Module': module, **{c.capitalize(): counts[c] for c in COUNTS}}
+            for (venue, module), counts in sorted(self.rows.items())
+        ]
+
+    def export_csv(self, path: str) -> bool:
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                f.write(f"# Attendance {self.date or ''} at {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                writer = csv.DictWriter(f, fieldnames=['Venue', 'Module'] + [c.capitalize() for c in COUNTS])
+                writer.writeheader()
+                writer.writerows(self.snapshot())
+            log_event(f"Attendance snapshot written to {path}")
+            return True
+        except OSError as e:
+            log_event(f"Error exporting attendance: {e}", 'error')
+            return False
+
+
+class AttendanceDashboard(ttk.Frame):
+    """
+    Venue/module attendance table. Redraws at a fixed rate, and only rows
+    whose counters changed since the last frame.
+    """
+
+    COLUMNS = ('expected', 'arrived', 'percent', 'duplicate', 'unknown')
+
+    def __init__(self, master, counter: AttendanceCounter, refresh_ms: int = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.counter = counter
+        self.refresh_ms = refresh_ms or config.APP_SETTINGS.get('attendance_refresh_ms', 1000)
+        self._shown_version = None
+        self._shown_generation = None
+        self._shown = {}  # tree item -> values currently displayed
+
+        toolbar = ttk.Frame(self)
+        toolbar.pack(fill=tk.X, pady=(0, 10))
+        self.summary = ttk.Label(toolbar, text="", font=('Segoe UI', 12, 'bold'))
+        self.summary.pack(side=tk.LEFT)
+        ttk.Button(toolbar, text="💾 Export", command=self.export,
+                   bootstyle="secondary-outline").pack(side=tk.RIGHT)
+
+        self.tree = ttk.Treeview(self, columns=self.COLUMNS, show='tree headings')
+        self.tree.heading('#0', text="Venue / Module")
+        self.tree.column('#0', width=220)
+        for column, title in zip(self.COLUMNS, ("Expected", "Arrived", "%", "Repeat", "Unknown")):
+            self.tree.heading(column, text=title)
+            self.tree.column(column, width=80, anchor=tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        self._tick()
+
+    @staticmethod
+    def _values(counts: Dict[str, int]) -> tuple:
+        percent = f"{100 * counts['arrived'] / counts['expected']:.0f}%" if counts['expected'] else ""
+        return (counts['expected'], counts['arrived'], percent, counts['duplicate'], counts['unknown'])
+
+    def _set(self, item: str, parent: str, text: str, values: tuple):
+        if item not in self._shown:
+            self.tree.insert(parent, tk.END, iid=item, text=text, values=values, open=True)
+        elif self._shown[item] != values:
+            self.tree.item(item, values=values)
+        self._shown[item] = values
+
+    def _tick(self):
+        if not self.winfo_exists():
+            return
+        counter = self.counter
+        if counter.version != self._shown_version:
+            if counter.generation != self._shown_generation:
+                # A new expected set (e.g. another date): start the table over
+                self.tree.delete(*self.tree.get_children())
+                self._shown = {}
+                self._shown_generation = counter.generation
+            for venue in sorted(counter.venues):
+                self._set(f"v:{venue}", '', venue or "(no venue)", self._values(counter.venues[venue]))
+            for (venue, module), counts in sorted(counter.rows.items()):
+                self._set(f"m:{venue}\t{module}", f"v:{venue}", module, self._values(counts))
+            totals = counter.total
+            self.summary.configure(
+                text=f"{counter.date or 'No date'}: {totals['arrived']}/{totals['expected']} arrived"
+                     + (f" · {totals['unknown']} unknown" if totals['unknown'] else "")
+            )
+            self._shown_version = counter.version
+        self.after(self.refresh_ms, self._tick)
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export Attendance", defaultextension=".csv",
+            initialfile=f"attendance_{self.counter.date or 'snapshot'}.csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if path and not self.counter.export_csv(path):
+            messagebox.showerror("Export Error", f"Could not write {path}", parent=self)
@@ -12,27 +12,29 @@ from utils import log_event, mm_to_pixels
 class BarcodeGenerator:
     """Generate barcode images formatted for card printing"""
     
-    def __init__(self, settings=None):
+    def __init__(self, settings=None, dpi: int = None):
+        # dpi overrides the configured resolution, e.g. to render at a GDI printer's own DPI
+        self.dpi = dpi or config.PRINTER_CONFIG['dpi']
         if settings:
             self.card_width_px = mm_to_pixels(
                 settings.get('label_width_mm', 40.0),
-                config.PRINTER_CONFIG['dpi']
+                self.dpi
             )
             self.card_height_px = mm_to_pixels(
                 settings.get('label_height_mm', 60.0),
-                config.PRINTER_CONFIG['dpi']
+                self.dpi
             )
-            self.dpi = config.PRINTER_CONFIG['dpi']
         else:
             self.card_width_px = mm_to_pixels(
                 config.PRINTER_CONFIG['card_width_mm'],
-                config.PRINTER_CONFIG['dpi']
+                self.dpi
             )
             self.card_height_px = mm_to_pixels(
                 config.PRINTER_CONFIG['card_height_mm'],
-                config.PRINTER_CONFIG['dpi']
+                self.dpi
             )
-            self.dpi = config.PRINTER_CONFIG['dpi']
+        # Margins and font sizes below are tuned in 203 DPI pixels
+        self.px_scale = self.dpi / 203
     
     def generate_barcode_image(self, barcode_value: str) -> Image:
         """Generate a Code128 barcode image optimized for thermal label printing"""
@@ -42,7 +44,7 @@ class BarcodeGenerator:
             
             # Configure writer for thermal printing
             writer = ImageWriter()
-            writer.dpi = 203  # Standard thermal printer DPI
+            writer.dpi = self.dpi  # Bars are sized in mm, so they stay the same size at any DPI
             
             # Generate barcode
             barcode_instance = code128(str(barcode_value), writer=writer)
@@ -64,7 +66,7 @@ class BarcodeGenerator:
             buffer.seek(0)
             barcode_img = Image.open(buffer).convert('RGB')
             
-            log_event(f"Generated barcode for value: {barcode_value}")
+            log_event(f"Generated barcode for value: {barcode_value}", 'debug')
             return barcode_img, barcode_value
         
         except Exception as e:
@@ -99,7 +101,7 @@ class BarcodeGenerator:
             
             # Load font for text - smaller font
             try:
-                font = ImageFont.truetype("arial.ttf", 12)
+                font = ImageFont.truetype("arial.ttf", max(1, round(12 * self.px_scale)))
             except:
                 font = ImageFont.load_default()
             
@@ -109,10 +111,10 @@ class BarcodeGenerator:
             text_height = text_bbox[3] - text_bbox[1]
             
             # Margins
-            margin_x = 20
-            margin_top = 15
-            margin_bottom = 10
-            text_spacing = 8  # Space between barcode and text
+            margin_x = round(20 * self.px_scale)
+            margin_top = round(15 * self.px_scale)
+            margin_bottom = round(10 * self.px_scale)
+            text_spacing = round(8 * self.px_scale)  # Space between barcode and text
             
             # Available area for barcode
             available_width = label_width_px - (margin_x * 2)
@@ -150,7 +152,7 @@ class BarcodeGenerator:
             text_y = barcode_y + new_height + text_spacing
             draw.text((text_x, text_y), value_text, fill='black', font=font)
             
-            log_event(f"Created label: barcode {new_width}x{new_height}px on {label_width_px}x{label_height_px}px label")
+            log_event(f"Created label: barcode {new_width}x{new_height}px on {label_width_px}x{label_height_px}px label", 'debug')
             return label
         
         except Exception as e:
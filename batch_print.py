@@ -0,0 +1,175 @@
+"""
+Headless batch printing for the Barcode Printer Application
+Prints every module of an exam date (or a list of modules) without the
+GUI, using the same database, label and printer code. With --dry-run the
+printer commands are written to a file instead.
+
+Usage:
+    python batch_print.py --semester 2025-1 --date 2026-01-15
+    python batch_print.py --semester 2025-1 --modules CSC101 MTH102 --venue "Main Hall"
+    python batch_print.py --semester 2025-1 --date 2026-01-15 --dry-run day.tspl
+"""
+import argparse
+import os
+import sys
+import time
+
+import config
+import settings_manager
+from barcode_generator import BarcodeGenerator
+from database import DatabaseManager
+from printer import PrinterManager
+from printer_backends import FileBackend
+from progress import ProgressTracker
+from utils import setup_logging, log_event
+import raster
+
+
+class LabelRenderer:
+    """1-bit labels for bitmap/GDI modes, one generator per printer DPI"""
+
+    def __init__(self, settings: dict):
+        self.settings = settings
+        self.generators = {}
+
+    def __call__(self, student: dict, dpi: int = None):
+        dpi = dpi or config.PRINTER_CONFIG['dpi']
+        generator = self.generators.get(dpi)
+        if generator is None:
+            generator = self.generators[dpi] = BarcodeGenerator(self.settings, dpi)
+        barcode_val = student.get('Barcode', student.get('StudentID'))
+        return raster.to_monochrome(generator.create_barcode_card(barcode_value=str(barcode_val)))
+
+
+def find_semester(db: DatabaseManager, semester: str) -> str:
+    """SemesterCode for a semester code or name (case-insensitive)"""
+    wanted = semester.strip().lower()
+    for sem in db.get_semesters():
+        if wanted in (str(sem.get('SemesterCode', '')).lower(), str(sem.get('SemesterName', '')).lower()):
+            return sem.get('SemesterCode')
+    return semester  # Not listed: use as given
+
+
+def select_students(students: list, venues: list) -> list:
+    """Students in one of the venues (case-insensitive), or all"""
+    if not venues:
+        return students
+    wanted = {v.strip().lower() for v in venues}
+    return [s for s in students if str(s.get('VenueName', '')).strip().lower() in wanted]
+
+
+def print_module(printer: PrinterManager, name: str, students: list, options: dict,
+                 interval: float = 0.5) -> int:
+    """Print one module's labels chunk by chunk; returns labels confirmed"""
+    tracker = ProgressTracker(name, len(students))
+    chunk_size = max(1, options['chunk_size'])
+    last_report = 0.0
+    for start in range(0, len(students), chunk_size):
+        chunk = students[start:start + chunk_size]
+        confirmed = printer.print_batch(
+            chunk, mode=options['mode'], use_template=options['use_template'],
+            label_renderer=options['label_renderer'], chunk_size=len(chunk),
+            job_name=f"{name} ({start + 1}-{start + len(chunk)})"
+        )
+        tracker.advance(confirmed, failed=len(chunk) - confirmed)
+        if confirmed < len(chunk):
+            break
+        # Progress at most every interval seconds
+        now = time.monotonic()
+        if now - last_report >= interval and tracker.done < tracker.total:
+            print(f"  {tracker.describe()}", flush=True)
+            last_report = now
+    tracker.finish()
+    print(f"  {tracker.summary()}", flush=True)
+    return tracker.done - tracker.failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print exam barcode labels without the GUI")
+    parser.add_argument('--semester', required=True, help="Semester code or name")
+    parser.add_argument('--date', help="Exam date (YYYY-MM-DD): print every module on that date")
+    parser.add_argument('--modules', nargs='+', help="Module codes to print (filters --date modules)")
+    parser.add_argument('--venue', action='append', default=[],
+                        help="Only students in this venue (repeat for several)")
+    parser.add_argument('--mode', choices=['tspl', 'bitmap', 'gdi'], default=None,
+                        help="Print method (default: print_mode from settings)")
+    parser.add_argument('--template', action='store_true', default=None,
+                        help="Use the printer-resident TSPL template")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="Labels per print job (default: tspl_chunk_labels)")
+    parser.add_argument('--printer', default=None, help="Printer name (default: from settings)")
+    parser.add_argument('--dry-run', metavar='FILE', default=None,
+                        help="Write the printer commands to FILE instead of printing")
+    args = parser.parse_args()
+
+    if not args.date and not args.modules:
+        parser.error("give --date, --modules or both")
+
+    setup_logging()
+    settings = settings_manager.load_settings()
+    mode = args.mode or settings.get('print_mode', 'tspl')
+    if args.dry_run and mode == 'gdi':
+        parser.error("--dry-run writes raw printer commands; use --mode tspl or bitmap")
+
+    db = DatabaseManager()
+    semester_code = find_semester(db, args.semester)
+
+    modules = args.modules
+    if args.date:
+        on_date = [m.get('ModuleCode') for m in db.get_modules_by_date(args.date, semester_code)]
+        if modules:
+            wanted = {m.upper() for m in modules}
+            modules = [m for m in on_date if m.upper() in wanted]
+        else:
+            modules = on_date
+    if not modules:
+        print("No modules to print.")
+        sys.exit(2)
+
+    if args.dry_run:
+        if os.path.exists(args.dry_run):
+            os.remove(args.dry_run)
+        printer = PrinterManager(backend=FileBackend(args.dry_run))
+    else:
+        printer = PrinterManager(printer_name=args.printer or settings.get('printer_name'))
+        printer.registry.refresh()
+        if not printer.is_printer_available():
+            print(f"Printer '{printer.printer_name}' is not available.")
+            sys.exit(1)
+
+    options = {
+        'mode': mode,
+        'use_template': settings.get('tspl_use_template', False) if args.template is None else args.template,
+        'chunk_size': args.chunk_size or settings.get('tspl_chunk_labels') or 25,
+        'label_renderer': LabelRenderer(settings),
+    }
+
+    total_printed = 0
+    total_labels = 0
+    started = time.monotonic()
+    try:
+        for n, module_code in enumerate(modules, 1):
+            students = select_students(db.get_barcode_data(module_code, semester_code), args.venue)
+            print(f"[{n}/{len(modules)}] {module_code}: {len(students)} label(s)", flush=True)
+            if not students:
+                continue
+            total_labels += len(students)
+            printed = print_module(printer, module_code, students, options)
+            total_printed += printed
+            if printed < len(students):
+                print(f"Printer stopped during {module_code}; "
+                      f"{len(students) - printed} label(s) of it not printed.")
+                log_event(f"Batch print stopped at {module_code} ({printed}/{len(students)})", 'error')
+                sys.exit(1)
+    finally:
+        printer.close()
+
+    elapsed = time.monotonic() - started
+    target = f"written to {args.dry_run}" if args.dry_run else "printed"
+    print(f"Done: {total_printed}/{total_labels} label(s) from {len(modules)} module(s) "
+          f"{target} in {elapsed:.1f}s")
+    log_event(f"Batch print: {total_printed} labels from {len(modules)} modules {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,471 @@
+"""
+Benchmark suite for the generate -> preview -> print pipeline
+Runs against a synthetic dataset, a local SQLite stand-in for the MySQL
+database and a null/file printer backend, then writes the results to JSON.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --sizes 10 100 --output bench.json
+    python benchmark.py --baseline bench_baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from barcode_generator import BarcodeGenerator
+from database import DatabaseManager
+from label_preview import ThumbnailCache
+from printer import PrinterManager
+from printer_backends import FileBackend
+import raster
+
+
+DEFAULT_SIZES = [10, 100, 1000, 5000]
+SEMESTER_CODE = 'BENCH'
+EXAM_DATE = '2026-01-15'
+STUDENTS_PER_VENUE = 60
+PREVIEW_TILE_WIDTH = 240  # LabelPreview default tile width
+PREVIEW_PAGE = 12  # tiles visible at once in the preview pane
+
+
+# ---------------------------------------------------------------------------
+# Local database stand-in
+# ---------------------------------------------------------------------------
+
+class _LocalCursor:
+    """Minimal mysql.connector cursor look-alike on top of sqlite3"""
+
+    def __init__(self, connection: sqlite3.Connection, dictionary: bool = False):
+        self._cursor = connection.cursor()
+        self._dictionary = dictionary
+
+    def execute(self, query: str, params: tuple = None):
+        self._cursor.execute(query.replace('%s', '?'), params or ())
+
+    def _convert(self, row):
+        if row is None or not self._dictionary:
+            return row
+        columns = [col[0] for col in self._cursor.description]
+        return dict(zip(columns, row))
+
+    def fetchall(self):
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def fetchone(self):
+        return self._convert(self._cursor.fetchone())
+
+    def close(self):
+        self._cursor.close()
+
+
+class _LocalConnection:
+    """Pooled-connection look-alike; close() returns it to the 'pool'"""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+
+    def cursor(self, dictionary: bool = False):
+        return _LocalCursor(self._connection, dictionary)
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+class LocalDatabaseManager(DatabaseManager):
+    """DatabaseManager backed by an in-memory SQLite copy of the exam schema"""
+
+    def __init__(self, sizes: list):
+        self.db_config = {}
+        self.connection = None
+        self.pool = None
+        self._db = sqlite3.connect(':memory:', check_same_thread=False)
+        self._db.create_function('getmodulename', 1, lambda code: f"Benchmark Module {code}")
+        self._build_schema()
+        for size in sizes:
+            self._add_module(module_code_for(size), size)
+        self._db.commit()
+
+    def _build_schema(self):
+        self._db.executescript("""
+            CREATE TABLE timetable_semester (
+                EntryID INTEGER PRIMARY KEY, SemesterCode TEXT, SemesterName TEXT);
+            CREATE TABLE timetable_venue (
+                EntryID INTEGER PRIMARY KEY, VenueName TEXT);
+            CREATE TABLE exam_timetable (
+                EntryID INTEGER PRIMARY KEY, ModuleCode TEXT, SemesterCode TEXT, ExamDate TEXT);
+            CREATE TABLE exam_timetable_hall (
+                EntryID INTEGER PRIMARY KEY, ModuleCode TEXT, SemesterCode TEXT, VenueID INTEGER);
+            CREATE TABLE exam_barcode (
+                EntryID INTEGER PRIMARY KEY, ExamHallID INTEGER, StudentID TEXT,
+                SeatNo INTEGER, StudentLevel TEXT, Barcode TEXT);
+            CREATE INDEX idx_eb_hall ON exam_barcode (ExamHallID);
+            CREATE INDEX idx_eb_barcode ON exam_barcode (Barcode);
+            CREATE INDEX idx_eb_student ON exam_barcode (StudentID);
+            CREATE INDEX idx_eth_module ON exam_timetable_hall (ModuleCode, SemesterCode);
+        """)
+        self._db.execute(
+            "INSERT INTO timetable_semester (SemesterCode, SemesterName) VALUES (?, ?)",
+            (SEMESTER_CODE, 'Benchmark Semester')
+        )
+
+    def _add_module(self, module_code: str, size: int):
+        self._db.execute(
+            "INSERT INTO exam_timetable (ModuleCode, SemesterCode, ExamDate) VALUES (?, ?, ?)",
+            (module_code, SEMESTER_CODE, EXAM_DATE)
+        )
+        students = synthetic_students(module_code, size)
+        hall_ids = {}
+        for student in students:
+            venue = student['VenueName']
+            if venue not in hall_ids:
+                cur = self._db.execute("INSERT INTO timetable_venue (VenueName) VALUES (?)", (venue,))
+                cur = self._db.execute(
+                    "INSERT INTO exam_timetable_hall (ModuleCode, SemesterCode, VenueID) VALUES (?, ?, ?)",
+                    (module_code, SEMESTER_CODE, cur.lastrowid)
+                )
+                hall_ids[venue] = cur.lastrowid
+            self._db.execute(
+                "INSERT INTO exam_barcode (ExamHallID, StudentID, SeatNo, StudentLevel, Barcode) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (hall_ids[venue], student['StudentID'], student['SeatNo'],
+                 student['StudentLevel'], student['Barcode'])
+            )
+
+    def get_connection(self):
+        return _LocalConnection(self._db)
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def module_code_for(size: int) -> str:
+    return f"BEN{size:05d}"
+
+
+def synthetic_students(module_code: str, size: int) -> list:
+    """Deterministic student rows shaped like DatabaseManager.get_barcode_data"""
+    students = []
+    for i in range(size):
+        students.append({
+            'StudentID': f"{module_code}S{i:05d}",
+            'SeatNo': i + 1,
+            'StudentLevel': str(100 * (1 + i % 4)),
+            'Barcode': f"{module_code[3:]}{i:06d}",
+            'VenueName': f"Hall {chr(ord('A') + (i // STUDENTS_PER_VENUE) % 26)}",
+        })
+    return students
+
+
+def peak_rss_mb():
+    """
+    Process peak resident set size in MB, or None if it cannot be measured.
+    The peak never goes down, so each size is benchmarked in its own process.
+    """
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, kilobytes elsewhere
+        divisor = 1024 * 1024 if sys.platform == 'darwin' else 1024
+        return round(peak / divisor, 1)
+    except ImportError:
+        pass
+    try:
+        # Windows: psutil exposes the peak working set
+        import psutil
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', None) or info.rss
+        return round(peak / (1024 * 1024), 1)
+    except ImportError:
+        return None
+
+
+def time_call(func, repeat: int = 1):
+    """Run func `repeat` times and return (last_result, list_of_seconds)"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, timings
+
+
+def summarize_ms(timings: list) -> dict:
+    ms = sorted(t * 1000 for t in timings)
+    return {
+        'median_ms': round(statistics.median(ms), 3),
+        'min_ms': round(ms[0], 3),
+        'max_ms': round(ms[-1], 3),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Stages
+# ---------------------------------------------------------------------------
+
+def bench_render(generator: BarcodeGenerator, students: list) -> tuple:
+    """
+    Label generation and preview as the app does them: each label is
+    rendered, its preview thumbnail cached and its 1-bit print image kept,
+    so memory stays bounded for any size. Returns (print images, labels
+    stats, preview stats).
+    """
+    cache = ThumbnailCache(
+        lambda i: generator.create_barcode_card(barcode_value=str(students[i]['Barcode']))
+    )
+    printable = []
+    render_seconds = thumb_seconds = 0.0
+    for i, student in enumerate(students):
+        start = time.perf_counter()
+        card = generator.create_barcode_card(barcode_value=str(student['Barcode']))
+        rendered = time.perf_counter()
+        cache.get(i, PREVIEW_TILE_WIDTH, image=card)
+        thumb_seconds += time.perf_counter() - rendered
+        render_seconds += rendered - start
+        printable.append(raster.to_monochrome(card))
+
+    labels = {
+        'count': len(students),
+        'seconds': round(render_seconds, 3),
+        'labels_per_sec': round(len(students) / render_seconds, 1) if render_seconds else None,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+    # Scrolling back to a page evicted from the cache renders it again
+    cache.clear()
+    page = range(min(PREVIEW_PAGE, len(students)))
+    _, timings = time_call(lambda: [cache.get(i, PREVIEW_TILE_WIDTH) for i in page])
+    preview = {
+        'seconds': round(thumb_seconds, 3),
+        'thumbnails_per_sec': round(len(students) / thumb_seconds, 1) if thumb_seconds else None,
+        'page_ms': round(timings[0] * 1000, 3),
+        'page_tiles': len(page),
+    }
+    return printable, labels, preview
+
+
+def bench_tspl(students: list, repeat: int, output_path: str = None,
+               use_template: bool = False) -> dict:
+    sink = FileBackend(output_path)
+    printer = PrinterManager(backend=sink)
+    ok, timings = time_call(lambda: printer.print_tspl_data(students, use_template), repeat)
+    bytes_per_job = sink.bytes_written // repeat
+    return {
+        'ok': bool(ok),
+        'chunks': sink.jobs_written // repeat,
+        'bytes': bytes_per_job,
+        'bytes_per_label': round(bytes_per_job / len(students), 1) if students else None,
+        **summarize_ms(timings),
+    }
+
+
+def bench_bitmap(labels: list, repeat: int) -> dict:
+    sink = FileBackend()
+    printer = PrinterManager(backend=sink)
+    confirmed, timings = time_call(lambda: printer.stream_bitmap_data(labels), repeat)
+    bytes_per_job = sink.bytes_written // repeat
+    return {
+        'ok': confirmed == len(labels),
+        'bytes': bytes_per_job,
+        'bytes_per_label': round(bytes_per_job / len(labels), 1) if labels else None,
+        **summarize_ms(timings),
+    }
+
+
+def bench_queries(db: LocalDatabaseManager, size: int, repeat: int) -> dict:
+    module_code = module_code_for(size)
+    students = synthetic_students(module_code, size)
+    probe = [students[i]['Barcode'] for i in range(0, size, max(size // repeat, 1))][:repeat]
+
+    results = {}
+    _, timings = time_call(lambda: db.get_barcode_data(module_code, SEMESTER_CODE), repeat)
+    results['get_barcode_data'] = summarize_ms(timings)
+
+    _, timings = time_call(lambda: db.get_module_name(module_code), repeat)
+    results['get_module_name'] = summarize_ms(timings)
+
+    timings = []
+    for barcode in probe:
+        _, t = time_call(lambda: db.get_student_by_barcode(barcode))
+        timings.extend(t)
+    results['get_student_by_barcode'] = summarize_ms(timings)
+    return results
+
+
+def bench_shared_queries(db: LocalDatabaseManager, repeat: int) -> dict:
+    results = {}
+    _, timings = time_call(db.get_semesters, repeat)
+    results['get_semesters'] = summarize_ms(timings)
+    _, timings = time_call(lambda: db.get_exam_dates(SEMESTER_CODE), repeat)
+    results['get_exam_dates'] = summarize_ms(timings)
+    _, timings = time_call(lambda: db.get_modules_by_date(EXAM_DATE, SEMESTER_CODE), repeat)
+    results['get_modules_by_date'] = summarize_ms(timings)
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Regression check
+# ---------------------------------------------------------------------------
+
+# (path suffix, True if higher is better)
+TRACKED_METRICS = [
+    ('labels.labels_per_sec', True),
+    ('preview.seconds', False),
+    ('preview.page_ms', False),
+    ('tspl.median_ms', False),
+    ('tspl.bytes', False),
+    ('tspl_template.median_ms', False),
+    ('tspl_template.bytes', False),
+    ('tspl_bitmap.median_ms', False),
+    ('queries.get_barcode_data.median_ms', False),
+    ('queries.get_student_by_barcode.median_ms', False),
+]
+
+
+def _lookup(data: dict, dotted: str):
+    for key in dotted.split('.'):
+        if not isinstance(data, dict) or key not in data:
+            return None
+        data = data[key]
+    return data
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list:
+    """Return a list of human-readable regressions beyond `tolerance`"""
+    regressions = []
+    for size, current in results['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size)
+        if not previous:
+            continue
+        for metric, higher_is_better in TRACKED_METRICS:
+            new, old = _lookup(current, metric), _lookup(previous, metric)
+            if not isinstance(new, (int, float)) or not isinstance(old, (int, float)) or not old:
+                continue
+            change = (new - old) / old
+            if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+                regressions.append(f"{size} students: {metric} {old} -> {new} ({change:+.0%})")
+    return regressions
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def bench_size(size: int, repeat: int, render: bool, tspl_output: str = None) -> dict:
+    """All per-size stages; run in a fresh process so peak RSS belongs to this size"""
+    db = LocalDatabaseManager([size])
+    generator = BarcodeGenerator()
+
+    print(f"\n[{size} students]", flush=True)
+    students = db.get_barcode_data(module_code_for(size), SEMESTER_CODE)
+    entry = {'queries': bench_queries(db, size, repeat)}
+    print(f"  queries   get_barcode_data {entry['queries']['get_barcode_data']['median_ms']} ms")
+
+    entry['tspl'] = bench_tspl(students, repeat, tspl_output)
+    print(f"  tspl      {entry['tspl']['bytes']} bytes in {entry['tspl']['median_ms']} ms")
+
+    entry['tspl_template'] = bench_tspl(students, repeat, use_template=True)
+    print(f"  template  {entry['tspl_template']['bytes']} bytes in "
+          f"{entry['tspl_template']['median_ms']} ms")
+
+    if render:
+        labels, entry['labels'], entry['preview'] = bench_render(generator, students)
+        print(f"  labels    {entry['labels']['labels_per_sec']} labels/sec, "
+              f"peak RSS {entry['labels']['peak_rss_mb']} MB")
+        print(f"  preview   {entry['preview']['thumbnails_per_sec']} thumbnails/sec, "
+              f"{entry['preview']['page_ms']} ms to re-render a page")
+        entry['tspl_bitmap'] = bench_bitmap(labels, repeat)
+        print(f"  bitmap    {entry['tspl_bitmap']['bytes']} bytes in {entry['tspl_bitmap']['median_ms']} ms")
+        del labels
+    else:
+        skipped = {'skipped': "size above --render-limit"}
+        entry['labels'] = dict(skipped)
+        entry['preview'] = dict(skipped)
+        entry['tspl_bitmap'] = dict(skipped)
+        print("  labels    skipped (above --render-limit)")
+
+    entry['peak_rss_mb'] = peak_rss_mb()
+    print(f"  peak RSS  {entry['peak_rss_mb']} MB", flush=True)
+    return entry
+
+
+def run(sizes: list, repeat: int, render_limit: int = None, tspl_output: str = None) -> dict:
+    print(f"Building local database for sizes {sizes}...")
+    db = LocalDatabaseManager(sizes)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': repeat,
+            'render_limit': render_limit,
+        },
+        'shared_queries': bench_shared_queries(db, repeat),
+        'sizes': {},
+    }
+
+    # One fresh process per size: otherwise every size after the largest
+    # would report the largest one's peak RSS
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        render = render_limit is None or size <= render_limit
+        with context.Pool(1) as pool:
+            entry = pool.apply(bench_size, (size, repeat, render, tspl_output))
+        results['sizes'][str(size)] = entry
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the barcode generate/preview/print pipeline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Student counts to benchmark (default: 10 100 1000 5000)")
+    parser.add_argument('--repeat', type=int, default=5,
+                        help="Repetitions for timed query and TSPL stages")
+    parser.add_argument('--render-limit', type=int, default=None,
+                        help="Skip label rendering/preview above this many students (default: no limit)")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="Where to write the JSON results")
+    parser.add_argument('--tspl-output', default=None,
+                        help="Also append the generated TSPL bytes to this file")
+    parser.add_argument('--baseline', default=None,
+                        help="Previous results JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed relative regression against the baseline (default 0.2)")
+    args = parser.parse_args()
+
+    if args.tspl_output and os.path.exists(args.tspl_output):
+        os.remove(args.tspl_output)
+
+    results = run(sorted(set(args.sizes)), args.repeat, args.render_limit, args.tspl_output)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n[FAIL] {len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"[OK] No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
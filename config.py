@@ -26,6 +26,29 @@ PRINTER_CONFIG = {
     'card_width_mm': 60.0,   # Label width (updated to 60mm)
     'card_height_mm': 40.0,  # Label height (updated to 40mm)
     'dpi': 203,              # Thermal printer standard DPI (203 or 300)
+    'tspl_use_template': False,  # Download the label form once; resent after printer errors or a pause
+    'tspl_chunk_labels': 25,     # Labels per chunk when streaming TSPL (resume granularity)
+    'print_mode': 'tspl',        # 'tspl' (printer fonts/barcodes), 'bitmap' (prints the preview) or 'gdi' (Windows driver)
+    'command_language': 'tspl',  # Raw label language: 'tspl', 'zpl' (Zebra) or 'escpos' (receipt printers)
+    # Raw transport: 'auto' (Windows spooler on Windows, CUPS elsewhere),
+    # 'win32', 'socket' (host/port, usually 9100), 'cups', or 'file'
+    # (path, None for a null sink; bytes_per_sec simulates printer speed)
+    'backend': 'auto',
+    'backend_options': {},
+    'discovery_refresh_sec': 60,  # Background printer re-enumeration interval
+    # Status polling on transports that can read replies (socket): how often
+    # to re-check a printer reporting an error, and how long to wait for it
+    'status_poll_sec': 2.0,
+    'status_wait_sec': 300,
+    # After each chunk, how often to poll and how long to wait for the
+    # printer to finish it before the chunk counts as printed (socket only)
+    'print_confirm_poll_sec': 0.25,
+    'print_confirm_sec': 120,
+    # Printers that share each batch (two or more enables parallel dispatch):
+    # printer names on the backend above, or dicts such as
+    # {'backend': 'socket', 'host': '10.0.0.21'}
+    'printer_group': [],
+    'printer_group_split': 'round_robin',  # 'round_robin' chunks or 'venue'
 }
 
 # Note: XPrinter XP-365B specs:
@@ -40,5 +63,30 @@ APP_SETTINGS = {
     'title': 'Cosmopolitan EDU - Barcode Printer',
     'window_width': 800,
     'window_height': 600,
-    'log_file': 'barcode_printer.log'
+    'log_file': 'barcode_printer.log',
+    'log_level': 'INFO',  # 'DEBUG' also logs every generated barcode and label
+    'log_max_bytes': 5 * 1024 * 1024,  # Rotate the log file at this size...
+    'log_rotate_when': None,  # ...or by time instead, e.g. 'midnight'
+    'log_backups': 5,  # Rotated logs kept (gzipped)
+    'print_queue_file': 'print_queue.json',
+    'preview_cache_items': 600,  # Label thumbnails kept for the preview views
+    'activity_log_lines': 1000,  # Lines kept in the Activity Log panel (file log keeps all)
+    'progress_fps': 10,  # Progress bar redraws per second during batches
+    'prefetch_modules': 10,  # Student lists fetched ahead for the selected date's modules
+    'prefetch_labels': 200,  # Labels of the next module pre-rendered for the preview (0 = off)
+    'prefetch_ttl_sec': 300,  # Prefetched student lists older than this are queried again
+    'scan_debounce_sec': 2.0,  # The same code scanned again within this is not looked up again
+    'attendance_refresh_ms': 1000,  # Attendance dashboard redraw interval
+}
+
+# Scan lookup service (lookup_service.py): one warm in-memory index that
+# scan stations query over HTTP instead of hitting MySQL per scan
+LOOKUP_SERVICE = {
+    'host': '127.0.0.1',   # '0.0.0.0' to serve other machines on the LAN
+    'port': 8765,
+    'workers': 8,          # Requests handled at once (idle connections wait without a worker)
+    'refresh_sec': 300,    # Reload the index from the database this often
+    'idle_timeout_sec': 30,  # Close keep-alive connections idle this long
+    'semester_code': None,   # Only index this semester (None = all)
+    'url': None,           # e.g. 'http://127.0.0.1:8765': GUI scans use the service
 }
@@ -1,6 +1,7 @@
 """
 Database operations for the Barcode Printer Application
 """
+import threading
 import mysql.connector
 from mysql.connector import Error, pooling
 from typing import List, Dict, Optional
@@ -11,27 +12,43 @@ import settings_manager
 class DatabaseManager:
     """Handles all database interactions"""
     
-    def __init__(self):
-        """Initialize database connection pool"""
+    def __init__(self, connect: bool = True):
+        """
+        Initialize database connection pool. With connect=False the pool is
+        created by init_pool() or on first use, so construction never waits
+        on the server.
+        """
         self.db_config = settings_manager.load_db_settings()
         self.connection = None
         self.pool = None
+        self._pool_lock = threading.Lock()
         
-        try:
-            self.pool = mysql.connector.pooling.MySQLConnectionPool(
-                pool_name="mypool",
-                pool_size=5,
-                **self.db_config
-            )
-            log_event("Database connection pool initialized")
-        except Error as e:
-            log_event(f"Error initializing connection pool: {e}", 'error')
-            # Don't raise here, allow app to start even if DB is down, 
-            # so user can change settings
+        if connect:
+            self.init_pool()
+    
+    def init_pool(self) -> bool:
+        """Create the connection pool if it does not exist yet"""
+        with self._pool_lock:
+            if self.pool:
+                return True
+            try:
+                self.pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name="mypool",
+                    pool_size=5,
+                    **self.db_config
+                )
+                log_event("Database connection pool initialized")
+                return True
+            except Error as e:
+                log_event(f"Error initializing connection pool: {e}", 'error')
+                # Don't raise here, allow app to start even if DB is down, 
+                # so user can change settings
+                return False
     
     def get_connection(self):
         """Get a connection from the pool"""
-        if not self.pool:
+        # Lazily created (or retried after the server was down at startup)
+        if not self.pool and not self.init_pool():
              raise Error("Connection pool not initialized")
              
         try:
@@ -40,8 +57,12 @@ class DatabaseManager:
             log_event(f"Error getting connection: {e}", 'error')
             raise
     
-    def execute_query(self, query: str, params: tuple = None) -> List[Dict]:
-        """Execute a SELECT query and return results as list of dictionaries"""
+    def execute_query(self, query: str, params: tuple = None, raise_errors: bool = False) -> List[Dict]:
+        """
+        Execute a SELECT query and return results as list of dictionaries.
+        Errors give [] unless raise_errors, for callers that must tell
+        "no rows" from "database unavailable".
+        """
         connection = None
         cursor = None
         try:
@@ -58,6 +79,8 @@ class DatabaseManager:
         
         except Error as e:
             log_event(f"Database query error: {e}", 'error')
+            if raise_errors:
+                raise
             return []
         
         finally:
@@ -110,7 +133,7 @@ class DatabaseManager:
             
             if result and result[0]:
                 module_name = result[0]
-                log_event(f"Retrieved module name for {module_code}: {module_name}")
+                log_event(f"Retrieved module name for {module_code}: {module_name}", 'debug')
                 return module_name
             else:
                 log_event(f"No module name found for {module_code}", 'warning')
@@ -184,8 +207,11 @@ class DatabaseManager:
             log_event(f"Error fetching modules by date: {e}", 'error')
             return []
 
-    def get_student_by_barcode(self, barcode: str) -> Optional[Dict]:
-        """Fetch student and exam details by barcode"""
+    def get_student_by_barcode(self, barcode: str, raise_errors: bool = False) -> Optional[Dict]:
+        """
+        Fetch student and exam details by barcode (or StudentID). None if
+        not found, or on a database error unless raise_errors.
+        """
         # We need to join multiple tables to get full exam details
         # exam_barcode -> exam_timetable_hall -> timetable_venue
         #                                     -> exam_timetable (for date/time if needed)
@@ -220,14 +246,39 @@ class DatabaseManager:
             LIMIT 1
         """
         try:
-            results = self.execute_query(query_safe, (barcode, barcode))
+            results = self.execute_query(query_safe, (barcode, barcode), raise_errors)
             if results:
                 return results[0]
             return None
         except Exception as e:
             log_event(f"Error fetching student by barcode: {e}", 'error')
+            if raise_errors:
+                raise
             return None
 
+    def get_all_barcode_records(self, semester_code: str = None) -> List[Dict]:
+        """Every student/exam row get_student_by_barcode can return (for the lookup index)"""
+        query = """
+            SELECT 
+                eb.StudentID, eb.SeatNo, eb.StudentLevel, eb.Barcode,
+                tv.VenueName, 
+                eth.ModuleCode
+            FROM exam_barcode eb
+            JOIN exam_timetable_hall eth ON eb.ExamHallID = eth.EntryID
+            JOIN timetable_venue tv ON eth.VenueID = tv.EntryID
+        """
+        params = None
+        if semester_code:
+            query += " WHERE eth.SemesterCode = %s"
+            params = (semester_code,)
+        try:
+            results = self.execute_query(query, params)
+            log_event(f"Retrieved {len(results)} barcode records for the lookup index")
+            return results
+        except Exception as e:
+            log_event(f"Error fetching barcode records: {e}", 'error')
+            return []
+
     def test_connection(self) -> bool:
         """Test database connection"""
         try:
@@ -0,0 +1,294 @@
+"""
+Virtualized label preview for the Barcode Printer Application
+Labels are laid out logically on a Canvas and only the tiles inside the
+viewport exist as PhotoImages; thumbnails come from a bounded LRU cache
+and missing ones are rendered on a background thread, so memory and
+scrolling cost stay the same for any batch size.
+"""
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import ttkbootstrap as ttk
+from PIL import Image, ImageTk
+
+import config
+from utils import log_event
+
+
+class ThumbnailCache:
+    """
+    LRU cache of label thumbnails keyed by (label index, width).
+    render(index) returns the full-size label when a thumbnail is missing.
+    clear() starts a new generation: a thumbnail rendered for an older one
+    (e.g. the previous module's label still in flight) is not stored.
+    """
+
+    def __init__(self, render: Callable, max_items: int = None):
+        self.render = render
+        self.max_items = max_items or config.APP_SETTINGS.get('preview_cache_items', 600)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+
+    def peek(self, index: int, width: int) -> Optional[Image.Image]:
+        """Cached thumbnail or None, without rendering"""
+        with self._lock:
+            thumb = self._items.get((index, width))
+            if thumb is not None:
+                self._items.move_to_end((index, width))
+            return thumb
+
+    def get(self, index: int, width: int, image: Image.Image = None,
+            generation: int = None) -> Image.Image:
+        """
+        Thumbnail of a label, rendered (or taken from image) on a miss.
+        It is cached only if the cache is still at generation (by default
+        the one current when get() was called).
+        """
+        if generation is None:
+            generation = self.generation
+        thumb = self.peek(index, width)
+        if thumb is not None:
+            return thumb
+
+        if image is None:
+            image = self.render(index)
+        thumb = self.make_thumbnail(image, width)
+        self.put(index, width, thumb, generation)
+        return thumb
+
+    def put(self, index: int, width: int, thumb: Image.Image, generation: int = None) -> bool:
+        """Store a thumbnail rendered elsewhere (e.g. prefetched); False if its generation is over"""
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._items[(index, width)] = thumb
+            self._items.move_to_end((index, width))
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+        return True
+
+    @staticmethod
+    def make_thumbnail(image: Image.Image, width: int) -> Image.Image:
+        # Labels are black and white: greyscale keeps thin bars visible when
+        # reduced and takes a third of the memory of RGB
+        if image.mode != 'L':
+            image = image.convert('L')
+        if image.width == width:
+            return image
+        height = max(1, round(image.height * width / image.width))
+        return image.resize((width, height), Image.Resampling.BOX)
+
+
+class LabelPreview(ttk.Frame):
+    """
+    Scrollable grid of label thumbnails that only draws what is visible.
+    columns=None fits as many columns as the width allows; caption(index),
+    if given, is drawn above each label and labels get a cut-line border.
+    """
+
+    CAPTION_HEIGHT = 22
+
+    def __init__(self, master, cache: ThumbnailCache, tile_width: int = 240,
+                 label_size: tuple = (480, 320), spacing: int = 10,
+                 placeholder: str = "Waiting for generation...", columns: int = None,
+                 caption: Callable = None, background: str = '#f8f9fa', **kwargs):
+        super().__init__(master, **kwargs)
+        self.cache = cache
+        self.tile_width = tile_width
+        self.tile_height = max(1, round(label_size[1] * tile_width / label_size[0]))
+        self.spacing = spacing
+        self.placeholder = placeholder
+        self.count = 0
+        self.fixed_columns = columns
+        self.columns = columns or 1
+        self.caption = caption
+        self.caption_height = self.CAPTION_HEIGHT if caption else 0
+        self._width = 0
+
+        self.canvas = tk.Canvas(self, background=background, highlightthickness=0)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self._on_yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self._tiles = {}  # index -> PhotoImage, for visible tiles only
+        self._wanted = []  # visible indices still waiting for a thumbnail
+        self._wake = threading.Event()
+        self._stopping = False
+        self._redraw_pending = False
+        threading.Thread(target=self._render_worker, name="LabelPreview", daemon=True).start()
+
+        self.canvas.bind("<Configure>", lambda e: self._layout())
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll(1))
+        self.bind("<Destroy>", self._on_destroy)
+        self._show_placeholder()
+
+    # -- data -------------------------------------------------------------
+
+    def set_count(self, count: int):
+        """Show labels 0..count-1 (call again as more labels become available)"""
+        if count == self.count:
+            return
+        if count < self.count:
+            self.clear_tiles()
+        self.count = count
+        self._layout()
+
+    def reset(self, placeholder: str = None):
+        """Drop all tiles and show the placeholder text"""
+        if placeholder is not None:
+            self.placeholder = placeholder
+        self.count = 0
+        self.clear_tiles()
+        self.canvas.yview_moveto(0)
+        self._layout()
+
+    def set_label_size(self, label_size: tuple):
+        """Change the label aspect ratio (label settings changed)"""
+        self.tile_height = max(1, round(label_size[1] * self.tile_width / label_size[0]))
+        self.clear_tiles()
+        self._layout()
+
+    def clear_tiles(self):
+        self.canvas.delete("tile")
+        self._tiles.clear()
+
+    # -- layout -----------------------------------------------------------
+
+    def _row_height(self) -> int:
+        return self.caption_height + self.tile_height + self.spacing
+
+    def _layout(self):
+        """Recompute columns and scroll region, then draw the viewport"""
+        width = max(self.canvas.winfo_width(), 1)
+        columns = self.fixed_columns or max(1, (width - self.spacing) // (self.tile_width + self.spacing))
+        # Centred fixed columns move with the width; grid tiles move with the column count
+        if columns != self.columns or (self.fixed_columns and width != self._width):
+            self.columns = columns
+            self.clear_tiles()
+        self._width = width
+
+        rows = -(-self.count // self.columns)
+        height = rows * self._row_height() + self.spacing
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+        self._show_placeholder()
+        self._draw_visible()
+
+    def _show_placeholder(self):
+        self.canvas.delete("placeholder")
+        if self.count == 0:
+            self.canvas.create_text(
+                max(self.canvas.winfo_width(), 1) // 2, max(self.canvas.winfo_height(), 1) // 2,
+                text=self.placeholder, fill='gray', tags="placeholder"
+            )
+
+    def visible_range(self) -> range:
+        """Indices of labels whose row intersects the viewport"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first_row = max(0, int(top // self._row_height()))
+        last_row = int(bottom // self._row_height())
+        start = first_row * self.columns
+        return range(start, min(self.count, (last_row + 1) * self.columns))
+
+    def tile_position(self, index: int) -> tuple:
+        row, col = divmod(index, self.columns)
+        x = self.spacing + col * (self.tile_width + self.spacing)
+        if self.fixed_columns:
+            # Centre fixed columns in the view
+            used = self.columns * (self.tile_width + self.spacing) + self.spacing
+            x += max(0, (self.canvas.winfo_width() - used) // 2)
+        return x, self.spacing + row * self._row_height()
+
+    def _draw_visible(self):
+        visible = self.visible_range()
+
+        # Release PhotoImages that scrolled out of view
+        for index in [i for i in self._tiles if i not in visible]:
+            del self._tiles[index]
+            self.canvas.delete(f"tile{index}")
+
+        wanted = []
+        for index in visible:
+            if index in self._tiles:
+                continue
+            thumb = self.cache.peek(index, self.tile_width)
+            if thumb is None:
+                wanted.append(index)
+                continue
+            self._place(index, thumb)
+
+        self._wanted = wanted
+        if wanted:
+            self._wake.set()
+
+    def _place(self, index: int, thumb: Image.Image):
+        photo = ImageTk.PhotoImage(thumb)
+        x, y = self.tile_position(index)
+        tags = ("tile", f"tile{index}")
+        if self.caption:
+            self.canvas.create_text(x, y, text=self.caption(index), anchor='nw', tags=tags)
+            y += self.caption_height
+            # Border simulating the label's cut line
+            self.canvas.create_rectangle(x - 1, y - 1, x + thumb.width, y + thumb.height,
+                                         outline='black', tags=tags)
+        self.canvas.create_image(x, y, image=photo, anchor='nw', tags=tags)
+        self._tiles[index] = photo
+
+    # -- background rendering ---------------------------------------------
+
+    def _render_worker(self):
+        while not self._stopping:
+            self._wake.wait()
+            self._wake.clear()
+            for index in list(self._wanted):
+                if self._stopping or index not in self._wanted:
+                    break  # Viewport moved on; start over with the new list
+                try:
+                    self.cache.get(index, self.tile_width)
+                except Exception as e:
+                    log_event(f"Error rendering preview for label {index + 1}: {e}", 'error')
+                    continue
+                self._schedule_redraw()
+
+    def _schedule_redraw(self):
+        if self._redraw_pending or self._stopping:
+            return
+        self._redraw_pending = True
+
+        def redraw():
+            self._redraw_pending = False
+            if not self._stopping:
+                self._draw_visible()
+        try:
+            self.after(0, redraw)
+        except (RuntimeError, tk.TclError):
+            self._redraw_pending = False
+
+    # -- scrolling --------------------------------------------------------
+
+    def _on_yview(self, *args):
+        self.canvas.yview(*args)
+        self._draw_visible()
+
+    def _scroll(self, units: int):
+        self.canvas.yview_scroll(units * 3, "units")
+        self._draw_visible()
+
+    def _on_wheel(self, event):
+        self._scroll(-1 if event.delta > 0 else 1)
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self._stopping = True
+            self._wake.set()
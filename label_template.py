@@ -0,0 +1,292 @@
+"""
+Label template compiler for printer command languages
+A label is described once (size plus barcode/text elements bound to named
+fields) and compiled to a byte template for TSPL, ZPL or ESC/POS. Printing
+a label then only escapes and encodes its field values and splices them
+between pre-encoded command bytes.
+"""
+from typing import Dict, List
+
+import config
+
+
+class BarcodeElement:
+    """Code 128 barcode drawn from a field value"""
+
+    def __init__(self, x: int, y: int, field: str, height: int = 100,
+                 narrow: int = 2, wide: int = 2, readable: bool = True):
+        self.x = x
+        self.y = y
+        self.field = field
+        self.height = height
+        self.narrow = narrow
+        self.wide = wide
+        self.readable = readable
+
+
+class TextElement:
+    """Single line of text drawn from a field value"""
+
+    def __init__(self, x: int, y: int, field: str, font: str = "3", scale: int = 1):
+        self.x = x
+        self.y = y
+        self.field = field
+        self.font = font
+        self.scale = scale
+
+
+class LabelLayout:
+    """Printer-independent description of a label (positions in dots)"""
+
+    def __init__(self, elements: list, width_mm: float = None, height_mm: float = None,
+                 gap_mm: float = 2, dpi: int = None, name: str = "EXAMLBL"):
+        self.elements = elements
+        self.width_mm = width_mm or config.PRINTER_CONFIG['card_width_mm']
+        self.height_mm = height_mm or config.PRINTER_CONFIG['card_height_mm']
+        self.gap_mm = gap_mm
+        self.dpi = dpi or config.PRINTER_CONFIG['dpi']
+        # Name of the form stored in printer memory in template mode
+        self.name = name
+
+    def dots(self, mm: float) -> int:
+        return int(round(mm * self.dpi / 25.4))
+
+    @property
+    def fields(self) -> List[str]:
+        return list(dict.fromkeys(e.field for e in self.elements))
+
+
+def exam_label_layout(width_mm: float = None, height_mm: float = None) -> LabelLayout:
+    """The exam label: student barcode with the hall name underneath"""
+    return LabelLayout([
+        BarcodeElement(30, 30, 'barcode', height=100),
+        TextElement(30, 150, 'hall', font="3"),
+    ], width_mm, height_mm)
+
+
+class LabelTemplate:
+    """
+    Compiled label: constant command bytes with field slots between them.
+    parts mixes bytes with field names; a field name may be given as
+    (name, encoder) to override how that slot is encoded.
+    """
+
+    def __init__(self, preamble: bytes, parts: list, escape, encoding: str = 'utf-8',
+                 header: bytes = None):
+        self.preamble = preamble
+        # Sent instead of the preamble while the printer still holds the stored form
+        self.header = preamble if header is None else header
+        self.escape = escape
+        self.encoding = encoding
+        self.fields = []
+        self._encoders = []
+        constant = []
+        for part in parts:
+            if isinstance(part, bytes):
+                constant.append(part.replace(b'%', b'%%'))
+                continue
+            name, encoder = part if isinstance(part, tuple) else (part, self.encode_field)
+            self.fields.append(name)
+            self._encoders.append(encoder)
+            constant.append(b'%s')
+        # Constants are spliced by one %-format per label (or per chunk), in C
+        self._format = b''.join(constant)
+        self._text_format = None
+        if all(e == self.encode_field for e in self._encoders):
+            try:
+                self._text_format = self._format.decode('ascii')
+            except UnicodeDecodeError:
+                pass
+        self._buffer = bytearray()
+
+    def encode_field(self, value) -> bytes:
+        """Escape and encode one field value"""
+        return self.escape(str(value)).encode(self.encoding, errors='replace')
+
+    def render_row(self, row) -> bytes:
+        """Command bytes for one label from values in self.fields order"""
+        return self._format % tuple([encode(value) for encode, value in zip(self._encoders, row)])
+
+    def render(self, values: Dict[str, object]) -> bytes:
+        """Command bytes for one label from a {field: value} dict"""
+        return self.render_row([values.get(name, '') for name in self.fields])
+
+    def render_rows(self, rows) -> bytes:
+        """Command bytes for several labels (one print chunk)"""
+        rows = list(rows)
+        if self._text_format is None:
+            # Per-slot encoders: build the labels in one reused buffer (not thread-safe;
+            # each PrinterManager compiles its own templates)
+            buf = self._buffer
+            del buf[:]
+            for row in rows:
+                buf += self.render_row(row)
+            return bytes(buf)
+
+        values = [str(v) for row in rows for v in row]
+        # Escaping is per character, so one check over the joined values
+        # tells whether any value in the chunk needs it
+        joined = ''.join(values)
+        if self.escape(joined) != joined:
+            values = [self.escape(v) for v in values]
+        return ((self._text_format * len(rows)) % tuple(values)).encode(self.encoding, errors='replace')
+
+
+_CONTROL_CHARS = dict.fromkeys(range(32))
+
+
+def _strip_controls(value: str) -> str:
+    """Drop line breaks and other control characters that end a command"""
+    return value if value.isprintable() else value.translate(_CONTROL_CHARS)
+
+
+# -- TSPL -------------------------------------------------------------------
+
+# BASIC variable names used by the downloaded form (default: FIELD$)
+TSPL_VARIABLES = {'barcode': 'BC$'}
+
+
+def escape_tspl(value: str) -> str:
+    """Escape a value for a TSPL double-quoted string (\\["] is a literal quote)"""
+    if value.isprintable() and '"' not in value:
+        return value
+    return _strip_controls(value).replace('"', '\\["]')
+
+
+def compile_tspl(layout: LabelLayout, use_form: bool = False) -> LabelTemplate:
+    """
+    Compile to TSPL. With use_form the layout is downloaded once as a BASIC
+    program and each label only assigns its field variables and runs it.
+    """
+    header = (
+        f"SIZE {layout.width_mm:g} mm, {layout.height_mm:g} mm\n"
+        f"GAP {layout.gap_mm:g} mm, 0 mm\n"
+        "DIRECTION 1\n"
+        "CLS\n"
+    ).encode('ascii')
+
+    def draw(element, value: str) -> str:
+        if isinstance(element, BarcodeElement):
+            return (f'BARCODE {element.x},{element.y},"128",{element.height},'
+                    f'{1 if element.readable else 0},0,{element.narrow},{element.wide},{value}\n')
+        return (f'TEXT {element.x},{element.y},"{element.font}",0,'
+                f'{element.scale},{element.scale},{value}\n')
+
+    if use_form:
+        variables = {field: TSPL_VARIABLES.get(field, f"{field.upper()}$") for field in layout.fields}
+        form = f'DOWNLOAD "{layout.name}.BAS"\nCLS\n'
+        form += ''.join(draw(e, variables[e.field]) for e in layout.elements)
+        form += "PRINT 1\nEOP\n"
+        parts = []
+        for field, variable in variables.items():
+            parts += [f'{variable}="'.encode('ascii'), field, b'"\n']
+        parts.append(f"{layout.name}\n".encode('ascii'))
+        return LabelTemplate(header + form.encode('ascii'), parts, escape_tspl, header=header)
+
+    parts = []
+    for element in layout.elements:
+        before, after = draw(element, '\0').split('\0')
+        parts += [before.encode('ascii') + b'"', element.field, b'"' + after.encode('ascii')]
+    parts.append(b"PRINT 1\nCLS\n")
+    return LabelTemplate(header, parts, escape_tspl)
+
+
+# -- ZPL --------------------------------------------------------------------
+
+def escape_zpl(value: str) -> str:
+    """
+    Escape a value for a ^FH field: ^ and ~ would start commands, and _
+    is the hex escape character itself.
+    """
+    if value.isprintable() and '_' not in value and '^' not in value and '~' not in value:
+        return value
+    value = _strip_controls(value)
+    return value.replace('_', '_5F').replace('^', '_5E').replace('~', '_7E')
+
+
+def compile_zpl(layout: LabelLayout, use_form: bool = False) -> LabelTemplate:
+    """
+    Compile to ZPL II. With use_form the layout is stored on the printer
+    (^DF) and each label recalls it (^XF) with its field data.
+    """
+    preamble = f"^XA^CI28^PW{layout.dots(layout.width_mm)}^LL{layout.dots(layout.height_mm)}^XZ\n"
+
+    def draw(element) -> str:
+        if isinstance(element, BarcodeElement):
+            return (f"^FO{element.x},{element.y}^BY{element.narrow}"
+                    f"^BCN,{element.height},{'Y' if element.readable else 'N'},N,N")
+        height = 28 * element.scale
+        return f"^FO{element.x},{element.y}^A0N,{height},{height}"
+
+    slots = {field: n + 1 for n, field in enumerate(layout.fields)}
+    if use_form:
+        form = f"^XA^DFR:{layout.name}.ZPL^FS"
+        form += ''.join(f"{draw(e)}^FN{slots[e.field]}^FS" for e in layout.elements)
+        form += "^XZ\n"
+        parts = [f"^XA^XFR:{layout.name}.ZPL".encode('ascii')]
+        for field, slot in slots.items():
+            parts += [f"^FN{slot}^FH^FD".encode('ascii'), field, b"^FS"]
+        parts.append(b"^XZ\n")
+        return LabelTemplate((preamble + form).encode('ascii'), parts, escape_zpl,
+                             header=preamble.encode('ascii'))
+
+    parts = [b"^XA"]
+    for element in layout.elements:
+        parts += [(draw(element) + "^FH^FD").encode('ascii'), element.field, b"^FS"]
+    parts.append(b"^XZ\n")
+    return LabelTemplate(preamble.encode('ascii'), parts, escape_zpl)
+
+
+# -- ESC/POS ----------------------------------------------------------------
+
+ESC = b"\x1b"
+GS = b"\x1d"
+
+
+def escape_escpos(value: str) -> str:
+    """Plain text for ESC/POS: control bytes would be taken as commands"""
+    return _strip_controls(value)
+
+
+def encode_escpos_code128(value) -> bytes:
+    """GS k CODE128 data: length byte, code set B prefix, literal '{' doubled"""
+    data = ("{B" + _strip_controls(str(value)).replace('{', '{{')).encode('ascii', errors='replace')[:255]
+    return bytes([len(data)]) + data
+
+
+def compile_escpos(layout: LabelLayout, use_form: bool = False) -> LabelTemplate:
+    """
+    Compile to ESC/POS. Receipt printers are line based, so positions are
+    reduced to element order and there is no stored form (use_form is ignored).
+    """
+    parts = []
+    for element in layout.elements:
+        if isinstance(element, BarcodeElement):
+            parts += [
+                GS + b"h" + bytes([min(element.height, 255)]),
+                GS + b"w" + bytes([element.narrow]),
+                GS + b"H" + (b"\x02" if element.readable else b"\x00"),
+                GS + b"k\x49",  # CODE128, length-prefixed
+                (element.field, encode_escpos_code128),
+                b"\n",
+            ]
+        else:
+            size = max(0, min(element.scale, 8) - 1)
+            parts += [GS + b"!" + bytes([size * 0x11]), element.field, b"\n"]
+    parts.append(GS + b"!\x00" + ESC + b"d\x03" + GS + b"V\x42\x00")  # feed and partial cut
+    return LabelTemplate(ESC + b"@", parts, escape_escpos, encoding='cp437')
+
+
+COMPILERS = {
+    'tspl': compile_tspl,
+    'zpl': compile_zpl,
+    'escpos': compile_escpos,
+}
+
+
+def compile_label(layout: LabelLayout, language: str = 'tspl',
+                  use_form: bool = False) -> LabelTemplate:
+    """Compile a layout for a printer language ('tspl', 'zpl' or 'escpos')"""
+    if language not in COMPILERS:
+        raise ValueError(f"Unknown printer language '{language}'")
+    return COMPILERS[language](layout, use_form)
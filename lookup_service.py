@@ -0,0 +1,318 @@
+"""
+Scan lookup service for the Barcode Printer Application
+Serves barcode lookups over HTTP/JSON from an in-memory index that is
+reloaded from the database periodically, so any number of scan stations
+share one warm cache instead of each querying MySQL per scan.
+
+Usage:
+    python lookup_service.py                       # localhost:8765
+    python lookup_service.py --host 0.0.0.0 --semester 2025-1
+
+    GET /lookup?barcode=...  -> {"found": true, "student": {...}} (404 if unknown,
+                                503 if the database could not be asked)
+    GET /health              -> {"records": n, "age_sec": s, "lookups": n, ...}
+"""
+import argparse
+import http.client
+import json
+import selectors
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, quote, urlparse
+
+import config
+from utils import setup_logging, log_event
+
+MAX_MISSES = 10000  # Individually looked-up codes remembered between refreshes
+
+
+class BarcodeIndex:
+    """
+    Barcode/StudentID -> student record, rebuilt from one bulk query.
+    Codes missing from the index are looked up individually once; the
+    answer (found or not) is kept until the next refresh. A database error
+    is raised, not remembered as "not found".
+    """
+
+    def __init__(self, db, semester_code: str = None):
+        self.db = db
+        self.semester_code = semester_code
+        self._records: Dict[str, Dict] = {}
+        self._misses: Dict[str, Optional[Dict]] = {}
+        self.refreshed = 0.0
+        self.rows = 0
+        self.lookups = 0
+        self.db_lookups = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.rows
+
+    def refresh(self) -> bool:
+        """Reload the index; keeps the old one if the database returned nothing"""
+        rows = self.db.get_all_barcode_records(self.semester_code)
+        if not rows and self._records:
+            log_event("Lookup index refresh returned no records; keeping the previous index", 'warning')
+            return False
+
+        records = {}
+        for row in rows:
+            # Same precedence as get_student_by_barcode: Barcode, then StudentID
+            if row.get('StudentID') is not None:
+                records.setdefault(str(row['StudentID']), row)
+        for row in rows:
+            if row.get('Barcode') is not None:
+                records[str(row['Barcode'])] = row
+
+        with self._lock:
+            self._records = records
+            self._misses = {}
+            self.rows = len(rows)
+            self.refreshed = time.time()
+        log_event(f"Lookup index loaded: {len(rows)} records")
+        return True
+
+    def lookup(self, code: str) -> Optional[Dict]:
+        code = code.strip()
+        with self._lock:
+            self.lookups += 1
+            record = self._records.get(code)
+            if record is not None or code in self._misses:
+                return record if record is not None else self._misses[code]
+
+        # Not in the index (e.g. added since the last refresh): ask the database once
+        record = self.db.get_student_by_barcode(code, raise_errors=True)
+        with self._lock:
+            self.db_lookups += 1
+            if len(self._misses) >= MAX_MISSES:
+                self._misses.clear()  # Mistyped codes must not grow it without bound
+            self._misses[code] = record
+        return record
+
+    def start_refresh(self, interval: float):
+        """Reload the index every interval seconds on a background thread"""
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.refresh()
+                except Exception as e:
+                    log_event(f"Lookup index refresh failed: {e}", 'error')
+        threading.Thread(target=run, name="LookupRefresh", daemon=True).start()
+
+
+class LookupHandler(BaseHTTPRequestHandler):
+    """JSON endpoints; HTTP/1.1 so scan clients keep their connection open"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+    index: BarcodeIndex = None  # set by serve()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == '/lookup':
+            code = parse_qs(url.query).get('barcode', [''])[0]
+            if not code.strip():
+                self._send(400, {'error': 'barcode parameter required'})
+                return
+            try:
+                record = self.index.lookup(code)
+            except Exception as e:
+                # Unknown is not the same as unreachable: let the station retry
+                self._send(503, {'error': f"database unavailable: {e}"})
+                return
+            if record is None:
+                self._send(404, {'found': False, 'barcode': code})
+            else:
+                self._send(200, {'found': True, 'student': record})
+        elif url.path == '/health':
+            index = self.index
+            self._send(200, {
+                'records': len(index),
+                'age_sec': round(time.time() - index.refreshed, 1) if index.refreshed else None,
+                'lookups': index.lookups,
+                'db_lookups': index.db_lookups,
+            })
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def _send(self, status: int, payload: dict):
+        # default=str covers dates and decimals from the database
+        body = json.dumps(payload, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle(self):
+        # One request per dispatch; the server parks the connection until the next
+        self.close_connection = True
+        self.handle_one_request()
+
+    def log_message(self, format, *args):
+        pass  # One log line per scan would dominate the log file
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer whose worker pool handles requests rather than connections.
+    Idle keep-alive connections wait in a selector and go to a worker only
+    when their next request arrives, so a few workers serve many stations;
+    connections idle longer than idle_timeout are closed.
+    """
+
+    def __init__(self, address, handler, workers: int, idle_timeout: float = 30):
+        super().__init__(address, handler)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Lookup")
+        self.idle_timeout = idle_timeout
+        self._idle = selectors.DefaultSelector()
+        self._idle_lock = threading.Lock()
+        self._closing = False
+        # Wakes the watcher when a connection goes back to waiting
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._idle.register(self._wake_r, selectors.EVENT_READ, None)
+        threading.Thread(target=self._watch, name="LookupIdle", daemon=True).start()
+
+    def process_request(self, request, client_address):
+        self._wait_for_request(request, client_address)
+
+    def _wait_for_request(self, request, client_address):
+        with self._idle_lock:
+            if self._closing:
+                self.shutdown_request(request)
+                return
+            self._idle.register(request, selectors.EVENT_READ, (client_address, time.monotonic()))
+        self._wake_w.send(b'\0')
+
+    def _watch(self):
+        while not self._closing:
+            events = self._idle.select(timeout=1.0)
+            now = time.monotonic()
+            with self._idle_lock:
+                for key, _ in events:
+                    if key.fileobj is self._wake_r:
+                        try:
+                            self._wake_r.recv(4096)
+                        except BlockingIOError:
+                            pass
+                        continue
+                    self._idle.unregister(key.fileobj)
+                    self.pool.submit(self._serve_one, key.fileobj, key.data[0])
+                for key in list(self._idle.get_map().values()):
+                    if key.data and now - key.data[1] > self.idle_timeout:
+                        self._idle.unregister(key.fileobj)
+                        self.shutdown_request(key.fileobj)
+
+    def _serve_one(self, request, client_address):
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        if handler.close_connection:
+            self.shutdown_request(request)
+        else:
+            self._wait_for_request(request, client_address)
+
+    def server_close(self):
+        with self._idle_lock:
+            self._closing = True
+            for key in list(self._idle.get_map().values()):
+                if key.fileobj is not self._wake_r:
+                    self.shutdown_request(key.fileobj)
+        super().server_close()
+        self.pool.shutdown(wait=False)
+
+
+def serve(db, host: str = None, port: int = None, workers: int = None,
+          refresh_sec: float = None, semester_code: str = None) -> PooledHTTPServer:
+    """Load the index and return a server ready for serve_forever()"""
+    settings = config.LOOKUP_SERVICE
+    index = BarcodeIndex(db, semester_code or settings.get('semester_code'))
+    index.refresh()
+    index.start_refresh(refresh_sec or settings.get('refresh_sec', 300))
+
+    # timeout bounds how long a worker waits on a half-sent request
+    handler = type('BoundLookupHandler', (LookupHandler,), {'index': index, 'timeout': 10})
+    server = PooledHTTPServer(
+        (host or settings.get('host', '127.0.0.1'), port or settings.get('port', 8765)),
+        handler, workers or settings.get('workers', 8), settings.get('idle_timeout_sec', 30)
+    )
+    return server
+
+
+class LookupClient:
+    """
+    Scan-station client with the same lookup call as DatabaseManager.
+    Each thread keeps one keep-alive connection to the service.
+    """
+
+    def __init__(self, url: str, timeout: float = 3.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or '127.0.0.1'
+        self.port = parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def get_student_by_barcode(self, barcode: str) -> Optional[Dict]:
+        """Student record for a barcode or StudentID, None if unknown; raises if unreachable"""
+        path = '/lookup?barcode=' + quote(barcode)
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request('GET', path)
+                response = conn.getresponse()
+                payload = json.loads(response.read() or b'{}')
+                break
+            except (http.client.HTTPException, OSError):
+                # The server closed an idle keep-alive connection: reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+        if response.status == 404:
+            return None
+        if response.status != 200:
+            raise RuntimeError(payload.get('error', f"HTTP {response.status}"))
+        return payload.get('student')
+
+
+def main():
+    settings = config.LOOKUP_SERVICE
+    parser = argparse.ArgumentParser(description="Serve barcode lookups for scan stations")
+    parser.add_argument('--host', default=settings.get('host', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=settings.get('port', 8765))
+    parser.add_argument('--workers', type=int, default=settings.get('workers', 8))
+    parser.add_argument('--refresh', type=float, default=settings.get('refresh_sec', 300),
+                        help="Seconds between index reloads")
+    parser.add_argument('--semester', default=settings.get('semester_code'),
+                        help="Only index this semester code")
+    args = parser.parse_args()
+
+    setup_logging()
+    from database import DatabaseManager
+    server = serve(DatabaseManager(), args.host, args.port, args.workers, args.refresh, args.semester)
+    log_event(f"Lookup service on http://{args.host}:{args.port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,32 @@
 Main GUI Application for Barcode Printer
 Cosmopolitan EDU - Barcode Card Printing System
 """
+import startup
+import sys
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from ttkbootstrap.widgets.scrolled import ScrolledText
-import time
-from PIL import Image, ImageTk
 import threading
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 import config
+import settings_manager
 from utils import setup_logging, log_event, SessionManager
-from database import DatabaseManager
-from barcode_generator import BarcodeGenerator
-from printer import PrinterManager
+from progress import ProgressBar, ProgressTracker
+from activity_log import ActivityLog
+from request_tokens import LatestRequest
+from prefetch import Prefetcher
+from scan_station import ScanQueue, ScanRate, ScanResultPanel
+from attendance import AttendanceCounter, AttendanceDashboard
+from student_index import StudentIndex
+
+# Database, imaging and printer modules (mysql, PIL, numpy, python-barcode,
+# win32) are imported after the login screen is up; see init_services()
+if TYPE_CHECKING:
+    from PIL import Image
+
+startup.mark("main imports")
 
 
 class BarcodeprinterApp:
@@ -25,21 +36,58 @@ class BarcodeprinterApp:
     def __init__(self, root):
         self.root = root
         self.root.title(config.APP_SETTINGS['title'])
-        # Set to full screen
-        self.root.state('zoomed')
+        # Set to full screen ('zoomed' state is Windows/macOS only)
+        try:
+            self.root.state('zoomed')
+        except tk.TclError:
+            self.root.attributes('-zoomed', True)
         
         # Initialize components
         setup_logging()
         self.session = SessionManager()
-        self.db = DatabaseManager()
-        self.barcode_gen = BarcodeGenerator()
-        self.printer = PrinterManager()
+        self.settings = settings_manager.load_settings()
+        
+        # Database, barcode and printer subsystems start in the background
+        # after the first paint (init_services); the login screen needs none
+        self.services_ready = threading.Event()
+        self.startup_done = threading.Event()  # services up and database pool attempted, or startup failed
+        self.startup_error = None  # why init_services failed, shown on the login screen
+        self.show_main_when_ready = False
+        self.db = None
+        self.lookup_client = None  # scan lookups via lookup_service.py, if configured
+        self.scan_popup = None
+        self.scan_queue = None  # created on the first scan
+        self.scan_rate = ScanRate()
+        self.attendance = AttendanceCounter()  # fed by every scan
+        self.attendance_loads = LatestRequest(self.root, "attendance")
+        self.attendance_popup = None
+        self.barcode_gen = None
+        self.device_generators = {}  # dpi -> BarcodeGenerator for GDI printing
+        self.device_generators_lock = threading.Lock()  # filled from spooler and group threads
+        self.printer = None
+        self.printer_group = None
+        self.spooler = None
+        self.job_batches = {}  # job id -> students_data list the job was queued from
+        self.job_trackers = {}  # job id -> ProgressTracker of the running print job
+        
+        # Selection loads: only the newest request per combobox is applied
+        self.date_loads = LatestRequest(self.root, "dates")
+        self.module_loads = LatestRequest(self.root, "modules")
+        self.student_loads = LatestRequest(self.root, "students")
+        self.prefetcher = None
+        self.queue_window = None
         
         # UI Variables
-        self.current_barcode_image: Optional[Image.Image] = None
+        self.current_barcode_image: Optional["Image.Image"] = None
         self.current_student_index: int = 0
-        self.all_barcode_images: list = []
-        self.preview_photo = None
+        self.modules = []  # modules of the selected date
+        self.students_data = []
+        self.print_status = {}  # students_data index -> 'pending' / 'success' / 'failed'
+        self.student_index = StudentIndex([])  # search index of students_data
+        self.visible_rows = []  # students_data indices shown in the listbox, in order
+        self.row_positions = {}  # students_data index -> listbox position
+        self.generated_count: int = 0  # labels generated for the current module
+        self.preview_cache = None
         
         # Main container for all views
         self.container = ttk.Frame(self.root)
@@ -47,9 +95,99 @@ class BarcodeprinterApp:
         
         # Initial View
         self.check_login_status()
+        startup.mark("login screen built")
+        
+        # Start the subsystems once the window has been drawn
+        self.root.after_idle(self.start_services)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         log_event("Application started")
 
+    def start_services(self):
+        """First paint is done: initialize the heavy subsystems off the UI thread"""
+        startup.mark("first paint")
+        threading.Thread(target=self.init_services, name="Startup", daemon=True).start()
+
+    def init_services(self):
+        """Import and start database, barcode and printer subsystems (background)"""
+        try:
+            for module in ('mysql.connector', 'PIL.Image', 'numpy', 'barcode',
+                           'database', 'barcode_generator', 'raster', 'printer',
+                           'print_spooler', 'printer_group', 'label_preview'):
+                startup.timed_import(module)
+            startup.mark("imports done")
+            
+            from database import DatabaseManager
+            from barcode_generator import BarcodeGenerator
+            from printer import PrinterManager
+            from print_spooler import PrintSpooler
+            from printer_group import PrinterGroup
+            from label_preview import ThumbnailCache
+            
+            self.db = DatabaseManager(connect=False)
+            self.barcode_gen = BarcodeGenerator()
+            self.printer = PrinterManager()
+            # Enumerate printers in the background; re-check status whenever the list changes
+            self.printer.registry.add_listener(lambda printers: self.root.after(0, self.check_printer_status))
+            self.printer.registry.start()
+            
+            # Optional group of printers that share each batch
+            self.printer_group = PrinterGroup.from_config(self.settings.get('printer_group'))
+            if self.printer_group:
+                self.printer_group.start_discovery()
+            
+            # Background print queue
+            self.spooler = PrintSpooler(self.printer, label_renderer=self.render_print_label,
+                                        printer_group=self.printer_group)
+            self.spooler.add_listener(self.on_spooler_event)
+            self.spooler.start()
+            
+            # Students of the date's modules and labels of the next module, loaded ahead
+            self.prefetcher = Prefetcher(
+                self.db.get_barcode_data,
+                lambda student, width: ThumbnailCache.make_thumbnail(self.render_student_label(student), width),
+                is_busy=lambda: self.student_loads.busy or self.module_loads.busy
+            )
+            # Preview thumbnails, re-rendered on demand instead of keeping every label
+            self.preview_cache = ThumbnailCache(self.render_preview_label)
+            
+            # Scan stations share the lookup service's index when one is configured
+            if config.LOOKUP_SERVICE.get('url'):
+                from lookup_service import LookupClient
+                self.lookup_client = LookupClient(config.LOOKUP_SERVICE['url'])
+            startup.mark("services started")
+        except Exception as e:
+            log_event(f"Error starting services: {e}", 'error')
+            self.startup_error = f"Could not start: {e}"
+            self.startup_done.set()
+            self.root.after(0, self.on_startup_failed)
+            return
+        
+        self.services_ready.set()
+        self.root.after(0, self.on_services_ready)
+        
+        # The pool may wait on a slow or unreachable server; nothing waits on it here
+        self.db.init_pool()
+        startup.mark("database pool")
+        log_event(startup.report())
+        self.startup_done.set()
+
+    def on_services_ready(self):
+        """Show the main view if login finished before the subsystems did"""
+        if self.show_main_when_ready:
+            self.show_main_when_ready = False
+            self.show_main_interface()
+
+    def on_startup_failed(self):
+        """Report a failed startup on the login screen instead of waiting for it"""
+        if self.show_main_when_ready:
+            # A saved session was waiting for the main view: it cannot be shown
+            self.show_main_when_ready = False
+            self.show_login_interface()
+        if hasattr(self, 'login_status') and self.login_status.winfo_exists():
+            self.login_status.config(text=self.startup_error, foreground="red")
+        messagebox.showerror("Startup Error", self.startup_error)
+
     def clear_container(self):
         """Clear the main container"""
         for widget in self.container.winfo_children():
@@ -110,6 +248,12 @@ class BarcodeprinterApp:
         
         def verify():
             try:
+                # Set once startup finished or failed, so login never waits forever
+                self.startup_done.wait()
+                if not self.services_ready.is_set():
+                    self.root.after(0, lambda: self.login_status.config(
+                        text=self.startup_error or "Could not start", foreground="red"))
+                    return
                 is_valid, error = self.db.validate_user(email)
                 if is_valid:
                     self.session.login(email)
@@ -121,6 +265,19 @@ class BarcodeprinterApp:
         
         threading.Thread(target=verify, daemon=True).start()
 
+    def on_close(self):
+        """Let the print queue stop between chunks and release the printers, then quit"""
+        self.root.withdraw()
+        if self.spooler:
+            # Unfinished jobs are saved and resume from their last confirmed label
+            self.spooler.stop()
+        if self.printer_group:
+            self.printer_group.close()
+        if self.printer:
+            self.printer.close()
+        log_event("Application closed")
+        self.root.destroy()
+
     def logout(self):
         """Logout and return to login screen"""
         self.session.logout()
@@ -128,6 +285,12 @@ class BarcodeprinterApp:
 
     def show_main_interface(self):
         """Show the main application interface"""
+        if not self.services_ready.is_set():
+            # Still starting up: show the main view as soon as it can be built
+            self.show_main_when_ready = True
+            return
+        from label_preview import LabelPreview
+        
         self.clear_container()
         
         # Header
@@ -194,8 +357,8 @@ class BarcodeprinterApp:
         )
         self.db_settings_btn.pack(side=LEFT, fill=X, expand=True, padx=(2, 0))
 
-        self.status_text = ScrolledText(right_panel, width=40, wrap=WORD, state='disabled')
-        self.status_text.pack(fill=BOTH, expand=True)
+        self.activity_log = ActivityLog(right_panel)
+        self.activity_log.pack(fill=BOTH, expand=True)
 
         # --- LEFT PANEL (Controls) ---
         left_panel = ttk.Labelframe(main_content, text="⚙️ Controls", padding=15)
@@ -222,6 +385,12 @@ class BarcodeprinterApp:
         # Student List
         ttk.Label(left_panel, text="👥 Students", font=('Segoe UI', 9, 'bold')).pack(anchor=W, pady=(5,0))
         
+        # Search (barcode, student ID, seat or venue), filtered as you type
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', lambda *args: self.schedule_student_filter())
+        self.search_entry = ttk.Entry(left_panel, textvariable=self.search_var)
+        self.search_entry.pack(fill=X, pady=(2, 0))
+        
         list_frame = ttk.Frame(left_panel)
         list_frame.pack(fill=BOTH, expand=True, pady=(2, 10))
         
@@ -232,7 +401,7 @@ class BarcodeprinterApp:
             list_frame, 
             yscrollcommand=scrollbar.set,
             height=20, # Increased height since logs are gone
-            selectmode=tk.SINGLE,
+            selectmode=tk.EXTENDED,  # Shift/Ctrl-click to pick labels to reprint
             font=('Consolas', 9),
             relief="flat",
             bd=1,
@@ -241,6 +410,8 @@ class BarcodeprinterApp:
         )
         self.student_listbox.pack(side=LEFT, fill=BOTH, expand=True)
         scrollbar.config(command=self.student_listbox.yview)
+        # Double-click reprints a single student
+        self.student_listbox.bind('<Double-Button-1>', lambda e: self.print_barcode('selected'))
         
         # Action Buttons
         btn_frame = ttk.Frame(left_panel)
@@ -271,6 +442,13 @@ class BarcodeprinterApp:
             bootstyle="danger"
         ).pack(fill=X, pady=5)
         
+        ttk.Button(
+            btn_frame,
+            text="📊 Attendance",
+            command=self.show_attendance_dashboard,
+            bootstyle="danger-outline"
+        ).pack(fill=X, pady=5)
+        
         ttk.Separator(btn_frame, orient=HORIZONTAL).pack(fill=X, pady=10)
 
         self.print_btn = ttk.Button(
@@ -282,6 +460,58 @@ class BarcodeprinterApp:
         )
         self.print_btn.pack(fill=X, pady=5)
         
+        # Reprint only part of the module (e.g. after a jam)
+        reprint_frame = ttk.Frame(btn_frame)
+        reprint_frame.pack(fill=X, pady=(0, 5))
+        
+        self.reprint_btn = ttk.Button(
+            reprint_frame,
+            text="↻ Unprinted",
+            command=lambda: self.print_barcode('unprinted'),
+            state='disabled',
+            bootstyle="primary-outline",
+            width=10
+        )
+        self.reprint_btn.pack(side=LEFT, fill=X, expand=True, padx=(0, 2))
+        
+        self.print_selected_btn = ttk.Button(
+            reprint_frame,
+            text="☑ Selected",
+            command=lambda: self.print_barcode('selected'),
+            state='disabled',
+            bootstyle="primary-outline",
+            width=10
+        )
+        self.print_selected_btn.pack(side=LEFT, fill=X, expand=True, padx=(2, 0))
+        
+        # Print Queue
+        queue_frame = ttk.Frame(btn_frame)
+        queue_frame.pack(fill=X, pady=(0, 5))
+        
+        self.pause_btn = ttk.Button(
+            queue_frame,
+            text="⏸ Pause",
+            command=self.toggle_spooler_pause,
+            bootstyle="secondary-outline",
+            width=10
+        )
+        self.pause_btn.pack(side=LEFT, fill=X, expand=True, padx=(0, 2))
+        
+        ttk.Button(
+            queue_frame,
+            text="📋 Queue",
+            command=self.show_queue_window,
+            bootstyle="secondary-outline",
+            width=10
+        ).pack(side=LEFT, fill=X, expand=True, padx=(2, 0))
+        
+        self.queue_status_label = ttk.Label(left_panel, text="Queue: idle", font=('Segoe UI', 8), foreground="gray")
+        self.queue_status_label.pack(anchor=W, pady=(5, 0))
+        
+        # Generation / print progress
+        self.progress_bar = ProgressBar(left_panel)
+        self.progress_bar.pack(fill=X, pady=(5, 0))
+        
         # Printer Status
         self.printer_status_label = ttk.Label(left_panel, text="Checking printer...", font=('Segoe UI', 8), foreground="gray")
         self.printer_status_label.pack(anchor=W, pady=(5, 0))
@@ -293,55 +523,37 @@ class BarcodeprinterApp:
         self.preview_container = ttk.Frame(center_panel, bootstyle="secondary", padding=2) # Border effect
         self.preview_container.pack(fill=BOTH, expand=True)
         
-        self.preview_label = ttk.Label(
-            self.preview_container, 
-            text="Waiting for generation...", 
-            background='#f8f9fa', 
-            anchor='center'
+        self.preview = LabelPreview(
+            self.preview_container,
+            self.preview_cache,
+            label_size=(self.barcode_gen.card_width_px, self.barcode_gen.card_height_px)
         )
-        self.preview_label.pack(fill=BOTH, expand=True)
+        self.preview.pack(fill=BOTH, expand=True)
         
         # Load initial data
         self.load_semesters()
         self.check_printer_status()
+        self.refresh_queue_status()
 
     def add_status(self, message: str, error: bool = False):
         """Add message to status log"""
-        # Only try to update text if we are in main view and widget exists
-        if not hasattr(self, 'status_text') or not self.status_text.winfo_exists():
-            # If not in main view, just log to file/console
-            if error:
-                log_event(message, 'error')
-            else:
-                log_event(message)
-            return
-
-        timestamp = time.strftime("%H:%M:%S")
-        try:
-            self.status_text.text.config(state='normal')
-            
-            tag = 'error' if error else 'info'
-            self.status_text.text.tag_config('error', foreground='red')
-            self.status_text.text.tag_config('info', foreground='black')
-            
-            self.status_text.text.insert(tk.END, f"[{timestamp}] {message}\n", tag)
-            self.status_text.text.see(tk.END)
-            self.status_text.text.config(state='disabled')
-        except Exception as e:
-            log_event(f"Error updating status log: {e}", 'error')
-
+        # The file log keeps the full history; the panel only recent lines
         if error:
             log_event(message, 'error')
         else:
             log_event(message)
 
+        # Only update the panel if we are in main view and it exists
+        if hasattr(self, 'activity_log') and self.activity_log.winfo_exists():
+            self.activity_log.add(message, 'error' if error else 'info')
+
     def check_printer_status(self):
-        """Check printer availability"""
-        printers = self.printer.get_available_printers()
-        self.add_status(f"Found {len(printers)} available printers")
-        
+        """Check printer availability (off the UI thread, from the cached printer list)"""
         def check():
             try:
+                printers = self.printer.get_available_printers()
+                self.root.after(0, lambda: self.add_status(f"Found {len(printers)} available printers"))
+                
                 if self.printer.is_printer_available():
                     status = f"Printer: {self.printer.printer_name} - Ready"
                     color = "success"
@@ -408,21 +620,20 @@ class BarcodeprinterApp:
             semester_code = semester.get('SemesterCode')
             self.add_status(f"Loading dates for {semester.get('SemesterName', semester_code)}...")
             
-            # Reset dependent combos
+            # Reset dependent combos; loads for the old semester are now stale
             self.date_combo.set('')
             self.date_combo['values'] = []
             self.module_combo.set('')
             self.module_combo['values'] = []
+            self.module_loads.cancel()
+            self.student_loads.cancel()
             
             # Load dates
-            def load():
-                try:
-                    dates = self.db.get_exam_dates(semester_code)
-                    self.root.after(0, lambda: self.update_dates(dates))
-                except Exception as e:
-                    self.root.after(0, lambda: self.add_status(f"Error loading dates: {e}", error=True))
-            
-            threading.Thread(target=load, daemon=True).start()
+            self.date_loads.submit(
+                lambda: self.db.get_exam_dates(semester_code),
+                self.update_dates,
+                lambda e: self.add_status(f"Error loading dates: {e}", error=True)
+            )
     
     def update_dates(self, dates):
         """Update date combobox"""
@@ -444,15 +655,23 @@ class BarcodeprinterApp:
             semester_code = self.session.selected_semester.get('SemesterCode')
             self.add_status(f"Loading modules for {date}...")
             
-            # Load modules for this date
+            # Reset the module combo; loads for the old date are now stale
+            self.module_combo.set('')
+            self.module_combo['values'] = []
+            self.student_loads.cancel()
+            
+            # Load modules (and their names) for this date
             def load():
-                try:
-                    modules = self.db.get_modules_by_date(date, semester_code)
-                    self.root.after(0, lambda: self.update_modules(modules))
-                except Exception as e:
-                    self.root.after(0, lambda: self.add_status(f"Error loading modules: {e}", error=True))
+                modules = self.db.get_modules_by_date(date, semester_code)
+                for mod in modules:
+                    mod['ModuleName'] = self.db.get_module_name(mod.get('ModuleCode', ''))
+                return modules
             
-            threading.Thread(target=load, daemon=True).start()
+            self.module_loads.submit(
+                load,
+                self.update_modules,
+                lambda e: self.add_status(f"Error loading modules: {e}", error=True)
+            )
     
     def update_modules(self, modules):
         """Update module combobox"""
@@ -473,8 +692,8 @@ class BarcodeprinterApp:
         for mod in modules:
             module_code = mod.get('ModuleCode', '')
             
-            # Get module name from database function
-            module_name = self.db.get_module_name(module_code)
+            # Module name from the database function (looked up by the loader)
+            module_name = mod.get('ModuleName')
             
             if module_name:
                 display = f"{module_code} - {module_name}"
@@ -485,6 +704,14 @@ class BarcodeprinterApp:
         
         self.module_combo['values'] = module_displays
         self.add_status(f"Loaded {len(modules)} modules")
+        
+        # Operators usually work through the date's modules in order
+        semester_code = self.session.selected_semester.get('SemesterCode')
+        self.prefetcher.prefetch_students([mod.get('ModuleCode') for mod in modules], semester_code)
+        
+        # An open attendance view follows the selected date
+        if self.attendance_popup is not None and self.attendance_popup.winfo_exists():
+            self.load_attendance()
     
     def on_module_selected(self, event):
         """Handle module selection"""
@@ -499,15 +726,24 @@ class BarcodeprinterApp:
             self.add_status(f"Module selected: {module_code}")
             self.add_status(f"Loading students for {module_code}...")
             
+            # Prefetched students need no query
+            students = self.prefetcher.get_students(module_code, semester_code)
+            if students is not None:
+                self.student_loads.cancel()
+                self.update_student_list(students)
+                return
+            
             # Load students for this module
             def load_students():
-                try:
-                    barcode_list = self.db.get_barcode_data(module_code, semester_code)
-                    self.root.after(0, lambda: self.update_student_list(barcode_list))
-                except Exception as e:
-                    self.root.after(0, lambda: self.add_status(f"Error loading students: {e}", error=True))
+                students = self.db.get_barcode_data(module_code, semester_code)
+                self.prefetcher.store_students(module_code, semester_code, students)
+                return students
             
-            threading.Thread(target=load_students, daemon=True).start()
+            self.student_loads.submit(
+                load_students,
+                self.update_student_list,
+                lambda e: self.add_status(f"Error loading students: {e}", error=True)
+            )
     
     def update_student_list(self, barcode_list):
         """Update student listbox with barcode data"""
@@ -515,35 +751,82 @@ class BarcodeprinterApp:
         if not hasattr(self, 'student_listbox') or not self.student_listbox.winfo_exists():
             return
 
-        self.student_listbox.delete(0, tk.END)
         self.students_data = barcode_list
-        self.print_status = {}
+        # Initial status is pending (yellow)
+        self.print_status = {i: 'pending' for i in range(len(barcode_list))}
+        self.student_index = StudentIndex(barcode_list)
+        self.reset_preview()
+        
+        # Show the new list (through the current search, if any)
+        self.apply_student_filter()
         
         if not barcode_list:
             self.add_status("No students found for this module", error=True)
             return
         
         self.add_status(f"Found {len(barcode_list)} student(s)")
-        
-        # Add students to listbox with status icons
-        for i, student in enumerate(barcode_list):
-            student_id = student.get('StudentID', 'Unknown')
-            seat_no = student.get('SeatNo', '?')
-            barcode = student.get('Barcode', 'N/A')
-            
-            # Initial status is pending (yellow)
-            self.print_status[i] = 'pending'
-            status_icon = '⚠'  # Yellow caution
-            
-            # Format: [Status] Barcode - Seat: XX - Hall
-            hall = student.get('VenueName', 'Hall ?')
-            # User request: "instead of studentid show exam_barcode.Barcode"
-            display = f"{status_icon} {barcode} - Seat {seat_no} - {hall}"
-            self.student_listbox.insert(tk.END, display)
+        self.use_prefetched_labels()
         
         # Enable generate button
         self.generate_btn.config(state='normal')
     
+    def student_row_text(self, index: int) -> str:
+        """Listbox text of students_data[index] with its print status icon"""
+        student = self.students_data[index]
+        status = self.print_status.get(index)
+        if status == 'success':
+            icon = '✓'  # Green check
+        elif status == 'failed':
+            icon = '✗'  # Red X
+        else:
+            icon = '⚠'  # Yellow caution (pending)
+        
+        # Format: [Status] Barcode - Seat: XX - Hall
+        # User request: "instead of studentid show exam_barcode.Barcode"
+        barcode_val = student.get('Barcode', student.get('StudentID', 'Unknown'))
+        seat_no = student.get('SeatNo', '?')
+        hall = student.get('VenueName', 'Hall ?')
+        return f"{icon} {barcode_val} - Seat {seat_no} - {hall}"
+    
+    def schedule_student_filter(self):
+        """Filter the student list shortly after typing pauses (one refresh per burst)"""
+        if getattr(self, '_filter_after', None):
+            self.root.after_cancel(self._filter_after)
+        self._filter_after = self.root.after(80, self.apply_student_filter)
+    
+    def apply_student_filter(self):
+        """Show the students matching the search box, in one listbox refresh"""
+        self._filter_after = None
+        if not hasattr(self, 'student_listbox') or not self.student_listbox.winfo_exists():
+            return
+        
+        self.visible_rows = self.student_index.search(self.search_var.get())
+        self.row_positions = {index: pos for pos, index in enumerate(self.visible_rows)}
+        self.student_listbox.delete(0, tk.END)
+        if self.visible_rows:
+            self.student_listbox.insert(tk.END, *[self.student_row_text(i) for i in self.visible_rows])
+    
+    def use_prefetched_labels(self):
+        """
+        Seed the preview cache with labels pre-rendered for the selected
+        module, then start pre-rendering the module after it
+        """
+        module = self.session.selected_module
+        semester = self.session.selected_semester
+        if not module or not semester:
+            return
+        semester_code = semester.get('SemesterCode')
+        width = self.preview.tile_width
+        
+        thumbs = self.prefetcher.take_labels(module.get('ModuleCode'), semester_code, width)
+        for index, thumb in thumbs.items():
+            self.preview_cache.put(index, width, thumb)
+        
+        codes = [mod.get('ModuleCode') for mod in getattr(self, 'modules', [])]
+        position = codes.index(module.get('ModuleCode')) if module.get('ModuleCode') in codes else -1
+        if 0 <= position < len(codes) - 1:
+            self.prefetcher.prerender(codes[position + 1], semester_code, width)
+    
     def generate_barcode(self):
         """Generate barcodes for ALL students in the module"""
         if not self.students_data:
@@ -553,170 +836,129 @@ class BarcodeprinterApp:
         total_students = len(self.students_data)
         self.add_status(f"Generating {total_students} barcode(s)...")
         
+        # Keep cached thumbnails (e.g. prefetched labels); settings changes clear them
+        self.generated_count = 0
+        self.preview.reset()
+        tile_width = self.preview.tile_width
+        students = self.students_data
+        # Thumbnails finished after another module (or a settings change)
+        # cleared the cache belong to the old batch and are not stored
+        generation = self.preview_cache.generation
+        tracker = ProgressTracker("Generating", total_students)
+        skipped = []
+        
+        def finished(tracker):
+            # One summary line per batch instead of one per label
+            if skipped:
+                shown = ", ".join(str(sid) for sid in skipped[:5])
+                more = f" and {len(skipped) - 5} more" if len(skipped) > 5 else ""
+                self.add_status(f"Skipped {len(skipped)} student(s) with no barcode value: {shown}{more}", error=True)
+            if students is not self.students_data:
+                return
+            self.generated_count = tracker.done - tracker.failed
+            if self.generated_count:
+                # Show all labels in the virtualized preview
+                self.preview.set_count(len(students))
+                self.add_status(f"✓ Generated {tracker.summary()} - Ready to print!")
+                self.print_btn.config(state='normal')
+                self.reprint_btn.config(state='normal')
+                self.print_selected_btn.config(state='normal')
+                self.preview_btn.config(state='normal')
+        
+        self.progress_bar.track(tracker, on_finish=finished)
+        
         def generate():
             try:
-                all_barcodes = []
-                
-                # Generate barcode for each student
-                for i, student in enumerate(self.students_data):
-                    barcode_value = student.get('Barcode')
-                    student_id = student.get('StudentID', 'Unknown')
-                    
-                    if not barcode_value:
-                        self.root.after(0, lambda sid=student_id: self.add_status(
-                            f"Skipping {sid} - no barcode value", error=True
-                        ))
+                # Generate barcode for each student; workers only count progress
+                for i, student in enumerate(students):
+                    if students is not self.students_data:
+                        break  # Another module was selected; its labels are not needed
+                    if not student.get('Barcode'):
+                        skipped.append(student.get('StudentID', 'Unknown'))
+                        tracker.advance(failed=1)
                         continue
                     
-                    # Generate barcode using Barcode field if available, else StudentID
-                    barcode_val = student.get('Barcode', student_id)
+                    # Pre-rendered by the prefetcher: nothing to do
+                    if self.preview_cache.peek(i, tile_width) is not None:
+                        tracker.advance()
+                        continue
                     
-                    # Generate image
-                    card_image = self.barcode_gen.create_barcode_card(barcode_value=str(barcode_val))
+                    # Generate image; only its preview thumbnail is kept
+                    card_image = self.render_student_label(student)
                     if card_image:
-                        all_barcodes.append(card_image)
-                        self.root.after(0, lambda p=i+1, t=total_students:
-                                       self.add_status(f"Generated {p}/{t} barcodes"))
-                
-                # Store all barcodes
-                self.all_barcode_images = all_barcodes
-                
-                # Create preview showing all barcodes
-                if all_barcodes:
-                    preview_image = self.create_preview_grid(all_barcodes)
-                    self.root.after(0, lambda: self.update_preview(preview_image))
-                    self.root.after(0, lambda: self.add_status(
-                        f"✓ Generated {len(all_barcodes)} barcode(s) - Ready to print!"
-                    ))
-                    self.root.after(0, lambda: self.print_btn.config(state='normal'))
-                    self.root.after(0, lambda: self.preview_btn.config(state='normal'))
+                        self.preview_cache.get(i, tile_width, image=card_image, generation=generation)
+                        tracker.advance()
+                    else:
+                        tracker.advance(failed=1)
                 
             except Exception as e:
                 self.root.after(0, lambda: self.add_status(
                     f"Error generating barcodes: {str(e)}", error=True
                 ))
+            finally:
+                tracker.finish()
         
         threading.Thread(target=generate, daemon=True).start()
     
-    def create_preview_grid(self, images: list) -> Image.Image:
-        """Create a grid preview showing all barcode cards in rows and columns"""
-        if not images:
-            return None
-        
-        # Use 4 columns for compact grid layout
-        cols = 4
-        rows = (len(images) + cols - 1) // cols
-        
-        # Get size of first image
-        img_width, img_height = images[0].size
-        
-        # Use full resolution (no scaling down)
-        scaled_width = img_width
-        scaled_height = img_height
-        
-        # Add spacing between images
-        spacing = 10
-        
-        # Calculate grid dimensions
-        grid_width = (scaled_width * cols) + (spacing * (cols + 1))
-        grid_height = (scaled_height * rows) + (spacing * (rows + 1))
-        
-        # Create light gray background
-        grid = Image.new('RGB', (grid_width, grid_height), (240, 240, 240))
-        
-        # Paste each barcode into grid
-        for i, img in enumerate(images):
-            # Scale the barcode for preview
-            
-            row = i // cols
-            col = i % cols
-            
-            x = spacing + (col * (scaled_width + spacing))
-            y = spacing + (row * (scaled_height + spacing))
-            
-            grid.paste(img, (x, y))
-        
-        log_event(f"Created preview grid: {len(images)} barcodes in {rows} row(s) x {cols} column(s)")
-        return grid
-    
-    def update_preview(self, image: Image.Image):
-        """Update preview with generated barcode(s)"""
-        if not hasattr(self, 'preview_label') or not self.preview_label.winfo_exists():
-            return
-            
-        if not image:
-            return
-            
-        # Resize for preview - fit to preview area width, allow vertical scrolling
-        preview_max_width = 1200 
-        
-        # Calculate scaling
-        if image.width > preview_max_width:
-            scale = preview_max_width / image.width
-            preview_width = int(image.width * scale)
-            preview_height = int(image.height * scale)
-            preview_img = image.resize((preview_width, preview_height), Image.Resampling.LANCZOS)
-        else:
-            preview_img = image
-        
-        self.preview_photo = ImageTk.PhotoImage(preview_img)
-        self.preview_label.config(image=self.preview_photo, text="", anchor='nw') # Anchor to Top-Left
+    def render_preview_label(self, index: int) -> "Image.Image":
+        """Render the label of students_data[index] as it will be printed"""
+        return self.render_student_label(self.students_data[index])
+
+    def render_student_label(self, student: dict) -> "Image.Image":
+        """Render a student's label as it will be printed"""
+        import raster
+        barcode_val = student.get('Barcode', student.get('StudentID', 'Unknown'))
+        card_image = self.barcode_gen.create_barcode_card(barcode_value=str(barcode_val))
+        if self.settings.get('print_mode') in ('bitmap', 'gdi'):
+            # Preview exactly the 1-bit raster that will be printed
+            card_image = raster.to_monochrome(card_image)
+        return card_image
 
+    def reset_preview(self):
+        """Forget rendered thumbnails (new students or changed label settings)"""
+        self.generated_count = 0
+        self.preview_cache.clear()
+        if hasattr(self, 'preview') and self.preview.winfo_exists():
+            self.preview.set_label_size((self.barcode_gen.card_width_px, self.barcode_gen.card_height_px))
+            self.preview.reset()
+    
     def show_print_preview(self):
-        """Show dedicated print preview window"""
-        if not hasattr(self, 'all_barcode_images') or not self.all_barcode_images:
+        """Show dedicated print preview window (rows are drawn as they scroll into view)"""
+        if not self.generated_count:
             return
 
         preview_window = tk.Toplevel(self.root)
         preview_window.title(f"Print Preview - {config.PRINTER_CONFIG['card_width_mm']}mm x {config.PRINTER_CONFIG['card_height_mm']}mm Labels")
         preview_window.geometry("600x800")
         
-        # Main scrollable container
-        container = ttk.Frame(preview_window)
-        container.pack(fill=tk.BOTH, expand=True)
-        
-        canvas = tk.Canvas(container, background='#e0e0e0')
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-        
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
-        
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Add labels to preview
-        ttk.Label(scrollable_frame, text=f"Print Preview: {len(self.all_barcode_images)} Labels", 
+        students = self.students_data
+        ttk.Label(preview_window, text=f"Print Preview: {len(students)} Labels", 
                  font=('Arial', 12, 'bold')).pack(pady=10)
         
-        # Keep references to images
-        preview_window.images = []
-        
-        for i, img in enumerate(self.all_barcode_images):
-            # Frame for each label (simulating paper)
-            page_frame = ttk.Frame(scrollable_frame, padding=10)
-            page_frame.pack(pady=5)
-            
-            # Label info
-            student = self.students_data[i]
+        from label_preview import LabelPreview, ThumbnailCache
+
+        def caption(i):
+            student = students[i]
             hall = student.get('VenueName', 'Hall ?')
             barcode_val = student.get('Barcode', student.get('StudentID'))
-            info_text = f"#{i+1}: {barcode_val} (Seat: {student.get('SeatNo')} - {hall})"
-            ttk.Label(page_frame, text=info_text).pack()
-            
-            # Show image with border (simulating cut line)
-            photo = ImageTk.PhotoImage(img)
-            preview_window.images.append(photo)
-            
-            lbl = tk.Label(page_frame, image=photo, relief='solid', borderwidth=1)
-            lbl.pack(pady=2)
-            
-            ttk.Separator(scrollable_frame, orient='horizontal').pack(fill='x', padx=50, pady=5)
+            return f"#{i+1}: {barcode_val} (Seat: {student.get('SeatNo')} - {hall})"
+
+        # Labels at their printed size, capped to the window; the window keeps
+        # its own small thumbnail cache so closing it frees everything. Labels
+        # come from the same list as the captions, even if another module loads
+        label_size = (self.barcode_gen.card_width_px, self.barcode_gen.card_height_px)
+        preview = LabelPreview(
+            preview_window,
+            ThumbnailCache(lambda i: self.render_student_label(students[i]), max_items=60),
+            tile_width=min(label_size[0], 520),
+            label_size=label_size,
+            spacing=20,
+            columns=1,
+            caption=caption,
+            background='#e0e0e0'
+        )
+        preview.pack(fill=tk.BOTH, expand=True)
+        preview.set_count(len(students))
     
     def show_database_settings_dialog(self):
         """Show dialog to configure database settings"""
@@ -833,7 +1075,7 @@ class BarcodeprinterApp:
         # Create dialog window
         dialog = tk.Toplevel(self.root)
         dialog.title("Printer Settings")
-        dialog.geometry("400x350")
+        dialog.geometry("420x500")
         dialog.transient(self.root)
         dialog.grab_set()
         
@@ -872,6 +1114,30 @@ class BarcodeprinterApp:
         offset_y_var = tk.DoubleVar(value=current.get('offset_y_mm', 0.0))
         ttk.Entry(form, textvariable=offset_y_var, width=10).grid(row=5, column=1, sticky='w', pady=5)
         
+        # TSPL Transfer
+        ttk.Label(form, text="TSPL Transfer", font=('Arial', 10, 'bold')).grid(
+            row=6, column=0, columnspan=2, sticky='w', pady=(20, 10))
+
+        template_var = tk.BooleanVar(value=current.get('tspl_use_template', False))
+        ttk.Checkbutton(
+            form,
+            text="Store label template in printer (faster)",
+            variable=template_var
+        ).grid(row=7, column=0, columnspan=2, sticky='w', pady=5)
+
+        ttk.Label(form, text="Labels per chunk:").grid(row=8, column=0, sticky='w', pady=5)
+        chunk_var = tk.IntVar(value=current.get('tspl_chunk_labels', 25))
+        ttk.Entry(form, textvariable=chunk_var, width=10).grid(row=8, column=1, sticky='w', pady=5)
+
+        print_modes = [('tspl', 'Printer fonts (TSPL)'), ('bitmap', 'Bitmap (prints the preview)'),
+                       ('gdi', 'Windows driver (GDI)')]
+        ttk.Label(form, text="Print method:").grid(row=9, column=0, sticky='w', pady=5)
+        mode_combo = ttk.Combobox(form, state="readonly", width=24, values=[label for _, label in print_modes])
+        mode_keys = [key for key, _ in print_modes]
+        current_mode = current.get('print_mode', 'tspl')
+        mode_combo.current(mode_keys.index(current_mode) if current_mode in mode_keys else 0)
+        mode_combo.grid(row=9, column=1, sticky='w', pady=5)
+        
         def save():
             try:
                 # Update settings dictionary
@@ -880,14 +1146,22 @@ class BarcodeprinterApp:
                 new_settings['label_height_mm'] = height_var.get()
                 new_settings['offset_x_mm'] = offset_x_var.get()
                 new_settings['offset_y_mm'] = offset_y_var.get()
+                new_settings['tspl_use_template'] = template_var.get()
+                new_settings['tspl_chunk_labels'] = max(1, chunk_var.get())
+                new_settings['print_mode'] = mode_keys[max(mode_combo.current(), 0)]
                 
                 # Save to file
+                from barcode_generator import BarcodeGenerator
                 if settings_manager.save_settings(new_settings):
                     self.settings = new_settings
                     self.add_status("Settings saved. Please regenerate barcodes.")
                     
                     # Update generator with new settings
                     self.barcode_gen = BarcodeGenerator(new_settings)
+                    with self.device_generators_lock:
+                        self.device_generators.clear()
+                    self.reset_preview()
+                    self.prefetcher.clear_labels()
                     
                     dialog.destroy()
                 else:
@@ -902,45 +1176,273 @@ class BarcodeprinterApp:
         ttk.Button(btn_frame, text="Cancel", command=dialog.destroy).pack(side=tk.RIGHT, padx=5)
         ttk.Button(btn_frame, text="Save Settings", command=save).pack(side=tk.RIGHT, padx=5)
 
-    def print_barcode(self):
-        """Print ALL generated barcodes using TSPL (Native Command)"""
+    def print_barcode(self, scope: str = 'all'):
+        """
+        Queue generated barcodes for printing using TSPL (Native Command).
+        scope: 'all' students, 'unprinted' (failed or pending) or the
+        'selected' listbox rows. Only those labels are sent.
+        """
         if not self.students_data:
             messagebox.showwarning("No Data", "Please generate barcodes first.")
             return
 
-        if not messagebox.askyesno("Confirm Print", f"Are you sure you want to print {len(self.students_data)} labels?"):
+        if scope == 'unprinted':
+            indices = [i for i in range(len(self.students_data)) if self.print_status.get(i) != 'success']
+            if not indices:
+                messagebox.showinfo("Nothing to Reprint", "All labels have been printed.")
+                return
+            description = f"{len(indices)} failed/pending label(s)"
+        elif scope == 'selected':
+            indices = [self.visible_rows[pos] for pos in self.student_listbox.curselection()
+                       if pos < len(self.visible_rows)]
+            if not indices:
+                messagebox.showwarning("No Selection", "Select the students to print in the list.")
+                return
+            if len(indices) == 1:
+                student = self.students_data[indices[0]]
+                description = f"the label for {student.get('Barcode', student.get('StudentID'))}"
+            else:
+                description = f"{len(indices)} selected label(s)"
+        else:
+            indices = list(range(len(self.students_data)))
+            description = f"{len(indices)} labels"
+
+        if not messagebox.askyesno("Confirm Print", f"Are you sure you want to print {description}?"):
             return
 
-        # Disable button during printing
-        self.print_btn.config(state='disabled')
-        self.add_status("Generating TSPL commands and sending to printer...")
-            
-        def run_print():
-            try:
-                # Use Native TSPL Printing
-                success = self.printer.print_tspl_data(self.students_data)
-                
-                if success:
-                    self.root.after(0, lambda: self.add_status("✅ Print job sent successfully!", "success"))
-                    self.root.after(0, lambda: messagebox.showinfo("Success", "Batch print job sent to printer."))
-                    self.root.after(0, self.mark_all_printed)
-                else:
-                    self.root.after(0, lambda: self.add_status("❌ Print job failed.", "error"))
-                    self.root.after(0, lambda: messagebox.showerror("Error", "Failed to send print job."))
-            
-            except Exception as e:
-                self.root.after(0, lambda: self.add_status(f"Print error: {e}", "error"))
-                log_event(f"Print thread error: {e}", 'error')
-            finally:
-                self.root.after(0, lambda: self.print_btn.config(state='normal'))
-        
-        threading.Thread(target=run_print, daemon=True).start()
+        # A minimal job: only these students, from the data already loaded
+        module = self.session.selected_module or {}
+        name = module.get('ModuleCode', 'Batch')
+        if scope != 'all':
+            name += " reprint"
+        job = self.spooler.enqueue(
+            f"{name} ({len(indices)})",
+            [self.students_data[i] for i in indices],
+            indices=indices,
+            mode=self.settings.get('print_mode', 'tspl'),
+            use_template=self.settings.get('tspl_use_template', False),
+            chunk_size=self.settings.get('tspl_chunk_labels'),
+            multi_printer=self.printer_group is not None and len(indices) > 1,
+            split=self.settings.get('printer_group_split', 'round_robin')
+        )
+        self.job_batches[job.id] = self.students_data
+        if scope != 'all':
+            # Failed labels are pending again until the reprint confirms them
+            self.mark_printed(indices, 'pending')
+        
+        waiting = len(self.spooler.pending_jobs()) - 1
+        if waiting > 0:
+            self.add_status(f"Print job queued behind {waiting} other job(s)")
+        else:
+            self.add_status("Print job queued - sending to printer...")
+
+    def render_print_label(self, student: dict, dpi: int = None):
+        """
+        Render the 1-bit label printed for a student in bitmap mode, or at
+        the printer's own DPI in GDI mode
+        """
+        import raster
+        from barcode_generator import BarcodeGenerator
+        generator = self.barcode_gen
+        if dpi and dpi != generator.dpi:
+            with self.device_generators_lock:
+                generator = self.device_generators.get(dpi)
+                if generator is None:
+                    generator = self.device_generators[dpi] = BarcodeGenerator(self.settings, dpi)
+        barcode_val = student.get('Barcode', student.get('StudentID'))
+        card_image = generator.create_barcode_card(barcode_value=str(barcode_val))
+        return raster.to_monochrome(card_image)
+
+    def on_spooler_event(self, event: str, job, detail):
+        """Spooler callback (worker thread) - hand over to the UI thread"""
+        self.root.after(0, lambda: self.apply_spooler_event(event, job, detail))
+
+    def apply_spooler_event(self, event: str, job, detail):
+        """Reflect spooler progress in the student list, log and queue views"""
+        batch = self.job_batches.get(job.id) if job else None
+
+        tracker = self.job_trackers.get(job.id) if job else None
+
+        if event == 'started':
+            # One job prints at a time; a job that yielded gets a fresh tracker when it resumes
+            for previous in self.job_trackers.values():
+                previous.finish()
+            self.job_trackers.clear()
+            tracker = self.job_trackers[job.id] = ProgressTracker(f"Printing {job.name}", job.total, job.printed)
+            if hasattr(self, 'progress_bar') and self.progress_bar.winfo_exists():
+                self.progress_bar.track(tracker)
+        elif event == 'progress':
+            if tracker is not None:
+                tracker.advance(len(detail))
+            if batch is not None:
+                self.mark_printed(detail, batch=batch)
+        elif event == 'done':
+            summary = tracker.summary() if tracker else f"{job.name} ({job.total} labels)"
+            self.add_status(f"✅ Printed {summary}")
+            self.job_batches.pop(job.id, None)
+        elif event == 'cancelled':
+            self.add_status(f"Print job {job.name} cancelled at {job.printed}/{job.total}")
+            if batch is not None:
+                self.mark_printed([job.indices[p] for p in job.remaining()], 'failed', batch=batch)
+            self.job_batches.pop(job.id, None)
+        elif event == 'printer_status':
+            if detail.ready:
+                self.add_status("Printer ready - resuming print job")
+            else:
+                self.add_status(f"⚠️ Printer not ready ({detail}) - printing will resume when it clears", error=True)
+        elif event == 'paused' and job and job.error:
+            self.add_status(f"❌ {job.name}: {job.error}. Queue paused.", error=True)
+            remaining = job.remaining()
+            if batch is not None:
+                self.mark_printed([job.indices[p] for p in remaining], 'failed', batch=batch)
+            messagebox.showerror(
+                "Printer Stopped",
+                f"{job.error}.\n\nFix the printer and press Resume to print "
+                f"the remaining {len(remaining)} label(s)."
+            )
+
+        if tracker is not None and event in ('done', 'cancelled', 'paused'):
+            tracker.finish()
+            self.job_trackers.pop(job.id, None)
+        self.refresh_queue_status()
+
+    def refresh_queue_status(self):
+        """Update the queue summary label, pause button and queue window"""
+        if not hasattr(self, 'queue_status_label') or not self.queue_status_label.winfo_exists():
+            return
+
+        pending = self.spooler.pending_jobs()
+        current = self.spooler.current_job
+        if self.spooler.paused:
+            text = f"Queue: ⏸ paused - {len(pending)} job(s) waiting"
+        elif current:
+            text = f"Queue: printing {current.name} {current.printed}/{current.total}"
+            if len(pending) > 1:
+                text += f" - {len(pending) - 1} waiting"
+        elif pending:
+            text = f"Queue: {len(pending)} job(s) waiting"
+        else:
+            text = "Queue: idle"
+
+        self.queue_status_label.config(text=text)
+        self.pause_btn.config(text="▶ Resume" if self.spooler.paused else "⏸ Pause")
+
+        if self.queue_window is not None and self.queue_window.winfo_exists():
+            self.refresh_queue_window()
+
+    def toggle_spooler_pause(self):
+        """Pause or resume the print queue"""
+        if self.spooler.paused:
+            self.spooler.resume()
+            self.add_status("Print queue resumed")
+        else:
+            self.spooler.pause()
+            self.add_status("Print queue paused - current chunk will finish")
+
+    def show_queue_window(self):
+        """Show the print queue with priority and cancel controls"""
+        if self.queue_window is not None and self.queue_window.winfo_exists():
+            self.queue_window.lift()
+            return
+
+        self.queue_window = tk.Toplevel(self.root)
+        self.queue_window.title("Print Queue")
+        self.queue_window.geometry("640x360")
+
+        columns = ('job', 'progress', 'priority', 'status')
+        self.queue_tree = ttk.Treeview(self.queue_window, columns=columns, show='headings', selectmode='browse')
+        for col, heading, width in [('job', 'Job', 240), ('progress', 'Printed', 100),
+                                    ('priority', 'Priority', 80), ('status', 'Status', 180)]:
+            self.queue_tree.heading(col, text=heading)
+            self.queue_tree.column(col, width=width, anchor=W)
+        self.queue_tree.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        def selected_job_id():
+            selection = self.queue_tree.selection()
+            return selection[0] if selection else None
+
+        def change_priority(delta):
+            job_id = selected_job_id()
+            job = self.spooler.get_job(job_id) if job_id else None
+            if job:
+                self.spooler.set_priority(job_id, job.priority + delta)
+
+        def cancel_job():
+            job_id = selected_job_id()
+            if job_id and messagebox.askyesno("Cancel Job", "Cancel the selected print job?", parent=self.queue_window):
+                self.spooler.cancel(job_id)
+
+        btn_frame = ttk.Frame(self.queue_window, padding=(10, 0, 10, 10))
+        btn_frame.pack(fill=X)
+        ttk.Button(btn_frame, text="⬆ Priority", command=lambda: change_priority(1),
+                   bootstyle="secondary-outline").pack(side=LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="⬇ Priority", command=lambda: change_priority(-1),
+                   bootstyle="secondary-outline").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="✗ Cancel Job", command=cancel_job,
+                   bootstyle="danger-outline").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="Clear Finished", command=self.spooler.clear_finished,
+                   bootstyle="secondary-outline").pack(side=RIGHT)
+
+        self.refresh_queue_window()
+
+    def refresh_queue_window(self):
+        """Repopulate the queue window from the spooler"""
+        selection = self.queue_tree.selection()
+        self.queue_tree.delete(*self.queue_tree.get_children())
+
+        pending = self.spooler.pending_jobs()
+        finished = [j for j in self.spooler.jobs if j.is_finished]
+        for job in pending + list(reversed(finished)):
+            status = job.status
+            if job.error and not job.is_finished:
+                status = f"{status} - {job.error}"
+            elif job.printer_stats:
+                # Multi-printer job: show each printer's share
+                status = f"{status} - " + ", ".join(
+                    f"{name}: {s['printed']}/{s['assigned']}" + ("" if s['status'] in ('printing', 'done') else f" {s['status']}")
+                    for name, s in job.printer_stats.items()
+                )
+            self.queue_tree.insert('', END, iid=job.id, values=(
+                job.name, f"{job.printed}/{job.total}", job.priority, status
+            ))
+
+        if selection and self.queue_tree.exists(selection[0]):
+            self.queue_tree.selection_set(selection[0])
+
+    def mark_printed(self, indices, status: str = 'success', batch: list = None):
+        """Set the print status of the given students in the UI"""
+        # Ignore progress from a batch that is no longer displayed
+        if batch is not None and batch is not self.students_data:
+            return
+        if not hasattr(self, 'student_listbox') or not self.student_listbox.winfo_exists():
+            return
+        indices = [i for i in indices if i < len(self.students_data)]
+        for i in indices:
+            self.print_status[i] = status
+        self.repaint_student_rows(indices)
 
     def mark_all_printed(self):
         """Mark all students as printed in the UI"""
-        for i in range(len(self.students_data)):
-            self.print_status[i] = 'success'
-            self.update_student_status(i)
+        self.mark_printed(range(len(self.students_data)))
+    
+    def repaint_student_rows(self, indices):
+        """Redraw the visible rows of the given students in one delete/insert"""
+        positions = [self.row_positions[i] for i in indices if i in self.row_positions]
+        if not positions:
+            return
+        first, last = min(positions), max(positions)
+        view = self.student_listbox.yview()
+        selection = self.student_listbox.curselection()
+        
+        self.student_listbox.delete(first, last)
+        self.student_listbox.insert(
+            first, *[self.student_row_text(i) for i in self.visible_rows[first:last + 1]]
+        )
+        
+        # Keep scroll position and selection
+        self.student_listbox.yview_moveto(view[0])
+        for pos in selection:
+            self.student_listbox.selection_set(pos)
     
     def show_print_summary(self, success: int, failed: int, total: int):
         """Show print job summary"""
@@ -958,37 +1460,14 @@ class BarcodeprinterApp:
     
     def update_student_status(self, index: int, status: str):
         """Update student print status in listbox"""
-        if index >= len(self.students_data):
-            return
-        
-        student = self.students_data[index]
-        student_id = student.get('StudentID', 'Unknown')
-        seat_no = student.get('SeatNo', '?')
-        
-        # Update status
-        self.print_status[index] = status
-        
-        # Choose icon based on status
-        if status == 'success':
-            icon = '✓'  # Green check
-        elif status == 'failed':
-            icon = '✗'  # Red X
-        else:
-            icon = '⚠'  # Yellow caution (pending)
-        
-        barcode_val = student.get('Barcode', student_id)
-        
-        # Update listbox item
-        hall = student.get('VenueName', 'Hall ?')
-        display = f"{icon} {barcode_val} - Seat {seat_no} - {hall}"
-        self.student_listbox.delete(index)
-        self.student_listbox.insert(index, display)
-        
-        # Keep selection if any
-        # self.student_listbox.selection_set(index)
+        self.mark_printed([index], status)
 
     def show_scan_dialog(self):
         """Show continuous scan dialog"""
+        if self.scan_popup is not None and self.scan_popup.winfo_exists():
+            self.scan_popup.lift()
+            self.scan_entry.focus_set()
+            return
         self.scan_popup = tk.Toplevel(self.root)
         self.scan_popup.title("Scan Barcode")
         self.scan_popup.geometry("600x500")
@@ -1016,18 +1495,10 @@ class BarcodeprinterApp:
         # Bind Enter key
         self.scan_entry.bind('<Return>', self.process_scan)
         
-        # Result Area
-        self.result_frame = ttk.Frame(self.scan_popup, padding=20)
-        self.result_frame.pack(fill=BOTH, expand=True)
-        
-        # Initial Placeholder
-        self.placeholder_lbl = ttk.Label(
-            self.result_frame, 
-            text="Waiting for scan...", 
-            font=('Segoe UI', 12), 
-            foreground="gray"
-        )
-        self.placeholder_lbl.pack(pady=50)
+        # Result Area: laid out once, updated in place per scan
+        self.scan_panel = ScanResultPanel(self.scan_popup, padding=20)
+        self.scan_panel.pack(fill=BOTH, expand=True)
+        self.refresh_scan_rate()
 
     def process_scan(self, event):
         """Handle scan input"""
@@ -1039,78 +1510,99 @@ class BarcodeprinterApp:
         # Refocus immediately
         self.scan_entry.focus_set()
         
-        self.add_status(f"Scanning: {barcode}...")
-        
-        # Run lookup
-        threading.Thread(target=lambda: self.lookup_barcode_continuous(barcode), daemon=True).start()
+        if self.scan_queue is None:
+            self.scan_queue = ScanQueue(self.root, self.find_scanned_student, self.on_scan_result)
+        if self.scan_queue.submit(barcode):
+            self.add_status(f"Scanning: {barcode}...")
 
-    def lookup_barcode_continuous(self, barcode):
-        """Lookup and update the existing scan window"""
-        try:
-            result = self.db.get_student_by_barcode(barcode)
-            self.root.after(0, lambda: self.update_scan_results(result, barcode))
-        except Exception as e:
-            self.root.after(0, lambda: self.add_status(f"Scan error: {e}", error=True))
+    def find_scanned_student(self, barcode):
+        """Student for a scanned code: lookup service if configured, else the database"""
+        if self.lookup_client:
+            try:
+                return self.lookup_client.get_student_by_barcode(barcode)
+            except Exception as e:
+                log_event(f"Lookup service unavailable, using database: {e}", 'warning')
+        # A database error shows as a failed lookup, not as an unknown student
+        return self.db.get_student_by_barcode(barcode, raise_errors=True)
 
-    def update_scan_results(self, data, scanned_barcode):
-        """Update the scan window content"""
-        # Safety Check
-        if not hasattr(self, 'scan_popup') or not self.scan_popup.winfo_exists():
+    def on_scan_result(self, result):
+        """Show a scan result (UI thread, in scan order)"""
+        if not result.duplicate:
+            self.scan_rate.add()
+            self.attendance.record(result.code, result.student, lookup_failed=bool(result.error))
+        if result.error:
+            self.add_status(f"Scan error: {result.error}", error=True)
+        if self.scan_popup is None or not self.scan_popup.winfo_exists():
             return
-            
-        # Clear previous results
-        for widget in self.result_frame.winfo_children():
-            widget.destroy()
-            
-        if not data:
-            # Show Error
-            ttk.Label(self.result_frame, text="❌ Student Not Found", 
-                     font=('Segoe UI', 16, 'bold'), foreground="red").pack(pady=10)
-            ttk.Label(self.result_frame, text=f"Barcode: {scanned_barcode}", 
-                     font=('Consolas', 12)).pack()
-            # Play error sound/visuals if needed
+        self.scan_panel.show(result)
+
+    def refresh_scan_rate(self):
+        """Update the throughput line once a second while the scan window is open"""
+        if self.scan_popup is None or not self.scan_popup.winfo_exists():
             return
+        queue = self.scan_queue
+        self.scan_panel.show_rate(self.scan_rate.per_minute(), self.scan_rate.total,
+                                  queue.pending if queue else 0, queue.duplicates if queue else 0)
+        self.scan_popup.after(1000, self.refresh_scan_rate)
 
-        # Show Success Data
-        ttk.Label(self.result_frame, text="✅ Student Verified", 
-                 font=('Segoe UI', 16, 'bold'), foreground="green").pack(pady=(0, 20))
-                 
-        # Grid layout for details
-        grid_frame = ttk.Frame(self.result_frame)
-        grid_frame.pack(fill=X)
-        
-        details = [
-            ("Student Name:", data.get('StudentName', 'Unknown')), # Assuming we might fetch name later, or just ID
-            ("Student ID:", data.get('StudentID', 'N/A')),
-            ("Level:", data.get('StudentLevel', 'N/A')),
-            ("---", "---"),
-            ("Exam Date:", str(data.get('ExamDate', 'N/A'))),
-            ("Module:", data.get('ModuleCode', 'N/A')),
-            ("Venue:", data.get('VenueName', 'N/A')),
-            ("Seat Number:", str(data.get('SeatNo', 'N/A'))),
-        ]
-        
-        for i, (label, value) in enumerate(details):
-            if label == "---":
-                ttk.Separator(grid_frame, orient=HORIZONTAL).grid(row=i, column=0, columnspan=2, sticky='ew', pady=10)
-                continue
-                
-            # Labels
-            ttk.Label(grid_frame, text=label, font=('Segoe UI', 11, 'bold'), foreground="#555").grid(row=i, column=0, sticky='w', pady=5, padx=20)
-            
-            # Values (Highlight critical info)
-            if "Seat" in label or "Venue" in label:
-                ttk.Label(grid_frame, text=value, font=('Segoe UI', 14, 'bold'), foreground="#d9534f").grid(row=i, column=1, sticky='w', pady=5)
-            else:
-                ttk.Label(grid_frame, text=value, font=('Segoe UI', 12)).grid(row=i, column=1, sticky='w', pady=5)
+    def show_attendance_dashboard(self):
+        """Show live attendance per venue for the selected exam date"""
+        if self.attendance_popup is not None and self.attendance_popup.winfo_exists():
+            self.attendance_popup.lift()
+        else:
+            self.attendance_popup = tk.Toplevel(self.root)
+            self.attendance_popup.title("Attendance")
+            self.attendance_popup.geometry("640x480")
+            AttendanceDashboard(self.attendance_popup, self.attendance, padding=15).pack(fill=BOTH, expand=True)
+        self.load_attendance()
 
-    
+    def load_attendance(self):
+        """Load the expected candidates of the selected date, if not loaded yet"""
+        date = self.date_combo.get() if hasattr(self, 'date_combo') else ''
+        if not date or not self.modules or date == self.attendance.date:
+            return
+        
+        # Expected candidates: every module of the date, from the prefetch cache where possible
+        semester_code = self.session.selected_semester.get('SemesterCode')
+        module_codes = [mod.get('ModuleCode') for mod in self.modules]
+        self.add_status(f"Loading expected candidates for {date}...")
+        
+        def load():
+            expected = {}
+            for code in module_codes:
+                students = self.prefetcher.get_students(code, semester_code)
+                if students is None:
+                    students = self.db.get_barcode_data(code, semester_code)
+                    self.prefetcher.store_students(code, semester_code, students)
+                expected[code] = students
+            return expected
+        
+        def apply(expected):
+            self.attendance.set_expected(date, expected)
+            self.add_status(f"Attendance: {self.attendance.total['expected']} candidate(s) expected on {date}")
+        
+        self.attendance_loads.submit(
+            load, apply,
+            lambda e: self.add_status(f"Error loading attendance: {e}", error=True)
+        )
 
 
 def main():
     """Main entry point"""
     root = ttk.Window(themename="cosmo")
+    startup.mark("window created")
     app = BarcodeprinterApp(root)
+    
+    if '--startup-report' in sys.argv:
+        # Print the startup timings once everything is up, then quit
+        def report():
+            if app.startup_done.is_set():
+                print(startup.report())
+                app.on_close()
+            else:
+                root.after(100, report)
+        root.after(100, report)
+    
     root.mainloop()
 
 
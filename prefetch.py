@@ -0,0 +1,149 @@
+"""
+Speculative prefetch for the Barcode Printer Application
+Operators work through the modules of a date in order, so once the
+modules are listed their student lists are fetched in the background
+(within a budget), and the labels of the module after the selected one
+are pre-rendered as preview thumbnails. Selecting that module then needs
+no query and, for the first labels, no rendering.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import config
+from utils import log_event
+
+
+class Prefetcher:
+    """
+    Background student-list and label warm-up.
+    fetch(module_code, semester_code) loads students; render(student, width)
+    returns a preview thumbnail. is_busy() holding True (a foreground load
+    is running) makes the worker wait, so prefetch never delays a click.
+    """
+
+    def __init__(self, fetch: Callable, render: Callable, is_busy: Callable = None,
+                 max_modules: int = None, max_labels: int = None, ttl_sec: float = None):
+        self.fetch = fetch
+        self.render = render
+        self.is_busy = is_busy or (lambda: False)
+        self.max_modules = config.APP_SETTINGS.get('prefetch_modules', 10) if max_modules is None else max_modules
+        self.max_labels = config.APP_SETTINGS.get('prefetch_labels', 200) if max_labels is None else max_labels
+        self.ttl_sec = config.APP_SETTINGS.get('prefetch_ttl_sec', 300) if ttl_sec is None else ttl_sec
+
+        self._students = OrderedDict()  # (module, semester) -> (fetched at, students)
+        self._labels = None  # (module, semester, width, {index: thumbnail})
+        self._tasks = []  # callables for the worker, newest plan only
+        self._token = 0
+        self._label_token = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    # -- cache ------------------------------------------------------------
+
+    def get_students(self, module_code: str, semester_code: str) -> Optional[List[Dict]]:
+        """Prefetched students of a module, or None if not (freshly) cached"""
+        with self._cond:
+            entry = self._students.get((module_code, semester_code))
+            if entry is None or time.monotonic() - entry[0] > self.ttl_sec:
+                return None
+            return entry[1]
+
+    def store_students(self, module_code: str, semester_code: str, students: List[Dict]):
+        with self._cond:
+            self._students[(module_code, semester_code)] = (time.monotonic(), students)
+            self._students.move_to_end((module_code, semester_code))
+            # Keep a little more than one date's worth of modules
+            while len(self._students) > max(self.max_modules * 2, 1):
+                self._students.popitem(last=False)
+
+    def take_labels(self, module_code: str, semester_code: str, width: int) -> Dict[int, object]:
+        """Pre-rendered thumbnails {index: image} for a module (once), else {}"""
+        with self._cond:
+            labels, self._labels = self._labels, None
+        if labels and labels[:3] == (module_code, semester_code, width):
+            return labels[3]
+        return {}
+
+    def clear_labels(self):
+        """Forget pre-rendered labels (label settings changed)"""
+        with self._cond:
+            self._labels = None
+
+    def clear(self):
+        with self._cond:
+            self._token += 1
+            self._tasks = []
+            self._students.clear()
+            self._labels = None
+
+    # -- planning ---------------------------------------------------------
+
+    def prefetch_students(self, module_codes: List[str], semester_code: str):
+        """Fetch students of the listed modules in order, up to max_modules"""
+        codes = module_codes[:self.max_modules]
+        self._plan([lambda token, code=code: self._warm_students(code, semester_code) for code in codes])
+
+    def prerender(self, module_code: str, semester_code: str, width: int):
+        """Render thumbnails of the first max_labels labels of a module"""
+        if not self.max_labels:
+            return
+        with self._cond:
+            # Only the latest selection's next module is worth rendering
+            self._label_token += 1
+            label_token = self._label_token
+        # Rendering the likely next module goes before the rest of the student lists
+        self._plan([lambda token: self._warm_labels(module_code, semester_code, width, token, label_token)],
+                   first=True)
+
+    def _plan(self, tasks: list, first: bool = False):
+        with self._cond:
+            if first:
+                self._tasks = tasks + self._tasks
+            else:
+                # A new date supersedes any prefetch still planned for the old one
+                self._token += 1
+                self._tasks = list(tasks)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="Prefetch", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    # -- worker -----------------------------------------------------------
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._tasks:
+                    self._cond.wait()
+                task = self._tasks.pop(0)
+                token = self._token
+            while self.is_busy():
+                time.sleep(0.05)
+            try:
+                task(token)
+            except Exception as e:
+                log_event(f"Prefetch failed: {e}", 'warning')
+
+    def _warm_students(self, module_code: str, semester_code: str) -> Optional[List[Dict]]:
+        students = self.get_students(module_code, semester_code)
+        if students is None:
+            students = self.fetch(module_code, semester_code)
+            self.store_students(module_code, semester_code, students)
+        return students
+
+    def _warm_labels(self, module_code: str, semester_code: str, width: int,
+                     token: int, label_token: int):
+        if label_token != self._label_token:
+            return
+        students = self._warm_students(module_code, semester_code)
+        thumbs = {}
+        for i, student in enumerate(students[:self.max_labels]):
+            if token != self._token or label_token != self._label_token or self.is_busy():
+                # Superseded, or the operator is waiting on a foreground load: keep what is done
+                break
+            if student.get('Barcode'):
+                thumbs[i] = self.render(student, width)
+        with self._cond:
+            self._labels = (module_code, semester_code, width, thumbs)
@@ -0,0 +1,404 @@
+"""
+Background print spooler for the Barcode Printer Application
+Jobs are kept in a JSON file so a queue survives restarts, and a single
+worker thread feeds them to PrinterManager in confirmed TSPL chunks.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Callable, List, Optional
+
+import config
+from utils import log_event
+
+
+# Student fields a TSPL label needs; everything else stays in the database
+LABEL_FIELDS = ('StudentID', 'Barcode', 'SeatNo', 'VenueName')
+
+# Finished jobs kept in the queue file for the status view
+HISTORY_LIMIT = 50
+
+
+class PrintJob:
+    """A queued batch of labels and how far it has printed"""
+
+    QUEUED = 'queued'
+    PRINTING = 'printing'
+    DONE = 'done'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, name: str, students: list, priority: int = 0,
+                 indices: list = None, options: dict = None):
+        self.id = uuid.uuid4().hex[:8]
+        self.name = name
+        self.students = [{k: s.get(k) for k in LABEL_FIELDS if k in s} for s in students]
+        # Position of each label in the batch it came from (for UI progress)
+        self.indices = list(indices) if indices is not None else list(range(len(students)))
+        self.priority = priority
+        self.options = options or {}
+        self.status = self.QUEUED
+        # Batch positions confirmed so far; a multi-printer job fills them out of order
+        self.done: List[int] = []
+        # Per-printer progress for jobs split across a printer group
+        self.printer_stats: dict = {}
+        self.error: Optional[str] = None
+        self.created = time.time()
+
+    @property
+    def total(self) -> int:
+        # Finished jobs loaded from the queue file keep only their counts
+        return getattr(self, '_total', len(self.students))
+
+    @property
+    def printed(self) -> int:
+        return getattr(self, '_printed', len(self.done))
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.DONE, self.CANCELLED)
+
+    def remaining(self) -> List[int]:
+        """Positions of labels not yet confirmed, in batch order"""
+        done = set(self.done)
+        return [p for p in range(len(self.students)) if p not in done]
+
+    def to_dict(self) -> dict:
+        data = dict(self.__dict__)
+        if self.is_finished:
+            # History only shows name, counts, status and printer_stats, so the
+            # per-label lists are not rewritten with every save
+            data.update(students=[], indices=[], done=[], _total=self.total, _printed=self.printed)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PrintJob':
+        data = dict(data)
+        data.setdefault('printer_stats', {})
+        job = cls.__new__(cls)
+        job.__dict__.update(data)
+        return job
+
+
+class PrintSpooler:
+    """Persistent priority queue of print jobs with a single worker thread"""
+
+    def __init__(self, printer, queue_file: str = None, label_renderer: Callable = None,
+                 printer_group=None):
+        self.printer = printer
+        # PrinterGroup used by jobs enqueued with multi_printer=True
+        self.printer_group = printer_group
+        # label_renderer(student, dpi=None) -> Image, used by 'bitmap' and 'gdi' mode jobs
+        self.label_renderer = label_renderer
+        self.queue_file = queue_file or config.APP_SETTINGS.get('print_queue_file', 'print_queue.json')
+        self.jobs: List[PrintJob] = []
+        self.paused = False
+        self.current_job: Optional[PrintJob] = None
+        self._listeners: List[Callable] = []
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread = None
+        # Printer status changes seen while a chunk waits for the printer
+        printer.add_status_listener(lambda status: self._notify('printer_status', self.current_job, status))
+        if printer_group:
+            for member in printer_group.printers:
+                member.add_status_listener(lambda status: self._notify('printer_status', self.current_job, status))
+        self._load()
+
+    # -- persistence ------------------------------------------------------
+
+    def _load(self):
+        if not os.path.exists(self.queue_file):
+            return
+        try:
+            with open(self.queue_file, 'r') as f:
+                data = json.load(f)
+            self.jobs = [PrintJob.from_dict(j) for j in data.get('jobs', [])]
+            # A job that was printing when the app stopped resumes from its last confirmed label
+            for job in self.jobs:
+                if job.status == PrintJob.PRINTING:
+                    job.status = PrintJob.QUEUED
+            pending = self.pending_jobs()
+            if pending:
+                # Let the operator check the printer before restored jobs run
+                self.paused = True
+                log_event(f"Restored {len(pending)} unfinished print job(s); spooler paused")
+        except Exception as e:
+            log_event(f"Error loading print queue: {e}", 'error')
+
+    def _save(self):
+        """Write the queue atomically; caller holds the lock"""
+        finished = [j for j in self.jobs if j.is_finished]
+        if len(finished) > HISTORY_LIMIT:
+            drop = {id(j) for j in finished[:-HISTORY_LIMIT]}
+            self.jobs = [j for j in self.jobs if id(j) not in drop]
+        try:
+            tmp_file = self.queue_file + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump({'jobs': [j.to_dict() for j in self.jobs]}, f, default=str)
+            os.replace(tmp_file, self.queue_file)
+        except Exception as e:
+            log_event(f"Error saving print queue: {e}", 'error')
+
+    # -- listeners --------------------------------------------------------
+
+    def add_listener(self, callback: Callable):
+        """
+        Register callback(event, job, indices) for 'queued', 'started',
+        'progress', 'done', 'cancelled', 'paused', 'resumed' and
+        'printer_status' events. Called on the worker thread; indices is the
+        confirmed student indices for 'progress' and a PrinterStatus for
+        'printer_status' (printer waiting on an error, or ready again).
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, event: str, job: Optional[PrintJob] = None, indices: list = None):
+        for callback in list(self._listeners):
+            try:
+                callback(event, job, indices)
+            except Exception as e:
+                log_event(f"Print spooler listener error: {e}", 'error')
+
+    # -- queue control ----------------------------------------------------
+
+    def pending_jobs(self) -> List[PrintJob]:
+        """Unfinished jobs in the order they will print"""
+        pending = [j for j in self.jobs if not j.is_finished]
+        return sorted(pending, key=lambda j: (-j.priority, j.created))
+
+    def enqueue(self, name: str, students: list, priority: int = 0,
+                indices: list = None, **options) -> PrintJob:
+        """
+        Add a job. Options: mode ('tspl', 'bitmap' or 'gdi'), use_template and
+        chunk_size, as accepted by PrinterManager.stream_tspl_data, and
+        multi_printer/split to spread the job over the printer group.
+        Bitmap jobs render their labels chunk by chunk via label_renderer.
+        """
+        job = PrintJob(name, students, priority, indices, options)
+        with self._cond:
+            self.jobs.append(job)
+            self._save()
+            self._cond.notify_all()
+        log_event(f"Queued print job '{name}' ({job.total} labels, priority {priority})")
+        self._notify('queued', job)
+        return job
+
+    def get_job(self, job_id: str) -> Optional[PrintJob]:
+        with self._cond:
+            return next((j for j in self.jobs if j.id == job_id), None)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job; a printing job stops after its current chunk"""
+        with self._cond:
+            job = next((j for j in self.jobs if j.id == job_id), None)
+            if not job or job.is_finished:
+                return False
+            job.status = PrintJob.CANCELLED
+            self._save()
+            self._cond.notify_all()
+        if job is self.current_job:
+            self._interrupt_printers()
+        log_event(f"Cancelled print job '{job.name}' at {job.printed}/{job.total}")
+        self._notify('cancelled', job)
+        return True
+
+    def set_priority(self, job_id: str, priority: int) -> bool:
+        with self._cond:
+            job = next((j for j in self.jobs if j.id == job_id), None)
+            if not job or job.is_finished:
+                return False
+            job.priority = priority
+            self._save()
+        self._notify('queued', job)
+        return True
+
+    def pause(self, reason: str = None):
+        """Stop starting new chunks until resume() is called"""
+        with self._cond:
+            self.paused = True
+        self._interrupt_printers()
+        if reason:
+            log_event(f"Print spooler paused: {reason}", 'warning')
+        self._notify('paused', self.current_job)
+
+    def _interrupt_printers(self):
+        """Stop a chunk that is waiting for a printer error to clear"""
+        self.printer.interrupt_wait()
+        if self.printer_group:
+            for member in self.printer_group.printers:
+                member.interrupt_wait()
+
+    def resume(self):
+        with self._cond:
+            self.paused = False
+            self._cond.notify_all()
+        self._notify('resumed')
+
+    def clear_finished(self):
+        with self._cond:
+            self.jobs = [j for j in self.jobs if not j.is_finished]
+            self._save()
+        self._notify('queued')
+
+    # -- worker -----------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="PrintSpooler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._interrupt_printers()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _next_job(self) -> Optional[PrintJob]:
+        """Block until a job may run; caller holds the lock"""
+        while not self._stopping:
+            if not self.paused:
+                pending = self.pending_jobs()
+                if pending:
+                    return pending[0]
+            self._cond.wait()
+        return None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                if job is None:
+                    return
+                job.status = PrintJob.PRINTING
+                job.error = None
+                self.current_job = job
+                self._save()
+            self._notify('started', job)
+
+            try:
+                self._print_job(job)
+            except Exception as e:
+                log_event(f"Print spooler error on '{job.name}': {e}", 'error')
+                with self._cond:
+                    if job.status == PrintJob.PRINTING:
+                        job.status = PrintJob.QUEUED
+                    job.error = str(e)
+                    self._save()
+                self.pause(str(e))
+            finally:
+                self.current_job = None
+
+    def _should_yield(self, job: PrintJob) -> bool:
+        """
+        Re-checked between chunks so cancel, pause and higher-priority jobs
+        take effect; caller holds the lock
+        """
+        if job.status == PrintJob.CANCELLED:
+            return True
+        if self.paused or self._stopping or self.pending_jobs()[0] is not job:
+            job.status = PrintJob.QUEUED
+            self._save()
+            return True
+        return False
+
+    def _print_job(self, job: PrintJob):
+        if job.options.get('multi_printer') and self.printer_group:
+            self._print_job_group(job)
+            return
+
+        chunk_size = job.options.get('chunk_size') or config.PRINTER_CONFIG.get('tspl_chunk_labels', 25)
+
+        while job.printed < job.total:
+            with self._cond:
+                if self._should_yield(job):
+                    return
+
+            positions = job.remaining()[:chunk_size]
+            students = [job.students[p] for p in positions]
+            job_name = f"{job.name} [{positions[0] + 1}-{positions[-1] + 1}]"
+            confirmed = self.printer.print_batch(
+                students,
+                mode=job.options.get('mode', 'tspl'),
+                use_template=job.options.get('use_template'),
+                label_renderer=self.label_renderer,
+                chunk_size=chunk_size,
+                job_name=job_name
+            )
+
+            with self._cond:
+                job.done.extend(positions[:confirmed])
+                self._save()
+            if confirmed:
+                self._notify('progress', job, [job.indices[p] for p in positions[:confirmed]])
+
+            if confirmed < len(positions):
+                with self._cond:
+                    # Paused, cancelled or stopping while the chunk waited for the printer
+                    interrupted = self.paused or self._stopping or job.status != PrintJob.PRINTING
+                    if job.status == PrintJob.PRINTING:
+                        job.status = PrintJob.QUEUED
+                    if not interrupted:
+                        job.error = f"Printer stopped at label {positions[confirmed] + 1} of {job.total}"
+                    self._save()
+                if not interrupted:
+                    self.pause(job.error)
+                return
+
+        self._finish_job(job)
+
+    def _print_job_group(self, job: PrintJob):
+        """Split the job's remaining labels across every printer in the group"""
+        positions = job.remaining()
+
+        def on_progress(sub_indices: list, printer_name: str):
+            confirmed = [positions[i] for i in sub_indices]
+            with self._cond:
+                job.done.extend(confirmed)
+                job.printer_stats = dict(self.printer_group.stats)
+                self._save()
+            self._notify('progress', job, [job.indices[p] for p in confirmed])
+
+        def should_stop() -> bool:
+            with self._cond:
+                return self._should_yield(job)
+
+        result = self.printer_group.dispatch(
+            [job.students[p] for p in positions],
+            split=job.options.get('split'),
+            chunk_size=job.options.get('chunk_size'),
+            mode=job.options.get('mode', 'tspl'),
+            use_template=job.options.get('use_template'),
+            label_renderer=self.label_renderer,
+            progress_callback=on_progress,
+            should_stop=should_stop,
+            job_name=job.name
+        )
+
+        with self._cond:
+            job.printer_stats = result['printers']
+            self._save()
+            if job.status != PrintJob.PRINTING:
+                return  # cancelled, paused or preempted
+
+        if result['unprinted']:
+            with self._cond:
+                job.status = PrintJob.QUEUED
+                job.error = f"All printers stopped; {len(result['unprinted'])} of {job.total} labels not printed"
+                self._save()
+            self.pause(job.error)
+            return
+
+        self._finish_job(job)
+
+    def _finish_job(self, job: PrintJob):
+        with self._cond:
+            if job.status == PrintJob.PRINTING:
+                job.status = PrintJob.DONE
+            self._save()
+        log_event(f"Print job '{job.name}' finished ({job.total} labels)")
+        self._notify('done', job)
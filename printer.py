@@ -1,147 +1,290 @@
 """
 Printer interface module for XPrinter XP-365B thermal printer
-Uses direct Windows printing with proper image handling
+Raw commands go through a pluggable transport (see printer_backends.py);
+the GDI image path uses direct Windows printing with proper image handling
 """
-import win32print
-import win32ui
-from PIL import Image, ImageWin
+import threading
+import time
+from typing import Callable, Optional
+
+from PIL import Image
 import config
-from utils import log_event
+import label_template
+import printer_status
+from printer_status import PrinterStatus
+from utils import log_event, pixels_to_mm
+from printer_backends import PrinterBackend, create_backend
+from printer_registry import PrinterRegistry
 
 
 class PrinterManager:
     """Manage thermal printer connections and print jobs"""
     
-    def __init__(self):
-        self.printer_name = config.PRINTER_CONFIG['printer_name']
+    def __init__(self, backend: PrinterBackend = None, printer_name: str = None,
+                 registry: PrinterRegistry = None):
+        if backend is None:
+            backend = create_backend(
+                config.PRINTER_CONFIG.get('backend', 'auto'),
+                **config.PRINTER_CONFIG.get('backend_options', {})
+            )
+        self.backend = backend
+        # Managers driving several printers on one backend can share a registry
+        self.registry = registry or PrinterRegistry(backend)
+        self.printer_name = (printer_name or backend.default_printer_name
+                             or config.PRINTER_CONFIG['printer_name'])
+        # Printer command language used for raw label jobs: 'tspl', 'zpl' or 'escpos'
+        self.language = config.PRINTER_CONFIG.get('command_language', 'tspl')
+        self._templates = {}
+        # (printer, preamble) of the stored form last downloaded, while it is known to be there
+        self._stored_form = None
+        self._status_listeners = []
+        self._wait_interrupt = threading.Event()
     
-    def get_available_printers(self) -> list:
-        """Get list of available Windows printers"""
-        try:
-            printers = [printer[2] for printer in win32print.EnumPrinters(2)]
-            log_event(f"Found {len(printers)} available printers")
-            return printers
-        except Exception as e:
-            log_event(f"Error getting printer list: {e}", 'error')
-            return []
+    def get_available_printers(self, refresh: bool = False) -> list:
+        """Get list of printers reachable through the configured backend (cached)"""
+        if refresh:
+            return self.registry.refresh()
+        return self.registry.printers
     
     def is_printer_available(self) -> bool:
-        """Check if the configured printer is available"""
-        available_printers = self.get_available_printers()
+        """Check if the configured printer is available (no enumeration once cached)"""
+        printer = self.registry.resolve(self.printer_name)
         
-        # Try exact match first
-        if self.printer_name in available_printers:
-            return True
-        
-        # Try case-insensitive partial match
-        for printer in available_printers:
-            if self.printer_name.lower() in printer.lower():
-                self.printer_name = printer  # Update to exact name
-                log_event(f"Matched printer: {printer}")
-                return True
+        if printer is None:
+            log_event(f"Printer '{self.printer_name}' not found", 'warning')
+            return False
         
-        log_event(f"Printer '{self.printer_name}' not found", 'warning')
-        return False
+        if printer != self.printer_name:
+            self.printer_name = printer  # Update to exact name
+            log_event(f"Matched printer: {printer}")
+        return True
     
     def get_default_printer(self) -> str:
-        """Get the default Windows printer"""
+        """Get the default system printer"""
         try:
-            return win32print.GetDefaultPrinter()
+            return self.backend.get_default_printer()
         except Exception as e:
             log_event(f"Error getting default printer: {e}", 'error')
             return None
     
+    def get_status(self) -> Optional[PrinterStatus]:
+        """Query the printer's status; None if the transport cannot read replies"""
+        if not self.backend.supports_query:
+            return None
+        return printer_status.query_status(self.backend, self.printer_name, self.language)
+
+    def add_status_listener(self, callback: Callable):
+        """Register callback(status) for status changes seen while waiting for the printer"""
+        self._status_listeners.append(callback)
+
+    def _notify_status(self, status: PrinterStatus):
+        for callback in list(self._status_listeners):
+            try:
+                callback(status)
+            except Exception as e:
+                log_event(f"Printer status listener error: {e}", 'error')
+
+    def interrupt_wait(self):
+        """Make a pending wait_until_ready() give up (pause, cancel, shutdown)"""
+        self._stored_form = None  # The printer may be power-cycled before printing resumes
+        self._wait_interrupt.set()
+
+    def wait_until_ready(self, timeout: float = None) -> bool:
+        """
+        Hold while the printer reports an error (no paper, head open, paused...)
+        and resume as soon as it clears. Returns False if it is still not
+        ready after timeout seconds (PRINTER_CONFIG['status_wait_sec']) or
+        the wait was interrupted; True when ready or the status is unknown.
+        """
+        self._wait_interrupt.clear()
+        status = self.get_status()
+        if status is None or status.ready:
+            return True
+
+        if timeout is None:
+            timeout = config.PRINTER_CONFIG.get('status_wait_sec', 300)
+        poll = config.PRINTER_CONFIG.get('status_poll_sec', 2.0)
+        deadline = time.monotonic() + timeout
+        log_event(f"Printer '{self.printer_name}' not ready ({status}); waiting", 'warning')
+        self._stored_form = None
+        self._notify_status(status)
+
+        while time.monotonic() < deadline:
+            if self._wait_interrupt.wait(poll):
+                return False
+            current = self.get_status()
+            if current is None:
+                continue  # No reply (e.g. printer restarting); keep waiting
+            if current.ready:
+                log_event(f"Printer '{self.printer_name}' ready again; resuming")
+                self._notify_status(current)
+                return True
+            if current != status:
+                status = current
+                log_event(f"Printer '{self.printer_name}' still not ready ({status})", 'warning')
+                self._notify_status(status)
+
+        log_event(f"Printer '{self.printer_name}' not ready after {timeout:g}s ({status})", 'error')
+        return False
+
+    def wait_until_printed(self, timeout: float = None) -> Optional[bool]:
+        """
+        After sending a chunk, wait for the printer to finish it. True once
+        it reports no error and is not printing, False if it reports an
+        error (e.g. paper ran out mid-chunk) or is still busy after timeout
+        seconds (PRINTER_CONFIG['print_confirm_sec']). None when the status
+        cannot be read: the chunk was only accepted by the spooler.
+        Printers whose status has no "printing" flag (ZPL, ESC/POS) count
+        as finished as soon as they report no error.
+        """
+        if not self.backend.supports_query:
+            return None
+        if timeout is None:
+            timeout = config.PRINTER_CONFIG.get('print_confirm_sec', 120)
+        poll = config.PRINTER_CONFIG.get('print_confirm_poll_sec', 0.25)
+        deadline = time.monotonic() + timeout
+        answered = False  # A printer that answered once may miss a reply while busy
+        while True:
+            status = self.get_status()
+            if status is None and not answered:
+                return None  # Printer does not answer status requests: spooled only
+            if status is not None:
+                answered = True
+                if not status.ready:
+                    log_event(f"Printer '{self.printer_name}' reported {status} while printing", 'error')
+                    self._notify_status(status)
+                    return False
+                if not status.printing:
+                    return True
+            if time.monotonic() >= deadline:
+                break
+            if self._wait_interrupt.wait(poll):
+                return False  # Paused or cancelled: a resume sends this chunk again
+        log_event(f"Printer '{self.printer_name}' did not finish the chunk within {timeout:g}s", 'error')
+        return False
+
     def print_image(self, image: Image, job_name: str = "Barcode Label") -> bool:
         """Print a single image to the thermal printer"""
         return self.print_images([image], job_name)
 
+    # GetDeviceCaps indices
+    HORZRES = 8
+    VERTRES = 10
+    LOGPIXELSX = 88
+    LOGPIXELSY = 90
+
     def print_images(self, images: list, job_name: str = "Barcode Batch", 
                     x_offset: int = 0, y_offset: int = 0) -> bool:
         """Print multiple images in a single print job (one image per page)"""
+        images = list(images)
+        return self._print_gdi(lambda dpi: images, job_name, x_offset, y_offset) == len(images)
+
+    def print_labels(self, students: list, label_renderer, job_name: str = "Barcode Batch",
+                     x_offset: int = 0, y_offset: int = 0) -> int:
+        """
+        Print students through GDI with labels rendered at the printer's own
+        resolution: label_renderer(student, dpi) is called once the device
+        DPI is known, so pages are drawn 1:1 without any scaling.
+        Returns the number of pages printed, always a prefix of `students`.
+        """
+        import raster
+        return self._print_gdi(
+            lambda dpi: (raster.to_monochrome(label_renderer(s, dpi)) for s in students),
+            job_name, x_offset, y_offset
+        )
+
+    def _print_gdi(self, make_pages, job_name: str, x_offset: int = 0, y_offset: int = 0) -> int:
+        """
+        Run one GDI print job. make_pages(dpi) yields the page images; the
+        device DPI and printable area are read once per job and DIB buffers
+        are reused between pages of the same size. Returns pages printed.
+        """
         try:
+            if self.backend.name != 'win32':
+                log_event(f"Image printing requires the Windows spooler backend, not '{self.backend.name}'", 'error')
+                return 0
+
+            # GDI printing is Windows-only; imported here so raw printing works anywhere
+            import win32ui
+            from PIL import ImageWin
+
             if not self.is_printer_available():
                 log_event(f"Printer '{self.printer_name}' is not available", 'error')
-                return False
-            
-            log_event(f"Starting print job '{job_name}' with {len(images)} pages...")
+                return 0
             
             # Create device context for printer
             hdc = win32ui.CreateDC()
             hdc.CreatePrinterDC(self.printer_name)
             
-            # Get printer dimensions
-            printable_width = hdc.GetDeviceCaps(8)   # HORZRES  
-            printable_height = hdc.GetDeviceCaps(10) # VERTRES
+            # Device resolution and printable area, once per job
+            dpi = hdc.GetDeviceCaps(self.LOGPIXELSX)
+            if hdc.GetDeviceCaps(self.LOGPIXELSY) != dpi:
+                log_event(f"Printer DPI differs by axis; rendering at {dpi} DPI", 'warning')
+            printable_width = hdc.GetDeviceCaps(self.HORZRES)
+            printable_height = hdc.GetDeviceCaps(self.VERTRES)
+            log_event(f"Starting print job '{job_name}' at {dpi} DPI, "
+                      f"printable area {printable_width}x{printable_height}")
             
             # Start print job
             hdc.StartDoc(job_name)
+            handle = hdc.GetHandleOutput()
+            dibs = {}  # (mode, size) -> reusable DIB
+            printed = 0
             
-            for i, image in enumerate(images):
-                try:
-                    hdc.StartPage()
-                    
-                    # Convert to RGB if necessary
-                    if image.mode != 'RGB':
+            try:
+                for image in make_pages(dpi):
+                    if image.mode not in ('1', 'L', 'RGB'):
                         image = image.convert('RGB')
-                    
-                    # Get image dimensions
-                    img_width, img_height = image.size
-                    
-                    # Calculate scaling to fit printable area
-                    scale_x = printable_width / img_width
-                    scale_y = printable_height / img_height
-                    scale = min(scale_x, scale_y)
-                    
-                    # If scale is very close to 1 (e.g. > 0.9), just use 1 to avoid artifacts
-                    if scale > 0.9:
-                        scale = 1.0
-                    
-                    # Calculate destination size
-                    dest_width = int(img_width * scale)
-                    dest_height = int(img_height * scale)
+
+                    width, height = image.size
+                    if width > printable_width or height > printable_height:
+                        # Pre-rendered at another resolution: shrink once here rather than in the driver
+                        scale = min(printable_width / width, printable_height / height)
+                        width, height = int(width * scale), int(height * scale)
+                        image = image.resize((width, height), Image.Resampling.NEAREST)
                     
                     # Alignment Logic
-                    if printable_width > dest_width * 1.5:
+                    if printable_width > width * 1.5:
                         # Big paper, small label -> Center
-                        x = (printable_width - dest_width) // 2
+                        x = (printable_width - width) // 2
                     else:
                         # Label printer -> Align left (usually better for barcode scanners/labels)
                         x = 0
                         
-                    if printable_height > dest_height * 1.5:
-                         y = (printable_height - dest_height) // 2
+                    if printable_height > height * 1.5:
+                        y = (printable_height - height) // 2
                     else:
-                         y = 0
+                        y = 0
                     
-                    # Apply manual offsets (convert mm to pixels approx, but passed as pixels)
                     # Offsets are passed in pixels by the caller (main.py will convert mm->px)
                     x += x_offset
                     y += y_offset
                     
-                    log_event(f"Page {i+1}: {img_width}x{img_height} -> {dest_width}x{dest_height} at ({x},{y})")
-                    
-                    # Create DIB and draw to printer
-                    dib = ImageWin.Dib(image)
-                    dib.draw(hdc.GetHandleOutput(), (x, y, x + dest_width, y + dest_height))
-                    
+                    key = (image.mode, image.size)
+                    dib = dibs.get(key)
+                    if dib is None:
+                        dib = dibs[key] = ImageWin.Dib(image.mode, image.size)
+                    dib.paste(image)
+
+                    hdc.StartPage()
+                    dib.draw(handle, (x, y, x + width, y + height))
                     hdc.EndPage()
-                    
-                except Exception as e:
-                    log_event(f"Error printing page {i+1}: {e}", 'error')
-                    # Continue to next page? Or abort? Let's continue.
-            
-            # End print job
-            hdc.EndDoc()
-            hdc.DeleteDC()
+                    printed += 1
+            except Exception as e:
+                log_event(f"Error printing page {printed + 1}: {e}", 'error')
+            finally:
+                # End print job
+                hdc.EndDoc()
+                hdc.DeleteDC()
             
-            log_event(f"Print job '{job_name}' completed successfully")
-            return True
+            log_event(f"Print job '{job_name}' sent {printed} page(s)")
+            return printed
             
         except Exception as e:
             log_event(f"Print job error: {e}", 'error')
             import traceback
             log_event(traceback.format_exc(), 'error')
-            return False
+            return 0
     
     def print_test_page(self) -> bool:
         """Print a test page"""
@@ -172,71 +315,212 @@ class PrinterManager:
                 log_event(f"Printer '{self.printer_name}' not available for raw printing", 'error')
                 return False
             
-            hPrinter = win32print.OpenPrinter(self.printer_name)
-            try:
-                hJob = win32print.StartDocPrinter(hPrinter, 1, (job_name, None, "RAW"))
-                try:
-                    win32print.StartPagePrinter(hPrinter)
-                    win32print.WritePrinter(hPrinter, data)
-                    win32print.EndPagePrinter(hPrinter)
-                finally:
-                    win32print.EndDocPrinter(hPrinter)
-            finally:
-                win32print.ClosePrinter(hPrinter)
+            written = self.backend.send(self.printer_name, data, job_name)
+            if written != len(data):
+                log_event(f"Printer accepted {written} of {len(data)} bytes", 'error')
+                return False
                 
-            log_event(f"Sent {len(data)} bytes of raw data to printer")
+            log_event(f"Sent {len(data)} bytes of raw data to printer", 'debug')
             return True
         except Exception as e:
             log_event(f"Error sending raw data: {e}", 'error')
+            # The printer may have gone away; re-enumerate in the background
+            self.registry.invalidate()
             return False
 
-    def print_tspl_data(self, students: list) -> bool:
+    def close(self):
+        """Close the printer transport"""
+        self.interrupt_wait()
+        self.registry.stop()
+        self.backend.close()
+
+    def label_template(self, use_template: bool = False):
         """
-        Generate and print TSPL commands for a list of students.
-        Each student dict must have: StudentID, SeatNo, VenueName
+        Compiled exam label for the configured command language
+        (PRINTER_CONFIG['command_language']), built once per manager.
+        """
+        key = (self.language, bool(use_template))
+        if key not in self._templates:
+            self._templates[key] = label_template.compile_label(
+                label_template.exam_label_layout(), self.language, use_template
+            )
+        return self._templates[key]
+
+    def _label_row(self, student: dict) -> tuple:
+        """Field values printed on a student's label, in the exam layout's field order"""
+        barcode_val = student.get('Barcode')  # Use Barcode field if avail, else SID
+        if barcode_val is None:
+            barcode_val = student.get('StudentID', 'UNKNOWN')
+        return barcode_val, student.get('VenueName', '')
+
+    def build_tspl_preamble(self, use_template: bool = False) -> bytes:
+        """
+        Commands that start a job. With use_template the label layout is
+        stored in printer memory here; later chunks to the same printer only
+        send the template's header.
+        """
+        return self.label_template(use_template).preamble
+
+    def build_tspl_label(self, student: dict, use_template: bool = False) -> bytes:
+        """Commands that print a single student's label"""
+        return self.label_template(use_template).render_row(self._label_row(student))
+
+    def build_tspl_commands(self, students: list, use_template: bool = False) -> bytes:
+        """
+        Build the TSPL byte stream for a list of students.
+        With use_template the layout is downloaded to printer memory once
+        and each label only sends its variable values.
+        """
+        template = self.label_template(use_template)
+        return template.preamble + template.render_rows(map(self._label_row, students))
+
+    def _stream_chunks(self, items: list, preamble: bytes, build_labels,
+                       chunk_size: int = None, progress_callback=None,
+                       job_name: str = "Raw Batch", header: bytes = None) -> int:
         """
+        Send items in chunks of chunk_size labels, each chunk a raw job
+        (preamble + build_labels(chunk_items)). When the preamble stores a
+        form and header is given, chunks after the first send header in its
+        place; the form is sent again after any stop, printer error, pause
+        or failed send, so a resumed chunk never relies on a lost form.
+        Returns the number of items confirmed, always a prefix of `items`.
+
+        A chunk is confirmed once the printer reports it finished without
+        an error, where the backend can read printer status (raw socket).
+        On the Windows spooler, CUPS and file backends the printer cannot be
+        asked, so "confirmed" only means spooled: the spooler accepted the
+        bytes, and labels lost to a paper-out there are not detected.
+        """
+        if not chunk_size or chunk_size < 1:
+            chunk_size = config.PRINTER_CONFIG.get('tspl_chunk_labels', 25)
+
+        total = len(items)
+        confirmed = 0
+        verified = self.backend.supports_query
+        form = (self.printer_name, preamble)
+        for start in range(0, total, chunk_size):
+            end = min(start + chunk_size, total)
+            # Pre-flight before the first chunk and a poll before each later one,
+            # so a stalled printer never gets more labels queued
+            if not self.wait_until_ready():
+                log_event(f"Print stream held at label {start + 1} of {total}: printer not ready", 'error')
+                break
+
+            try:
+                labels = build_labels(items[start:end])
+            except Exception as e:
+                log_event(f"Error generating printer data for labels {start + 1}-{end}: {e}", 'error')
+                break
+
+            stored = header is not None and self._stored_form == form
+            chunk = (header if stored else preamble) + labels
+            if not self.send_raw_data(chunk, f"{job_name} [{start + 1}-{end}]"):
+                self._stored_form = None
+                log_event(f"Print stream stopped at label {start + 1} of {total}", 'error')
+                break
+            self._stored_form = form
+
+            printed = self.wait_until_printed()
+            if printed is False:
+                self._stored_form = None
+                # Resume from this chunk: reprinting a few labels beats skipping some
+                log_event(f"Labels {start + 1}-{end} of {total} not confirmed by the printer", 'error')
+                break
+            if printed is None:
+                verified = False
+
+            confirmed = end
+            if progress_callback:
+                progress_callback(range(start, end))
+
+        log_event(f"Print stream {'confirmed' if verified else 'spooled'} {confirmed}/{total} labels")
+        return confirmed
+
+    def stream_tspl_data(self, students: list, use_template: bool = None,
+                         chunk_size: int = None, progress_callback=None,
+                         job_name: str = None) -> int:
+        """
+        Send label commands for a list of students in chunks of chunk_size
+        labels, in PRINTER_CONFIG['command_language'] (TSPL by default).
+        Each chunk is a raw job of its own, so a batch interrupted by
+        paper-out or a cable pull can be resumed from the first unconfirmed
+        label without reprinting finished ones. With use_template the form
+        is downloaded with the first chunk (and again on resume) and later
+        chunks only send the label header; see _stream_chunks.
+
+        progress_callback(indices) is called with the range of student
+        indices confirmed by each chunk. Returns the number of labels
+        confirmed, always a prefix of `students` (printed where the printer
+        status can be read, otherwise spooled; see _stream_chunks).
+        """
+        if use_template is None:
+            use_template = config.PRINTER_CONFIG.get('tspl_use_template', False)
+        if job_name is None:
+            job_name = f"TSPL Batch ({len(students)})"
+
         try:
-            # TSPL Configuration for 60mm x 40mm
-            # 8 dots/mm -> 480 dots width, 320 dots height
-            cmds = [
-                "SIZE 60 mm, 40 mm",
-                "GAP 2 mm, 0 mm",
-                "DIRECTION 1",
-                "CLS"
-            ]
-            
-            for student in students:
-                sid = student.get('StudentID', 'UNKNOWN')
-                barcode_val = student.get('Barcode', sid) # Use Barcode field if avail, else SID
-                seat = student.get('SeatNo', '')
-                hall = student.get('VenueName', '')
-                
-                # Clean up hall name if necessary
-                hall = str(hall).replace('"', '\"')
-                
-                # Barcode: Code 128, Height 100, centered
-                # Human Readable = 2 (Below, Centered) or 1 (Below, Left). 
-                # Let's use 1 (standard) or 2 if supported. Safe bet is 1 or manually provided.
-                # User asked to "show the Barcode". 
-                # Enabling native text: BARCODE X, Y, "128", Height, HumanReadable=1, ...
-                cmd = f'BARCODE 30,30,"128",100,1,0,2,2,"{barcode_val}"'
-                cmds.append(cmd)
-                
-                # Hall Name (Bottom)
-                # Removed Seat Number as requested
-                # Font "3" (Standard alphanumeric)
-                cmd = f'TEXT 30,150,"3",0,1,1,"{hall}"'
-                cmds.append(cmd)
-                
-                # Print 1 Label
-                cmds.append("PRINT 1")
-                cmds.append("CLS") # Clear buffer for next label
-            
-            # Join with newlines and encode
-            tspl_command = "\n".join(cmds).encode('utf-8')
-            
-            return self.send_raw_data(tspl_command, f"TSPL Batch ({len(students)})")
-            
+            template = self.label_template(use_template)
         except Exception as e:
             log_event(f"Error generating TSPL data: {e}", 'error')
-            return False
+            return 0
+
+        return self._stream_chunks(
+            students, template.preamble,
+            lambda chunk: template.render_rows(map(self._label_row, chunk)),
+            chunk_size, progress_callback, job_name, header=template.header
+        )
+
+    def build_bitmap_label(self, image: Image.Image) -> bytes:
+        """TSPL commands printing one pre-rendered label as a 1-bit BITMAP"""
+        import raster
+        return raster.tspl_bitmap_command(image) + b"PRINT 1\nCLS\n"
+
+    def stream_bitmap_data(self, images: list, chunk_size: int = None,
+                           progress_callback=None, job_name: str = None) -> int:
+        """
+        Print pre-rendered label images as TSPL BITMAP commands, so any
+        layout prints exactly as previewed without driver rasterization.
+        Chunking, progress and the return value match stream_tspl_data.
+        """
+        if job_name is None:
+            job_name = f"TSPL Bitmap Batch ({len(images)})"
+
+        width_mm = height_mm = None
+        if images:
+            # SIZE must match the bitmaps, which are rendered at the label size
+            # from Settings rather than the configured card size
+            dpi = config.PRINTER_CONFIG['dpi']
+            width_mm, height_mm = (pixels_to_mm(px, dpi) for px in images[0].size)
+        layout = label_template.exam_label_layout(width_mm, height_mm)
+        preamble = label_template.compile_tspl(layout).preamble
+        return self._stream_chunks(
+            images, preamble, lambda chunk: b"".join(map(self.build_bitmap_label, chunk)),
+            chunk_size, progress_callback, job_name
+        )
+
+    def print_batch(self, students: list, mode: str = 'tspl', use_template: bool = None,
+                    label_renderer=None, chunk_size: int = None, job_name: str = None) -> int:
+        """
+        Print students with a print mode: 'tspl' (printer fonts), 'bitmap'
+        (label_renderer(student) images as TSPL BITMAP) or 'gdi'
+        (label_renderer(student, dpi) through the Windows driver).
+        Returns the number of labels confirmed, always a prefix.
+        """
+        if mode == 'bitmap':
+            return self.stream_bitmap_data(
+                [label_renderer(s) for s in students], chunk_size=chunk_size, job_name=job_name
+            )
+        if mode == 'gdi':
+            return self.print_labels(students, label_renderer, job_name or f"Barcode Batch ({len(students)})")
+        return self.stream_tspl_data(
+            students, use_template=use_template, chunk_size=chunk_size, job_name=job_name
+        )
+
+    def print_tspl_data(self, students: list, use_template: bool = None,
+                        chunk_size: int = None) -> bool:
+        """
+        Generate and print TSPL commands for a list of students.
+        Each student dict must have: StudentID, SeatNo, VenueName
+        use_template defaults to PRINTER_CONFIG['tspl_use_template'].
+        """
+        return self.stream_tspl_data(students, use_template, chunk_size) == len(students)
@@ -0,0 +1,307 @@
+"""
+Raw print transports used by PrinterManager.send_raw_data
+Each backend moves already-encoded printer commands (TSPL, etc.) to a device:
+the Windows spooler, a raw TCP socket (port 9100), a CUPS raw queue, or a
+file/null sink for testing and benchmarks.
+"""
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from utils import log_event
+
+
+class PrinterBackend(ABC):
+    """Base class for raw print transports; subclasses implement send()"""
+
+    name = 'base'
+
+    # Backends that drive a single fixed target (socket, file) report it here
+    # so PrinterManager does not try to match a Windows printer name.
+    default_printer_name: Optional[str] = None
+
+    def list_printers(self) -> list:
+        """Names of printers reachable through this backend"""
+        return []
+
+    def get_default_printer(self) -> Optional[str]:
+        """System default printer, if the backend has such a concept"""
+        return None
+
+    @abstractmethod
+    def send(self, printer_name: str, data: bytes, job_name: str) -> int:
+        """Send raw bytes as one job; return the number of bytes accepted"""
+
+    supports_query = False
+
+    def query(self, printer_name: str, data: bytes, size: int = 1,
+              complete: Callable = None, timeout: float = 2.0) -> Optional[bytes]:
+        """
+        Send a status request and read the reply: at least size bytes and,
+        if given, until complete(reply) is true. Returns None when the
+        transport cannot read from the printer or no reply arrived.
+        """
+        return None
+
+    def wait_for_change(self, timeout: float) -> Optional[bool]:
+        """
+        Block up to timeout seconds for a printer add/remove/change event.
+        Returns True on a change, False on timeout, or None if the backend
+        has no change notifications (callers then poll on a timer).
+        """
+        return None
+
+    def close(self):
+        """Release any persistent connection"""
+        pass
+
+
+class Win32SpoolerBackend(PrinterBackend):
+    """Windows print spooler in RAW mode (WritePrinter)"""
+
+    name = 'win32'
+
+    # PRINTER_CHANGE_PRINTER: printer added, deleted, changed or connection failed
+    PRINTER_CHANGE_PRINTER = 0x000000FF
+
+    def __init__(self):
+        import win32print
+        self._win32print = win32print
+        self._server = None
+        self._change_handle = None
+        self._notifications_supported = True
+
+    def list_printers(self) -> list:
+        return [printer[2] for printer in self._win32print.EnumPrinters(2)]
+
+    def wait_for_change(self, timeout: float) -> Optional[bool]:
+        if not self._notifications_supported:
+            return None
+        try:
+            import win32event
+            win32print = self._win32print
+            if self._change_handle is None:
+                # A handle to the local print server reports changes to any printer
+                self._server = win32print.OpenPrinter(None)
+                self._change_handle = win32print.FindFirstPrinterChangeNotification(
+                    self._server, self.PRINTER_CHANGE_PRINTER, 0, None
+                )
+            result = win32event.WaitForSingleObject(self._change_handle, int(timeout * 1000))
+            if result != win32event.WAIT_OBJECT_0:
+                return False
+            win32print.FindNextPrinterChangeNotification(self._change_handle, None)
+            return True
+        except Exception as e:
+            log_event(f"Printer change notifications unavailable: {e}", 'warning')
+            self._notifications_supported = False
+            self.close()
+            return None
+
+    def close(self):
+        if self._change_handle is not None:
+            try:
+                self._win32print.FindClosePrinterChangeNotification(self._change_handle)
+            except Exception:
+                pass
+            self._change_handle = None
+        if self._server is not None:
+            try:
+                self._win32print.ClosePrinter(self._server)
+            except Exception:
+                pass
+            self._server = None
+
+    def get_default_printer(self) -> Optional[str]:
+        return self._win32print.GetDefaultPrinter()
+
+    def send(self, printer_name: str, data: bytes, job_name: str) -> int:
+        win32print = self._win32print
+        hPrinter = win32print.OpenPrinter(printer_name)
+        try:
+            win32print.StartDocPrinter(hPrinter, 1, (job_name, None, "RAW"))
+            try:
+                win32print.StartPagePrinter(hPrinter)
+                written = win32print.WritePrinter(hPrinter, data)
+                win32print.EndPagePrinter(hPrinter)
+            finally:
+                win32print.EndDocPrinter(hPrinter)
+        finally:
+            win32print.ClosePrinter(hPrinter)
+        return written
+
+
+class RawSocketBackend(PrinterBackend):
+    """Raw TCP (JetDirect / port 9100) with a persistent connection"""
+
+    name = 'socket'
+
+    def __init__(self, host: str, port: int = 9100, timeout: float = 10.0):
+        self.host = host
+        self.port = int(port)
+        self.timeout = float(timeout)
+        self.default_printer_name = f"{host}:{self.port}"
+        self._sock = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> socket.socket:
+        if self._sock is None:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            log_event(f"Connected to printer at {self.default_printer_name}")
+        return self._sock
+
+    def _disconnect(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def list_printers(self) -> list:
+        with self._lock:
+            try:
+                self._connect()
+                return [self.default_printer_name]
+            except OSError as e:
+                log_event(f"Printer {self.default_printer_name} unreachable: {e}", 'warning')
+                self._disconnect()
+                return []
+
+    supports_query = True
+
+    def query(self, printer_name: str, data: bytes, size: int = 1,
+              complete: Callable = None, timeout: float = 2.0) -> Optional[bytes]:
+        with self._lock:
+            try:
+                sock = self._connect()
+                # Drop unsolicited bytes left from earlier replies
+                sock.setblocking(False)
+                try:
+                    while sock.recv(4096):
+                        pass
+                except (BlockingIOError, InterruptedError):
+                    pass
+                finally:
+                    sock.setblocking(True)
+
+                sock.settimeout(timeout)
+                sock.sendall(data)
+                reply = b""
+                while len(reply) < size or (complete and not complete(reply)):
+                    part = sock.recv(4096)
+                    if not part:
+                        raise ConnectionError("printer closed the connection")
+                    reply += part
+                return reply
+            except socket.timeout:
+                return None
+            except OSError as e:
+                log_event(f"Status query to {self.default_printer_name} failed: {e}", 'warning')
+                self._disconnect()
+                return None
+            finally:
+                if self._sock is not None:
+                    self._sock.settimeout(self.timeout)
+
+    def send(self, printer_name: str, data: bytes, job_name: str) -> int:
+        with self._lock:
+            # One reconnect attempt covers a connection the printer dropped while idle
+            for attempt in (1, 2):
+                try:
+                    self._connect().sendall(data)
+                    return len(data)
+                except OSError:
+                    self._disconnect()
+                    if attempt == 2:
+                        raise
+
+    def close(self):
+        with self._lock:
+            self._disconnect()
+
+
+class CupsBackend(PrinterBackend):
+    """CUPS queue fed through `lp -o raw`"""
+
+    name = 'cups'
+
+    def list_printers(self) -> list:
+        result = subprocess.run(['lpstat', '-e'], capture_output=True, text=True, timeout=10)
+        if result.returncode != 0:
+            raise OSError(result.stderr.strip() or "lpstat failed")
+        return [line.strip() for line in result.stdout.splitlines() if line.strip()]
+
+    def get_default_printer(self) -> Optional[str]:
+        result = subprocess.run(['lpstat', '-d'], capture_output=True, text=True, timeout=10)
+        # "system default destination: NAME"
+        if result.returncode == 0 and ':' in result.stdout:
+            return result.stdout.split(':', 1)[1].strip() or None
+        return None
+
+    def send(self, printer_name: str, data: bytes, job_name: str) -> int:
+        result = subprocess.run(
+            ['lp', '-d', printer_name, '-o', 'raw', '-t', job_name],
+            input=data, capture_output=True, timeout=60
+        )
+        if result.returncode != 0:
+            raise OSError(result.stderr.decode(errors='replace').strip() or "lp failed")
+        return len(data)
+
+
+class FileBackend(PrinterBackend):
+    """
+    Append jobs to a file, or discard them when path is None.
+    bytes_per_sec simulates a printer link of that throughput.
+    """
+
+    name = 'file'
+
+    def __init__(self, path: str = None, bytes_per_sec: float = None):
+        self.path = path
+        self.bytes_per_sec = float(bytes_per_sec) if bytes_per_sec else None
+        self.default_printer_name = path or 'null'
+        self.bytes_written = 0
+        self.jobs_written = 0
+        self._lock = threading.Lock()
+
+    def list_printers(self) -> list:
+        return [self.default_printer_name]
+
+    def send(self, printer_name: str, data: bytes, job_name: str) -> int:
+        with self._lock:
+            if self.path:
+                with open(self.path, 'ab') as f:
+                    f.write(data)
+            self.bytes_written += len(data)
+            self.jobs_written += 1
+        if self.bytes_per_sec:
+            time.sleep(len(data) / self.bytes_per_sec)
+        return len(data)
+
+
+BACKENDS = {
+    'win32': Win32SpoolerBackend,
+    'socket': RawSocketBackend,
+    'cups': CupsBackend,
+    'file': FileBackend,
+}
+
+
+def create_backend(kind: str = 'auto', **options) -> PrinterBackend:
+    """
+    Create a backend by name ('auto', 'win32', 'socket', 'cups', 'file').
+    'auto' picks the Windows spooler on Windows and CUPS elsewhere.
+    """
+    if kind == 'auto':
+        kind = 'win32' if sys.platform == 'win32' else 'cups'
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown printer backend '{kind}'")
+    if kind == 'file' and options.get('path'):
+        options['path'] = os.path.expanduser(options['path'])
+    return BACKENDS[kind](**options)
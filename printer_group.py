@@ -0,0 +1,211 @@
+"""
+Multi-printer dispatch for the Barcode Printer Application
+Splits one batch across several printers (by venue or in round-robin
+chunks), runs one sender thread per printer, and moves a failed printer's
+remaining labels to the printers that are still online.
+"""
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, List, Optional
+
+import config
+from printer import PrinterManager
+from printer_backends import create_backend
+from printer_registry import PrinterRegistry
+from utils import log_event
+
+
+class PrinterGroup:
+    """A set of printers that share one batch"""
+
+    def __init__(self, printers: List[PrinterManager]):
+        self.printers = printers
+        self.stats = {}
+
+    @classmethod
+    def from_config(cls, entries: list = None) -> Optional['PrinterGroup']:
+        """
+        Build a group from PRINTER_CONFIG['printer_group'].
+        Entries are printer names on the default backend, or dicts of
+        create_backend() options (e.g. {'backend': 'socket', 'host': ...}).
+        Returns None when fewer than two printers are configured.
+        """
+        if entries is None:
+            entries = config.PRINTER_CONFIG.get('printer_group', [])
+        if len(entries) < 2:
+            return None
+
+        shared_backend = None
+        shared_registry = None
+        printers = []
+        for entry in entries:
+            if isinstance(entry, dict):
+                options = dict(entry)
+                kind = options.pop('backend', 'socket')
+                printers.append(PrinterManager(backend=create_backend(kind, **options)))
+                continue
+            if shared_backend is None:
+                shared_backend = create_backend(
+                    config.PRINTER_CONFIG.get('backend', 'auto'),
+                    **config.PRINTER_CONFIG.get('backend_options', {})
+                )
+                shared_registry = PrinterRegistry(shared_backend)
+            printers.append(PrinterManager(shared_backend, entry, shared_registry))
+        return cls(printers)
+
+    @property
+    def names(self) -> List[str]:
+        """Printer names, numbered when the same name appears twice"""
+        names = [p.printer_name for p in self.printers]
+        return [f"{name} #{n + 1}" if names.count(name) > 1 else name for n, name in enumerate(names)]
+
+    def start_discovery(self):
+        """Start background discovery for every distinct registry in the group"""
+        for registry in {id(p.registry): p.registry for p in self.printers}.values():
+            registry.start()
+
+    def close(self):
+        for printer in self.printers:
+            printer.close()
+
+    # -- splitting --------------------------------------------------------
+
+    def _split(self, students: list, split: str, chunk_size: int) -> List[deque]:
+        """Per-printer queues of chunks (lists of student indices)"""
+        queues = [deque() for _ in self.printers]
+
+        if split == 'venue':
+            venues = OrderedDict()
+            for i, student in enumerate(students):
+                venues.setdefault(student.get('VenueName', ''), []).append(i)
+            # Largest venues first, each to the least-loaded printer
+            load = [0] * len(self.printers)
+            for indices in sorted(venues.values(), key=len, reverse=True):
+                target = load.index(min(load))
+                load[target] += len(indices)
+                for start in range(0, len(indices), chunk_size):
+                    queues[target].append(indices[start:start + chunk_size])
+        else:
+            for n, start in enumerate(range(0, len(students), chunk_size)):
+                chunk = list(range(start, min(start + chunk_size, len(students))))
+                queues[n % len(self.printers)].append(chunk)
+
+        return queues
+
+    # -- dispatch ---------------------------------------------------------
+
+    def dispatch(self, students: list, split: str = None, chunk_size: int = None,
+                 mode: str = 'tspl', use_template: bool = None,
+                 label_renderer: Callable = None, progress_callback: Callable = None,
+                 should_stop: Callable = None, job_name: str = "Group Batch") -> dict:
+        """
+        Print students across all printers in parallel.
+
+        progress_callback(indices, printer_name) is called from sender threads
+        with the student indices each confirmed chunk covered. should_stop()
+        is checked before every chunk. Returns {'printed': [...],
+        'unprinted': [...], 'printers': {name: {...}}}.
+        """
+        if split is None:
+            split = config.PRINTER_CONFIG.get('printer_group_split', 'round_robin')
+        if not chunk_size or chunk_size < 1:
+            chunk_size = config.PRINTER_CONFIG.get('tspl_chunk_labels', 25)
+
+        queues = self._split(students, split, chunk_size)
+        orphans = deque()  # chunks left behind by printers that went offline
+        lock = threading.Condition()
+        printed = []
+        in_flight = [0]  # senders holding a chunk that may still fail over
+        names = self.names
+        self.stats = OrderedDict(
+            (name, {'assigned': sum(len(c) for c in q), 'printed': 0, 'status': 'printing'})
+            for name, q in zip(names, queues)
+        )
+
+        def next_chunk(n: int):
+            """Next chunk for printer n; waits while another printer could still fail over"""
+            with lock:
+                while True:
+                    chunk = None
+                    if queues[n]:
+                        chunk = queues[n].popleft()
+                    elif orphans:
+                        chunk = orphans.popleft()
+                    elif split != 'venue':
+                        # Round-robin work is interchangeable: help the busiest printer
+                        busiest = max(range(len(queues)), key=lambda k: len(queues[k]))
+                        if queues[busiest]:
+                            chunk = queues[busiest].pop()
+                    if chunk is not None:
+                        in_flight[0] += 1
+                        return chunk
+                    # Other printers' queued or in-flight chunks may still fail over
+                    if not (in_flight[0] or any(queues)) or (should_stop and should_stop()):
+                        return None
+                    lock.wait(0.5)
+
+        def send(printer: PrinterManager, chunk: list, printer_label: str) -> int:
+            batch = [students[i] for i in chunk]
+            name = f"{job_name} ({printer_label})"
+            return printer.print_batch(
+                batch, mode=mode, use_template=use_template, label_renderer=label_renderer,
+                chunk_size=len(batch), job_name=name
+            )
+
+        def sender(n: int):
+            printer = self.printers[n]
+            stats = self.stats[names[n]]
+            while True:
+                if should_stop and should_stop():
+                    stats['status'] = 'stopped'
+                    return
+                chunk = next_chunk(n)
+                if chunk is None:
+                    stats['status'] = 'done'
+                    return
+
+                try:
+                    confirmed = send(printer, chunk, names[n])
+                except Exception as e:
+                    log_event(f"Printer {names[n]} error: {e}", 'error')
+                    confirmed = 0
+
+                if confirmed and progress_callback:
+                    progress_callback(chunk[:confirmed], names[n])
+
+                with lock:
+                    in_flight[0] -= 1
+                    printed.extend(chunk[:confirmed])
+                    stats['printed'] += confirmed
+                    if confirmed < len(chunk):
+                        # Printer went offline: hand its remaining work to the others
+                        stats['status'] = 'offline'
+                        leftover = [chunk[confirmed:]] + list(queues[n])
+                        queues[n].clear()
+                        # With no printer left online these stay unprinted
+                        orphans.extend(leftover)
+                    lock.notify_all()
+
+                if confirmed < len(chunk):
+                    log_event(
+                        f"Printer {names[n]} offline; moved "
+                        f"{sum(len(c) for c in leftover)} labels to other printers", 'warning'
+                    )
+                    return
+
+        threads = [
+            threading.Thread(target=sender, args=(n,), name=f"PrinterGroup-{n}", daemon=True)
+            for n in range(len(self.printers))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        printed_set = set(printed)
+        unprinted = [i for i in range(len(students)) if i not in printed_set]
+        log_event(
+            f"Group dispatch printed {len(printed)}/{len(students)} labels on "
+            + ", ".join(f"{name}: {s['printed']} ({s['status']})" for name, s in self.stats.items())
+        )
+        return {'printed': sorted(printed), 'unprinted': unprinted, 'printers': dict(self.stats)}
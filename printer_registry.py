@@ -0,0 +1,134 @@
+"""
+Cached printer discovery for the Barcode Printer Application
+Enumerating printers (EnumPrinters, lpstat, a socket connect) can take
+seconds on machines with many network queues, so the registry does it once,
+caches the resolved printer name, and refreshes in the background on a timer
+or when the backend reports a printer change.
+"""
+import threading
+import time
+from typing import Callable, List, Optional
+
+import config
+from utils import log_event
+
+
+class PrinterRegistry:
+    """Background-refreshed cache of the printers a backend can reach"""
+
+    def __init__(self, backend, refresh_interval: float = None):
+        self.backend = backend
+        if refresh_interval is None:
+            refresh_interval = config.PRINTER_CONFIG.get('discovery_refresh_sec', 60)
+        self.refresh_interval = refresh_interval
+        self._printers: List[str] = []
+        self._resolved = {}  # requested name -> matched printer name
+        self._listeners: List[Callable] = []
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    @property
+    def printers(self) -> List[str]:
+        """Cached printer list (enumerates once if never loaded)"""
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._printers)
+
+    def add_listener(self, callback: Callable):
+        """Register callback(printers) called after a refresh changes the list"""
+        self._listeners.append(callback)
+
+    def refresh(self) -> List[str]:
+        """Enumerate printers now and update the cache"""
+        try:
+            printers = self.backend.list_printers()
+        except Exception as e:
+            log_event(f"Error getting printer list: {e}", 'error')
+            printers = []
+
+        with self._lock:
+            changed = printers != self._printers or not self._loaded.is_set()
+            self._printers = printers
+            if changed:
+                self._resolved = {}
+        self._loaded.set()
+
+        if changed:
+            log_event(f"Found {len(printers)} available printers")
+            for callback in list(self._listeners):
+                try:
+                    callback(list(printers))
+                except Exception as e:
+                    log_event(f"Printer registry listener error: {e}", 'error')
+        return printers
+
+    def invalidate(self):
+        """Ask the background thread to re-enumerate (e.g. after a send failure)"""
+        if self._thread and self._thread.is_alive():
+            self._wake.set()
+        else:
+            self.refresh()
+
+    def resolve(self, printer_name: str) -> Optional[str]:
+        """Return the exact name of a cached printer matching printer_name"""
+        self._ensure_loaded()
+        with self._lock:
+            if printer_name in self._resolved:
+                return self._resolved[printer_name]
+
+            # Try exact match first, then case-insensitive partial match
+            match = None
+            if printer_name in self._printers:
+                match = printer_name
+            else:
+                for printer in self._printers:
+                    if printer_name.lower() in printer.lower():
+                        match = printer
+                        break
+
+            if match:
+                self._resolved[printer_name] = match
+            return match
+
+    def _ensure_loaded(self, timeout: float = 10.0):
+        if self._loaded.is_set():
+            return
+        if self._thread and self._thread.is_alive():
+            # Background enumeration already under way; wait for it
+            self._loaded.wait(timeout)
+        else:
+            self.refresh()
+
+    # -- background refresh ------------------------------------------------
+
+    def start(self):
+        """Enumerate in the background, then keep the cache fresh"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="PrinterRegistry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
+    def _run(self):
+        self.refresh()
+        last_refresh = time.monotonic()
+        while not self._stopping:
+            # Short waits keep invalidate() and stop() responsive
+            changed = self.backend.wait_for_change(1.0)
+            if changed is None:
+                # Backend has no change notifications; rely on the timer
+                self._wake.wait(1.0)
+
+            due = time.monotonic() - last_refresh >= self.refresh_interval
+            if changed or due or self._wake.is_set():
+                self._wake.clear()
+                if not self._stopping:
+                    self.refresh()
+                    last_refresh = time.monotonic()
@@ -0,0 +1,123 @@
+"""
+Printer status queries for the Barcode Printer Application
+Status requests and reply decoding for TSPL (<ESC>!?), ZPL (~HS) and
+ESC/POS (DLE EOT). Only transports that can read replies (raw socket)
+support them; elsewhere the status is unknown and printing runs blind.
+"""
+from typing import List, Optional
+
+
+class PrinterStatus:
+    """Decoded printer status; ready when no error condition is set"""
+
+    def __init__(self, errors: List[str] = None, printing: bool = False, raw: bytes = b""):
+        self.errors = errors or []
+        self.printing = printing
+        self.raw = raw
+
+    @property
+    def ready(self) -> bool:
+        return not self.errors
+
+    def __str__(self):
+        if self.errors:
+            return ", ".join(self.errors)
+        return "printing" if self.printing else "ready"
+
+    def __eq__(self, other):
+        return isinstance(other, PrinterStatus) and self.errors == other.errors
+
+    def __hash__(self):
+        return hash(tuple(self.errors))
+
+
+# -- TSPL -------------------------------------------------------------------
+
+TSPL_STATUS_QUERY = b"\x1b!?"
+
+# <ESC>!? reply bits (bit 5 "printing" is not an error)
+TSPL_STATUS_BITS = [
+    (0x01, "head open"),
+    (0x02, "paper jam"),
+    (0x04, "out of paper"),
+    (0x08, "out of ribbon"),
+    (0x10, "paused"),
+    (0x40, "cover open"),
+    (0x80, "printer error"),
+]
+
+
+def decode_tspl(reply: bytes) -> PrinterStatus:
+    value = reply[0]
+    errors = [name for bit, name in TSPL_STATUS_BITS if value & bit]
+    return PrinterStatus(errors, printing=bool(value & 0x20), raw=reply)
+
+
+# -- ZPL --------------------------------------------------------------------
+
+ZPL_STATUS_QUERY = b"~HS"
+
+
+def zpl_reply_complete(reply: bytes) -> bool:
+    # ~HS answers with three <STX>...<ETX> strings
+    return reply.count(b"\x03") >= 3
+
+
+def decode_zpl(reply: bytes) -> PrinterStatus:
+    strings = [s.strip(b"\x02\r\n").decode('ascii', errors='replace').split(',')
+               for s in reply.split(b"\x03") if s.strip()]
+    errors = []
+    if len(strings) >= 1 and len(strings[0]) >= 3:
+        if strings[0][1] == '1':
+            errors.append("out of paper")
+        if strings[0][2] == '1':
+            errors.append("paused")
+    if len(strings) >= 2 and len(strings[1]) >= 4:
+        if strings[1][2] == '1':
+            errors.append("head open")
+        if strings[1][3] == '1':
+            errors.append("out of ribbon")
+    return PrinterStatus(errors, raw=reply)
+
+
+# -- ESC/POS ----------------------------------------------------------------
+
+# DLE EOT 2 (offline cause) then DLE EOT 4 (roll paper sensor)
+ESCPOS_STATUS_QUERY = b"\x10\x04\x02\x10\x04\x04"
+
+
+def decode_escpos(reply: bytes) -> PrinterStatus:
+    offline, paper = reply[0], reply[1]
+    errors = []
+    if offline & 0x04:
+        errors.append("cover open")
+    if offline & 0x20:
+        errors.append("out of paper")
+    if offline & 0x40:
+        errors.append("printer error")
+    if paper & 0x60 and "out of paper" not in errors:
+        errors.append("out of paper")
+    return PrinterStatus(errors, raw=reply)
+
+
+# language -> (request, minimum reply size, completion test, decoder)
+STATUS_QUERIES = {
+    'tspl': (TSPL_STATUS_QUERY, 1, None, decode_tspl),
+    'zpl': (ZPL_STATUS_QUERY, 1, zpl_reply_complete, decode_zpl),
+    'escpos': (ESCPOS_STATUS_QUERY, 2, None, decode_escpos),
+}
+
+
+def query_status(backend, printer_name: str, language: str = 'tspl',
+                 timeout: float = 2.0) -> Optional[PrinterStatus]:
+    """
+    Ask the printer for its status. Returns None when the backend cannot
+    read replies or the printer did not answer in time.
+    """
+    if language not in STATUS_QUERIES:
+        return None
+    request, size, complete, decode = STATUS_QUERIES[language]
+    reply = backend.query(printer_name, request, size, complete, timeout)
+    if not reply or len(reply) < size:
+        return None
+    return decode(reply)
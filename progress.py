@@ -0,0 +1,141 @@
+"""
+Progress reporting for bulk operations in the Barcode Printer Application
+Workers only bump counters on a ProgressTracker (no Tk calls, no logging);
+a ProgressBar polls the active tracker at a fixed frame rate, so the UI
+cost of a batch is per frame rather than per label.
+"""
+import threading
+import time
+import tkinter as tk
+from typing import Callable, List, Optional
+
+import ttkbootstrap as ttk
+
+import config
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
+
+
+class ProgressTracker:
+    """Thread-safe progress counters for one batch"""
+
+    def __init__(self, name: str, total: int, done: int = 0):
+        self.name = name
+        self.total = total
+        self.done = done
+        self.failed = 0
+        self.finished = False
+        self.started = time.monotonic()
+        self.ended = None
+        self._start_done = done  # resumed jobs: rate counts only this session
+        self._lock = threading.Lock()
+
+    def advance(self, count: int = 1, failed: int = 0):
+        """Record count items processed, failed of them unsuccessfully"""
+        with self._lock:
+            self.done += count
+            self.failed += failed
+
+    def finish(self):
+        with self._lock:
+            self.finished = True
+            self.ended = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return (self.ended or time.monotonic()) - self.started
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.done / self.total) if self.total else 1.0
+
+    def eta(self) -> Optional[float]:
+        """Seconds left at the rate so far, or None before there is a rate"""
+        progressed = self.done - self._start_done
+        if progressed <= 0 or self.finished:
+            return None
+        rate = progressed / max(self.elapsed, 1e-6)
+        return max(0, self.total - self.done) / rate
+
+    def describe(self) -> str:
+        text = f"{self.name}: {self.done}/{self.total}"
+        if self.finished:
+            return f"{text} in {format_duration(self.elapsed)}"
+        eta = self.eta()
+        if eta is not None:
+            text += f" - {format_duration(eta)} left"
+        return text
+
+    def summary(self) -> str:
+        """One line for the activity log when the batch ends"""
+        succeeded = self.done - self.failed
+        elapsed = self.elapsed
+        text = f"{self.name}: {succeeded}/{self.total} in {format_duration(elapsed)}"
+        if elapsed > 0 and self.done > self._start_done:
+            text += f" ({(self.done - self._start_done) / elapsed:.1f}/s)"
+        if self.failed:
+            text += f", {self.failed} failed"
+        return text
+
+
+class ProgressBar(ttk.Frame):
+    """
+    Progress bar with a caption and ETA for the most recent running
+    tracker. Redraws at most progress_fps times a second while a tracker
+    is running and stops polling once all are finished.
+    """
+
+    def __init__(self, master, fps: int = None, **kwargs):
+        super().__init__(master, **kwargs)
+        fps = fps or config.APP_SETTINGS.get('progress_fps', 10)
+        self.interval = max(1, int(1000 / fps))
+        self._trackers: List[ProgressTracker] = []
+        self._on_finish = {}
+        self._polling = False
+        self._shown = None
+
+        self.bar = ttk.Progressbar(self, maximum=1.0, bootstyle="success-striped")
+        self.bar.pack(fill=tk.X)
+        self.label = ttk.Label(self, text="", font=('Segoe UI', 8), foreground="gray")
+        self.label.pack(anchor=tk.W)
+
+    def track(self, tracker: ProgressTracker, on_finish: Callable = None):
+        """
+        Show a tracker (UI thread). on_finish(tracker) is called once, on
+        the UI thread, on the first frame after tracker.finish().
+        """
+        self._trackers.append(tracker)
+        if on_finish:
+            self._on_finish[id(tracker)] = on_finish
+        if not self._polling:
+            self._polling = True
+            self._tick()
+
+    def _tick(self):
+        if not self.winfo_exists():
+            return
+        for tracker in [t for t in self._trackers if t.finished]:
+            self._trackers.remove(tracker)
+            callback = self._on_finish.pop(id(tracker), None)
+            if callback:
+                callback(tracker)
+            self._shown = tracker
+
+        tracker = self._trackers[-1] if self._trackers else self._shown
+        if tracker is not None:
+            self.bar.configure(value=tracker.fraction)
+            self.label.configure(text=tracker.describe())
+
+        if self._trackers:
+            self.after(self.interval, self._tick)
+        else:
+            self._polling = False
@@ -0,0 +1,40 @@
+"""
+1-bit raster helpers for printing generated labels as TSPL bitmaps
+"""
+import numpy as np
+from PIL import Image
+
+
+def to_monochrome(image: Image.Image, threshold: int = 128) -> Image.Image:
+    """Threshold a label to pure black/white ('1' mode) without dithering"""
+    if image.mode == '1':
+        return image
+    gray = image.convert('L')
+    return gray.point(lambda v: 255 if v >= threshold else 0, mode='1')
+
+
+def pack_label_bits(image: Image.Image, threshold: int = 128) -> tuple:
+    """
+    Pack a label into TSPL BITMAP rows.
+    Returns (width_bytes, height, data) where each row is width_bytes long,
+    MSB first, and a 0 bit prints a dot (TSPL's convention for mode 0).
+    """
+    if image.mode == '1':
+        white = np.asarray(image, dtype=bool)
+    else:
+        white = np.asarray(image.convert('L')) >= threshold
+
+    height, width = white.shape
+    pad = (-width) % 8
+    if pad:
+        # Pad the right edge with white so padding bits never print
+        white = np.pad(white, ((0, 0), (0, pad)), constant_values=True)
+
+    packed = np.packbits(white, axis=1)
+    return packed.shape[1], height, packed.tobytes()
+
+
+def tspl_bitmap_command(image: Image.Image, x: int = 0, y: int = 0, threshold: int = 128) -> bytes:
+    """TSPL BITMAP command (overwrite mode) drawing image at (x, y) dots"""
+    width_bytes, height, data = pack_label_bits(image, threshold)
+    return f"BITMAP {x},{y},{width_bytes},{height},0,".encode('ascii') + data + b"\n"
@@ -0,0 +1,95 @@
+"""
+Stale-response suppression for UI-initiated loads
+Each selection (semester, date, module) loads through a LatestRequest
+channel. Every request gets a generation token; a newer request replaces
+one that has not started yet, and results whose token is no longer
+current are dropped before they reach the UI.
+"""
+import threading
+import tkinter as tk
+from typing import Callable
+
+from utils import log_event
+
+
+class LatestRequest:
+    """
+    One background worker per channel that only applies the newest result.
+    At most one load runs at a time, so rapid clicking does not pile up
+    queries on the connection pool: superseded requests that have not
+    started are skipped, and one that is already running has its result
+    discarded.
+    """
+
+    def __init__(self, root, name: str):
+        self.root = root
+        self.name = name
+        self.token = 0
+        self._next = None  # (token, load, apply, on_error) waiting to run
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def submit(self, load: Callable, apply: Callable, on_error: Callable = None) -> int:
+        """
+        Run load() in the background and apply(result) on the UI thread if
+        no newer request was made meanwhile. on_error(exception) is called
+        the same way when load raises. Returns the request's token.
+        """
+        with self._cond:
+            self.token += 1
+            self._next = (self.token, load, apply, on_error)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name=f"Load-{self.name}", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self.token
+
+    def cancel(self):
+        """Drop any queued or running request (e.g. a parent selection changed)"""
+        with self._cond:
+            self.token += 1
+            self._next = None
+
+    def is_current(self, token: int) -> bool:
+        return token == self.token
+
+    @property
+    def busy(self) -> bool:
+        """A request is queued or loading (background work can hold back)"""
+        return self._running or self._next is not None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._next is None:
+                    self._cond.wait()
+                token, load, apply, on_error = self._next
+                self._next = None
+            if not self.is_current(token):
+                continue
+
+            self._running = True
+            try:
+                result = load()
+            except Exception as e:
+                if on_error:
+                    self._deliver(token, on_error, e)
+                else:
+                    log_event(f"Error loading {self.name}: {e}", 'error')
+                continue
+            finally:
+                self._running = False
+            self._deliver(token, apply, result)
+
+    def _deliver(self, token: int, callback: Callable, value):
+        def deliver():
+            # Checked again on the UI thread: a newer request may have been made meanwhile
+            if self.is_current(token):
+                callback(value)
+        if not self.is_current(token):
+            return
+        try:
+            self.root.after(0, deliver)
+        except (RuntimeError, tk.TclError):
+            pass  # Window closed
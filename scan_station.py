@@ -0,0 +1,196 @@
+"""
+Scan station for the Barcode Printer Application
+Scans go into one ordered queue served by a single lookup thread, so
+results are shown in scan order however fast a wedge scanner sends them.
+A code read again within the debounce window is not looked up twice. The
+result panel is built once and only its label texts change per scan.
+"""
+import queue
+import threading
+import time
+import tkinter as tk
+from collections import deque, OrderedDict
+from typing import Callable, Dict, Optional
+
+import ttkbootstrap as ttk
+
+import config
+from utils import log_event
+
+
+class ScanResult:
+    """Outcome of one scan"""
+
+    def __init__(self, code: str, first: "ScanResult" = None):
+        self.code = code
+        self.first = first  # for a re-read within the debounce window: the original scan
+        self.student: Optional[Dict] = None
+        self.error: Optional[str] = None
+        self.scanned_at = time.time()
+
+    @property
+    def duplicate(self) -> bool:
+        return self.first is not None
+
+
+class ScanRate:
+    """Scans per minute over a rolling window"""
+
+    def __init__(self, window_sec: float = 60):
+        self.window_sec = window_sec
+        self._times = deque()
+        self.total = 0
+
+    def add(self):
+        self._times.append(time.monotonic())
+        self.total += 1
+
+    def per_minute(self) -> float:
+        cutoff = time.monotonic() - self.window_sec
+        while self._times and self._times[0] < cutoff:
+            self._times.popleft()
+        return len(self._times) * 60.0 / self.window_sec
+
+
+class ScanQueue:
+    """
+    Ordered scan processing. submit() is called on the UI thread;
+    lookup(code) runs on the worker thread, and on_result(ScanResult) is
+    called on the UI thread in the order the codes were scanned.
+    """
+
+    def __init__(self, root: tk.Misc, lookup: Callable, on_result: Callable,
+                 debounce_sec: float = None):
+        self.root = root
+        self.lookup = lookup
+        self.on_result = on_result
+        self.debounce_sec = (config.APP_SETTINGS.get('scan_debounce_sec', 2.0)
+                             if debounce_sec is None else debounce_sec)
+        self._queue = queue.Queue()
+        self._recent = OrderedDict()  # code -> (monotonic time, ScanResult) of its last lookup
+        self.duplicates = 0
+        self._thread = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, code: str) -> bool:
+        """Queue a scanned code; False if it was a debounced duplicate"""
+        now = time.monotonic()
+        while self._recent and now - next(iter(self._recent.values()))[0] > self.debounce_sec:
+            self._recent.popitem(last=False)
+        first = self._recent.get(code, (None, None))[1]
+        result = ScanResult(code, first)
+        if first:
+            self.duplicates += 1
+        else:
+            self._recent[code] = (now, result)
+        # Duplicates go through the queue too, so they are reported in scan order
+        self._queue.put(result)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="ScanQueue", daemon=True)
+            self._thread.start()
+        return first is None
+
+    def _worker(self):
+        while True:
+            result = self._queue.get()
+            if result.first:
+                # The original was queued earlier, so its lookup is already done
+                result.student, result.error = result.first.student, result.first.error
+            else:
+                try:
+                    result.student = self.lookup(result.code)
+                except Exception as e:
+                    result.error = str(e)
+                    log_event(f"Scan lookup failed for {result.code}: {e}", 'error')
+            try:
+                self.root.after(0, lambda r=result: self.on_result(r))
+            except (RuntimeError, tk.TclError):
+                return  # Window closed
+
+
+class ScanResultPanel(ttk.Frame):
+    """Scan result view with a fixed layout; show() only changes texts"""
+
+    FIELDS = [
+        ("Student Name:", 'StudentName'),
+        ("Student ID:", 'StudentID'),
+        ("Level:", 'StudentLevel'),
+        None,  # separator
+        ("Exam Date:", 'ExamDate'),
+        ("Module:", 'ModuleCode'),
+        ("Venue:", 'VenueName'),
+        ("Seat Number:", 'SeatNo'),
+    ]
+    HIGHLIGHT = ('VenueName', 'SeatNo')
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.title = ttk.Label(self, text="Waiting for scan...", font=('Segoe UI', 12), foreground="gray")
+        self.title.pack(pady=(0, 20))
+        self.code_label = ttk.Label(self, text="", font=('Consolas', 12))
+
+        # Details grid, built once
+        self.details = ttk.Frame(self)
+        self.values = {}
+        for i, field in enumerate(self.FIELDS):
+            if field is None:
+                ttk.Separator(self.details, orient=tk.HORIZONTAL).grid(
+                    row=i, column=0, columnspan=2, sticky='ew', pady=10)
+                continue
+            caption, key = field
+            ttk.Label(self.details, text=caption, font=('Segoe UI', 11, 'bold'),
+                      foreground="#555").grid(row=i, column=0, sticky='w', pady=5, padx=20)
+            if key in self.HIGHLIGHT:
+                value = ttk.Label(self.details, text="", font=('Segoe UI', 14, 'bold'), foreground="#d9534f")
+            else:
+                value = ttk.Label(self.details, text="", font=('Segoe UI', 12))
+            value.grid(row=i, column=1, sticky='w', pady=5)
+            self.values[key] = value
+
+        self.rate_label = ttk.Label(self, text="", font=('Segoe UI', 9), foreground="gray")
+        self.rate_label.pack(side=tk.BOTTOM, anchor=tk.W)
+        self._mode = None  # 'details' or 'code': which body is packed
+
+    def _show_body(self, mode: str):
+        if mode == self._mode:
+            return
+        self.details.pack_forget()
+        self.code_label.pack_forget()
+        if mode == 'details':
+            self.details.pack(fill=tk.X)
+        else:
+            self.code_label.pack()
+        self._mode = mode
+
+    def show(self, result: ScanResult):
+        if result.error:
+            self.title.configure(text="⚠ Lookup Failed", font=('Segoe UI', 16, 'bold'), foreground="orange")
+            self.code_label.configure(text=f"Barcode: {result.code}")
+            self._show_body('code')
+            return
+        if not result.student:
+            self.title.configure(text="❌ Student Not Found", font=('Segoe UI', 16, 'bold'), foreground="red")
+            self.code_label.configure(text=f"Barcode: {result.code}")
+            self._show_body('code')
+            return
+
+        student = result.student
+        if result.duplicate:
+            self.title.configure(text="↻ Already Scanned", font=('Segoe UI', 16, 'bold'), foreground="gray")
+        else:
+            self.title.configure(text="✅ Student Verified", font=('Segoe UI', 16, 'bold'), foreground="green")
+        for key, label in self.values.items():
+            default = 'Unknown' if key == 'StudentName' else 'N/A'
+            label.configure(text=str(student.get(key) or default))
+        self._show_body('details')
+
+    def show_rate(self, per_minute: float, total: int, pending: int, duplicates: int):
+        text = f"{per_minute:.0f} scans/min · {total} scanned"
+        if pending:
+            text += f" · {pending} queued"
+        if duplicates:
+            text += f" · {duplicates} repeat(s) ignored"
+        self.rate_label.configure(text=text)
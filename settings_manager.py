@@ -11,7 +11,12 @@ def load_settings():
         'label_height_mm': config.PRINTER_CONFIG['card_height_mm'],
         'offset_x_mm': 0.0,
         'offset_y_mm': 0.0,
-        'printer_name': config.PRINTER_CONFIG['printer_name']
+        'printer_name': config.PRINTER_CONFIG['printer_name'],
+        'tspl_use_template': config.PRINTER_CONFIG['tspl_use_template'],
+        'tspl_chunk_labels': config.PRINTER_CONFIG['tspl_chunk_labels'],
+        'print_mode': config.PRINTER_CONFIG['print_mode'],
+        'printer_group': config.PRINTER_CONFIG['printer_group'],
+        'printer_group_split': config.PRINTER_CONFIG['printer_group_split']
     }
     
     if not os.path.exists(SETTINGS_FILE):
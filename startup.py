@@ -0,0 +1,49 @@
+"""
+Startup timing for the Barcode Printer Application
+Records how long each startup phase and each lazily imported module took,
+so cold-start regressions show up in the log (or with
+`python main.py --startup-report`).
+"""
+import importlib
+import sys
+import threading
+import time
+
+_T0 = time.perf_counter()
+_lock = threading.Lock()
+
+PHASES = []  # (phase, seconds since startup began)
+IMPORTS = []  # (module, seconds its first import took)
+
+
+def mark(phase: str):
+    """Record that a startup phase has been reached"""
+    with _lock:
+        PHASES.append((phase, time.perf_counter() - _T0))
+
+
+def timed_import(name: str):
+    """Import a module, recording the time of its first import"""
+    if name in sys.modules:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        IMPORTS.append((name, time.perf_counter() - start))
+    return module
+
+
+def report() -> str:
+    """Startup phases and slowest imports, one per line"""
+    with _lock:
+        phases = sorted(PHASES, key=lambda p: p[1])
+        imports = sorted(IMPORTS, key=lambda i: i[1], reverse=True)
+    lines = ["Startup phases:"]
+    previous = 0.0
+    for phase, at in phases:
+        lines.append(f"  {phase:<24} {at * 1000:8.1f} ms  (+{(at - previous) * 1000:.1f} ms)")
+        previous = at
+    if imports:
+        lines.append("Deferred imports:")
+        lines += [f"  {name:<24} {seconds * 1000:8.1f} ms" for name, seconds in imports]
+    return "\n".join(lines)
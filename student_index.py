@@ -0,0 +1,84 @@
+"""
+Search index over a loaded student list
+Built once per list: a sorted key list answers prefix queries by
+bisection, and an n-gram index narrows substring queries to a few
+candidate rows. Typing one more character only re-checks the rows that
+matched the previous query.
+"""
+from bisect import bisect_left
+from typing import Dict, List
+
+SEARCH_FIELDS = ('Barcode', 'StudentID', 'SeatNo', 'VenueName')
+GRAM = 3  # longest n-gram indexed; longer queries intersect their trigrams
+
+
+class StudentIndex:
+    """Prefix and substring search over selected fields of a student list"""
+
+    def __init__(self, students: List[Dict], fields=SEARCH_FIELDS):
+        self.size = len(students)
+        # Per row, the searchable values (lowercase) joined into one string
+        self._haystacks = []
+        keys = []
+        grams = {}
+        for row, student in enumerate(students):
+            values = [str(student.get(f) or '').lower() for f in fields]
+            values = [v for v in values if v]
+            self._haystacks.append('\x00'.join(values))
+            for value in values:
+                keys.append((value, row))
+                for n in range(1, GRAM + 1):
+                    for start in range(len(value) - n + 1):
+                        grams.setdefault(value[start:start + n], set()).add(row)
+        keys.sort()
+        self._keys = keys
+        self._grams = grams
+        self._last_query = ''
+        self._last_result = list(range(self.size))
+
+    def prefix_rows(self, query: str) -> set:
+        """Rows with a field value starting with query"""
+        rows = set()
+        start = bisect_left(self._keys, (query, -1))
+        for value, row in self._keys[start:]:
+            if not value.startswith(query):
+                break
+            rows.add(row)
+        return rows
+
+    def substring_rows(self, query: str) -> set:
+        """Rows with a field value containing query"""
+        if len(query) <= GRAM:
+            return set(self._grams.get(query, ()))
+        candidates = None
+        for start in range(len(query) - GRAM + 1):
+            rows = self._grams.get(query[start:start + GRAM])
+            if not rows:
+                return set()
+            candidates = set(rows) if candidates is None else candidates & rows
+        return {row for row in candidates if query in self._haystacks[row]}
+
+    def _matches(self, row: int, query: str) -> bool:
+        return query in self._haystacks[row]
+
+    def search(self, query: str) -> List[int]:
+        """
+        Row numbers matching query (case-insensitive): rows with a field
+        starting with the query first, then other substring matches, each
+        in list order. An empty query matches every row.
+        """
+        query = query.strip().lower()
+        if not query:
+            result = list(range(self.size))
+        elif self._last_query and query.startswith(self._last_query):
+            # Incremental: the new matches are a subset of the previous ones
+            prefix = self.prefix_rows(query)
+            rows = [r for r in self._last_result if self._matches(r, query)]
+            result = [r for r in rows if r in prefix] + [r for r in rows if r not in prefix]
+        else:
+            prefix = self.prefix_rows(query)
+            other = self.substring_rows(query) - prefix
+            result = sorted(prefix) + sorted(other)
+        self._last_query = query
+        self._last_result = result
+        return result
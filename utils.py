@@ -1,38 +1,92 @@
 """
 Utility functions for the Barcode Printer Application
 """
+import atexit
+import gzip
 import logging
+import os
+import queue
+import shutil
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from typing import Optional
 import config
 
 
-def setup_logging():
-    """Configure application logging"""
-    logging.basicConfig(
-        filename=config.APP_SETTINGS['log_file'],
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+_listener: Optional[QueueListener] = None
+_logger = logging.getLogger(__name__)
+
+
+def _gzip_rotator(source: str, dest: str):
+    """Compress a rotated log file (runs on the logging thread)"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def setup_logging(level: str = None):
+    """
+    Configure application logging. Callers only put records on a queue;
+    a background listener writes them to the rotating log file (rotated
+    files are gzipped) and the console.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    settings = config.APP_SETTINGS
+    level = getattr(logging, (level or settings.get('log_level', 'INFO')).upper(), logging.INFO)
+    
+    # Rotate daily (or as log_rotate_when says) if set, else by size
+    if settings.get('log_rotate_when'):
+        file_handler = TimedRotatingFileHandler(
+            settings['log_file'], when=settings['log_rotate_when'],
+            backupCount=settings.get('log_backups', 5), encoding='utf-8', delay=True
+        )
+    else:
+        file_handler = RotatingFileHandler(
+            settings['log_file'], maxBytes=settings.get('log_max_bytes', 5 * 1024 * 1024),
+            backupCount=settings.get('log_backups', 5), encoding='utf-8', delay=True
+        )
+    file_handler.namer = lambda name: name + '.gz'
+    file_handler.rotator = _gzip_rotator
+    file_handler.setFormatter(logging.Formatter(
+        '%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'
+    ))
     
     # Also log to console
     console = logging.StreamHandler()
-    console.setLevel(logging.INFO)
-    formatter = logging.Formatter('%(levelname)s - %(message)s')
-    console.setFormatter(formatter)
-    logging.getLogger('').addHandler(console)
+    console.setLevel(max(level, logging.INFO))
+    console.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger('')
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, file_handler, console, respect_handler_level=True)
+    _listener.start()
+    # Write out whatever is still queued when the process exits
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Flush queued log records and stop the logging thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def log_event(message: str, level: str = 'info'):
-    """Log an event with specified level"""
-    logger = logging.getLogger(__name__)
-    if level.lower() == 'error':
-        logger.error(message)
-    elif level.lower() == 'warning':
-        logger.warning(message)
+    """Log an event with specified level ('debug' for per-item detail)"""
+    level = level.lower()
+    if level == 'error':
+        _logger.error(message)
+    elif level == 'warning':
+        _logger.warning(message)
+    elif level == 'debug':
+        _logger.debug(message)
     else:
-        logger.info(message)
+        _logger.info(message)
 
 
 def validate_email(email: str) -> bool:
@@ -55,6 +109,15 @@ def mm_to_pixels(mm: float, dpi: int = 300) -> int:
     return int(inches * dpi)
 
 
+def pixels_to_mm(pixels: int, dpi: int = 300) -> float:
+    """Millimeters that mm_to_pixels turns into pixels, with as few decimals as possible"""
+    mm = (pixels + 0.5) * 25.4 / dpi  # middle of the range that truncates to pixels
+    for digits in (0, 1):
+        if mm_to_pixels(round(mm, digits), dpi) == pixels:
+            return round(mm, digits)
+    return round(mm, 2)
+
+
 class SessionManager:
     """Manage user session data"""
     